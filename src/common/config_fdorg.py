@@ -11,6 +11,9 @@ FDORG_BASE_URL = os.getenv("FDORG_BASE_URL", "https://api.football-data.org/v4")
 FDORG_TOKEN = os.getenv("FDORG_TOKEN")
 FDORG_COMPETITION = os.getenv("FDORG_COMPETITION", "BSA")
 SEASON = os.getenv("SEASON", "2025")
+# cota por minuto do plano (free: 10); os cabeçalhos da API corrigem em tempo de execução
+FDORG_RATE_LIMIT = int(os.getenv("FDORG_RATE_LIMIT", "10"))
+FDORG_RATE_STATE = os.getenv("FDORG_RATE_STATE", str(ROOT / "data/_pipeline/ratelimit_fdorg.json"))
 
 def headers():
     return {"X-Auth-Token": FDORG_TOKEN, "Accept": "application/json"}
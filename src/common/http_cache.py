@@ -0,0 +1,94 @@
+# src/common/http_cache.py
+# Cache local de respostas HTTP, por URL + parâmetros. Guarda o corpo e os
+# validadores (ETag / Last-Modified): dentro do TTL a resposta sai do disco sem
+# tocar a rede; depois dele a requisição vai condicional e um 304 reaproveita o
+# corpo guardado. `changed` diz se o conteúdo mudou desde a última vez neste
+# cache, que é compartilhado por todas as saídas da mesma URL: para pular a
+# gravação de um arquivo, compare com o próprio arquivo (ver raw.save).
+import os, json, time, hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", str(ROOT / "data/_cache/http"))
+ENABLED = os.getenv("HTTP_CACHE", "1").lower() not in ("0", "false", "off", "no")
+
+@dataclass
+class Cached:
+    content: bytes
+    changed: bool   # conteúdo diferente do que estava no cache (ou primeira vez)
+    source: str     # "fresh" (TTL), "304" ou "200"
+    encoding: str | None = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+def _key(url: str, params: dict | None, vary: dict | None) -> str:
+    ident = json.dumps({"url": url, "params": params or {}, "vary": vary or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(ident.encode()).hexdigest()
+
+def _paths(key: str, root) -> tuple[Path, Path]:
+    d = Path(root) / key[:2]
+    return d / f"{key}.json", d / f"{key}.body"
+
+def _load(key: str, root) -> tuple[dict, bytes] | None:
+    meta_p, body_p = _paths(key, root)
+    try:
+        return json.loads(meta_p.read_text(encoding="utf-8")), body_p.read_bytes()
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _store(key: str, root, meta: dict, body: bytes | None) -> None:
+    meta_p, body_p = _paths(key, root)
+    meta_p.parent.mkdir(parents=True, exist_ok=True)
+    if body is not None:
+        tmp = body_p.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(body_p)
+    tmp = meta_p.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    tmp.replace(meta_p)
+
+def get(url: str, params: dict | None = None, headers: dict | None = None, ttl: float = 0,
+        send=None, vary: dict | None = None, timeout: float = 30, root=None) -> Cached:
+    """GET com cache. `send(url, params=, headers=, timeout=)` faz a chamada
+    (padrão: requests.get) e devolve um requests.Response; `vary` são
+    cabeçalhos que mudam o conteúdo e entram na chave."""
+    send = send or requests.get
+    root = root or CACHE_DIR
+    if not ENABLED:
+        r = send(url, params=params, headers=headers, timeout=timeout)
+        r.raise_for_status()
+        return Cached(r.content, True, "200", r.encoding or r.apparent_encoding)
+
+    key = _key(url, params, vary)
+    hit = _load(key, root)
+    now = time.time()
+    if hit and ttl and now - hit[0]["fetched_at"] < ttl:
+        return Cached(hit[1], False, "fresh", hit[0].get("encoding"))
+
+    h = dict(headers or {})
+    if hit:
+        if hit[0].get("etag"):
+            h["If-None-Match"] = hit[0]["etag"]
+        if hit[0].get("last_modified"):
+            h["If-Modified-Since"] = hit[0]["last_modified"]
+    r = send(url, params=params, headers=h, timeout=timeout)
+    if r.status_code == 304 and hit:
+        meta = {**hit[0], "fetched_at": now}
+        _store(key, root, meta, None)
+        return Cached(hit[1], False, "304", hit[0].get("encoding"))
+    r.raise_for_status()
+
+    digest = hashlib.sha256(r.content).hexdigest()
+    meta = {
+        "url": url, "params": params or {}, "fetched_at": now, "sha256": digest,
+        "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"),
+        "encoding": r.encoding or r.apparent_encoding,
+    }
+    changed = not hit or hit[0].get("sha256") != digest
+    _store(key, root, meta, r.content if changed else None)
+    return Cached(r.content, changed, "200", meta["encoding"])
@@ -0,0 +1,283 @@
+# src/common/http_metrics.py
+# Instrumentação das chamadas HTTP (API e scrapers): para cada requisição,
+# DNS, conexão TCP, TLS, tempo até o primeiro byte e total, tamanho, status,
+# número da tentativa e os cabeçalhos de cota. Os eventos vão para um JSONL por
+# execução (HTTP_METRICS_FILE, definido pelo run_all); no fim saem percentis por
+# endpoint e um arquivo no formato texto do Prometheus, que também pode ser
+# servido em /metrics.
+from __future__ import annotations
+
+import os, sys, json, time, socket, pathlib, argparse, threading
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.logging_utils import info, ok, warn
+
+METRICS_DIR = "data/_pipeline/http"
+PROM_PATH = f"{METRICS_DIR}/metrics.prom"
+QUOTA_HEADERS = {"quota_available": "X-Requests-Available-Minute", "quota_reset_s": "X-RequestCounter-Reset"}
+
+_tl = threading.local()
+_events: list[dict] = []
+_lock = threading.Lock()
+
+def _ms(t0: float, t1: float) -> float:
+    return round((t1 - t0) * 1000, 2)
+
+# ----------------- medição na conexão -----------------
+class _Timed:
+    """Mede DNS e TCP em _new_conn, TLS em connect e o primeiro byte em
+    getresponse, anotando no registro da requisição corrente (por thread)."""
+
+    def _new_conn(self):
+        rec = getattr(_tl, "rec", None)
+        host = self._dns_host
+        t0 = time.perf_counter()
+        try:
+            addrs = [a[4][0] for a in socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)]
+        except socket.gaierror:
+            addrs = [host]  # deixa o urllib3 levantar o erro de resolução de sempre
+        t1 = time.perf_counter()
+        try:
+            for i, addr in enumerate(addrs):
+                self._dns_host = addr
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError):
+                    if i == len(addrs) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        if rec is not None:
+            rec.update(new_conn=True, dns_ms=_ms(t0, t1), connect_ms=_ms(t1, time.perf_counter()))
+        return sock
+
+    def connect(self):
+        t0 = time.perf_counter()
+        super().connect()
+        rec = getattr(_tl, "rec", None)
+        if rec is not None and isinstance(self, HTTPSConnection):
+            rec["tls_ms"] = round(max(0.0, _ms(t0, time.perf_counter()) - rec.get("dns_ms", 0) - rec.get("connect_ms", 0)), 2)
+
+    def getresponse(self, *a, **kw):
+        resp = super().getresponse(*a, **kw)
+        rec = getattr(_tl, "rec", None)
+        if rec is not None:
+            rec["ttfb_ms"] = _ms(rec["_t0"], time.perf_counter())
+        return resp
+
+class TimedHTTPConnection(_Timed, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_Timed, HTTPSConnection):
+    pass
+
+class _TimedPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class _TimedSPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class InstrumentedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedPool, "https": _TimedSPool}
+
+def session(pool_maxsize: int = 8) -> requests.Session:
+    """requests.Session com pool keep-alive e conexões instrumentadas."""
+    s = requests.Session()
+    adapter = InstrumentedAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+# ----------------- registro -----------------
+def set_attempt(n: int) -> None:
+    """Tentativa corrente da chamada lógica nesta thread (0 = primeira)."""
+    _tl.attempt = n
+
+def get(sess: requests.Session, url: str, endpoint: str, **kwargs) -> requests.Response:
+    """sess.get(url, **kwargs) medido e registrado sob `endpoint`."""
+    rec = {"_t0": time.perf_counter(), "new_conn": False}
+    _tl.rec = rec
+    status, size, headers, error = 0, 0, {}, None
+    try:
+        r = sess.get(url, **kwargs)
+        status, size, headers = r.status_code, len(r.content), r.headers
+        return r
+    except requests.RequestException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _tl.rec = None
+        t0 = rec.pop("_t0")
+        event = {
+            "ts": round(time.time(), 3), "endpoint": endpoint, "status": status, "bytes": size,
+            "total_ms": _ms(t0, time.perf_counter()), "retry": getattr(_tl, "attempt", 0), **rec, "pid": os.getpid(),
+        }
+        for key, h in QUOTA_HEADERS.items():
+            if headers.get(h) is not None:
+                event[key] = headers.get(h)
+        if error:
+            event["error"] = error
+        _record(event)
+
+def _record(event: dict) -> None:
+    with _lock:
+        _events.append(event)
+        path = os.getenv("HTTP_METRICS_FILE")
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")  # uma escrita por linha: processos em paralelo não se misturam
+
+def events(path=None) -> list[dict]:
+    """Eventos do arquivo `path` (ou os deste processo)."""
+    if path is None:
+        with _lock:
+            return list(_events)
+    out = []
+    p = Path(path)
+    if p.exists():
+        for line in p.read_text(encoding="utf-8").splitlines():
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+    return out
+
+# ----------------- resumo -----------------
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    v = sorted(values)
+    return v[min(len(v) - 1, max(0, int(round(q * (len(v) - 1)))))]
+
+QUANTILES = (0.5, 0.9, 0.99)
+TIMINGS = ("total_ms", "ttfb_ms", "dns_ms", "connect_ms", "tls_ms")
+
+def summarize(evts: list[dict]) -> dict:
+    """{endpoint: contagens, bytes, retentativas, percentis de cada tempo, última cota}."""
+    out = {}
+    for ep in sorted({e["endpoint"] for e in evts}):
+        es = [e for e in evts if e["endpoint"] == ep]
+        statuses: dict[str, int] = {}
+        for e in es:
+            statuses[str(e["status"])] = statuses.get(str(e["status"]), 0) + 1
+        s = {
+            "requests": len(es), "status": statuses,
+            "errors": sum(1 for e in es if e.get("error") or e["status"] >= 400),
+            "retries": sum(1 for e in es if e.get("retry", 0) > 0),
+            "new_connections": sum(1 for e in es if e.get("new_conn")),
+            "bytes": sum(e.get("bytes", 0) for e in es),
+        }
+        for t in TIMINGS:
+            vals = [e[t] for e in es if e.get(t) is not None]
+            if vals:
+                s[t] = {f"p{int(q * 100)}": _pct(vals, q) for q in QUANTILES}
+        last = max(es, key=lambda e: e["ts"])
+        if "quota_available" in last:
+            s["quota_available"] = int(last["quota_available"])
+        out[ep] = s
+    return out
+
+def _label(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text(summary: dict, prefix: str = "brasileirao_http") -> str:
+    lines = [
+        f"# HELP {prefix}_requests_total Requisições HTTP por endpoint e status.",
+        f"# TYPE {prefix}_requests_total counter",
+    ]
+    for ep, s in summary.items():
+        for st, n in s["status"].items():
+            lines.append(f'{prefix}_requests_total{{endpoint="{_label(ep)}",status="{st}"}} {n}')
+    for name, key, help_ in (("retries_total", "retries", "Requisições que foram retentativas."),
+                             ("response_bytes_total", "bytes", "Bytes recebidos."),
+                             ("new_connections_total", "new_connections", "Conexões abertas (sem keep-alive).")):
+        lines += [f"# HELP {prefix}_{name} {help_}", f"# TYPE {prefix}_{name} counter"]
+        lines += [f'{prefix}_{name}{{endpoint="{_label(ep)}"}} {s[key]}' for ep, s in summary.items()]
+    for t in TIMINGS:
+        metric = f"{prefix}_{t.removesuffix('_ms')}_seconds"
+        lines += [f"# HELP {metric} Percentis de {t.removesuffix('_ms')} por endpoint.", f"# TYPE {metric} gauge"]
+        for ep, s in summary.items():
+            for q in QUANTILES:
+                v = s.get(t, {}).get(f"p{int(q * 100)}")
+                if v is not None:
+                    lines.append(f'{metric}{{endpoint="{_label(ep)}",quantile="{q}"}} {v / 1000:.6f}')
+    quota = {ep: s["quota_available"] for ep, s in summary.items() if "quota_available" in s}
+    if quota:
+        lines += [f"# HELP {prefix}_quota_available Chamadas restantes no minuto (último cabeçalho).",
+                  f"# TYPE {prefix}_quota_available gauge"]
+        lines += [f'{prefix}_quota_available{{endpoint="{_label(ep)}"}} {v}' for ep, v in quota.items()]
+    return "\n".join(lines) + "\n"
+
+def write_summary(events_path, prom_path=PROM_PATH) -> dict:
+    """Resumo do JSONL de uma execução: <run>.summary.json ao lado e o .prom
+    (sobrescrito a cada execução, para o textfile collector ou /metrics)."""
+    summary = summarize(events(events_path))
+    p = Path(events_path)
+    p.with_suffix(".summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    prom = Path(prom_path)
+    prom.parent.mkdir(parents=True, exist_ok=True)
+    tmp = prom.with_suffix(".tmp")
+    tmp.write_text(prometheus_text(summary), encoding="utf-8")
+    tmp.replace(prom)
+    return summary
+
+def log_summary(summary: dict) -> None:
+    for ep, s in summary.items():
+        t, f = s.get("total_ms", {}), s.get("ttfb_ms", {})
+        extra = f", TTFB p50 {f['p50']} ms" if f else ""
+        extra += f", cota restante {s['quota_available']}" if "quota_available" in s else ""
+        line = (f"HTTP {ep}: {s['requests']} req, {s['errors']} erro(s), {s['retries']} retentativa(s), "
+                f"total p50 {t.get('p50')} ms / p90 {t.get('p90')} ms{extra}")
+        (warn if s["errors"] else info)(line)
+
+def main():
+    ap = argparse.ArgumentParser(prog="http_metrics", description="Métricas HTTP da ingestão e dos scrapers")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sm = sub.add_parser("summary", help="percentis por endpoint de uma execução")
+    sm.add_argument("file", nargs="?", help="JSONL de eventos (padrão: o mais recente)")
+    sv = sub.add_parser("serve", help="expõe o último metrics.prom em /metrics")
+    sv.add_argument("--port", type=int, default=9109)
+    sv.add_argument("--prom", default=PROM_PATH)
+    args = ap.parse_args()
+
+    if args.cmd == "summary":
+        path = args.file or max(Path(METRICS_DIR).glob("*.jsonl"), default=None, key=lambda p: p.stat().st_mtime)
+        if not path:
+            warn(f"nenhuma métrica em {METRICS_DIR}")
+            return
+        info(f"Métricas de {path}")
+        log_summary(summarize(events(path)))
+        return
+
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            p = Path(args.prom)
+            body = p.read_bytes() if self.path.split("?")[0] == "/metrics" and p.exists() else b""
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    ok(f"Métricas em http://0.0.0.0:{args.port}/metrics ({args.prom})")
+    ThreadingHTTPServer(("0.0.0.0", args.port), Handler).serve_forever()
+
+if __name__ == "__main__":
+    main()
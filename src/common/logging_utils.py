@@ -1,5 +1,5 @@
 # src/common/logging_utils.py
-import sys
+import sys, threading
 
 def _supports_unicode() -> bool:
     enc = (sys.stdout.encoding or "").lower()
@@ -16,7 +16,14 @@ else:
     W = "[!] "
     E = "[x] "
 
-def info(msg: str): print(f"{I}{msg}")
-def ok(msg: str):   print(f"{OK}{msg}")
-def warn(msg: str): print(f"{W}{msg}")
-def err(msg: str):  print(f"{E}{msg}")
\ No newline at end of file
+_lock = threading.Lock()
+
+def _out(line: str):
+    # uma escrita por linha: etapas em threads não intercalam mensagens
+    with _lock:
+        sys.stdout.write(line + "\n")
+
+def info(msg: str): _out(f"{I}{msg}")
+def ok(msg: str):   _out(f"{OK}{msg}")
+def warn(msg: str): _out(f"{W}{msg}")
+def err(msg: str):  _out(f"{E}{msg}")
\ No newline at end of file
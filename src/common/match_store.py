@@ -0,0 +1,97 @@
+# src/common/match_store.py
+# Armazém local das partidas (SQLite, ao lado do matches_fdorg.json): uma linha
+# por partida, chaveada por `id`, guardando o JSON da API e o `lastUpdated`.
+# A coleta delta só traz uma janela de datas; as partidas chegam por upsert e o
+# matches_fdorg.json completo é remontado daqui, igual ao da coleta completa.
+import json, sqlite3
+from pathlib import Path
+
+FINISHED = "FINISHED"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    last_updated TEXT,
+    utc_date TEXT,
+    status TEXT,
+    ord INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+def store_path(json_path) -> Path:
+    """data/raw/matches_fdorg.json -> data/raw/matches_fdorg.sqlite"""
+    return Path(json_path).with_suffix(".sqlite")
+
+class MatchStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(self.path)
+        self.con.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def seeded(self) -> bool:
+        """Já recebeu uma coleta completa?"""
+        return self.con.execute("SELECT 1 FROM meta WHERE key = 'envelope'").fetchone() is not None
+
+    def replace(self, data: dict) -> None:
+        """Coleta completa: o armazém passa a ser exatamente esta resposta."""
+        matches = data.get("matches", []) or []
+        with self.con:
+            self.con.execute("DELETE FROM matches")
+            self.con.executemany(
+                "INSERT INTO matches (id, last_updated, utc_date, status, ord, body) VALUES (?, ?, ?, ?, ?, ?)",
+                [self._row(m, i) for i, m in enumerate(matches)])
+            envelope = {k: (None if k == "matches" else v) for k, v in data.items()}  # mantém a ordem das chaves
+            self.con.execute("INSERT OR REPLACE INTO meta VALUES ('envelope', ?)", (json.dumps(envelope, ensure_ascii=False),))
+            self.con.execute("DELETE FROM meta WHERE key = 'delta'")
+
+    def upsert(self, matches: list[dict]) -> int:
+        """Coleta delta: insere partidas novas e atualiza as que têm `lastUpdated`
+        mais recente. Devolve quantas linhas mudaram."""
+        before = self.con.total_changes
+        nxt = self.con.execute("SELECT coalesce(max(ord), -1) + 1 FROM matches").fetchone()[0]
+        with self.con:
+            self.con.executemany(
+                """INSERT INTO matches (id, last_updated, utc_date, status, ord, body) VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       last_updated = excluded.last_updated, utc_date = excluded.utc_date,
+                       status = excluded.status, body = excluded.body
+                   WHERE matches.last_updated IS NULL OR excluded.last_updated > matches.last_updated""",
+                [self._row(m, nxt + i) for i, m in enumerate(matches)])
+            changed = self.con.total_changes - before
+            if changed:
+                self.con.execute("INSERT OR REPLACE INTO meta VALUES ('delta', '1')")
+        return changed
+
+    def materialize(self) -> dict:
+        """Resposta completa equivalente: envelope da última coleta completa e
+        partidas na ordem da API (novas no fim). Sem deltas, idêntica à original."""
+        meta = dict(self.con.execute("SELECT key, value FROM meta"))
+        envelope = json.loads(meta["envelope"]) if "envelope" in meta else {}
+        matches = [json.loads(b) for (b,) in self.con.execute("SELECT body FROM matches ORDER BY ord")]
+        if "delta" in meta and isinstance(envelope.get("resultSet"), dict) and matches:
+            dates = [m.get("utcDate") for m in matches if m.get("utcDate")]
+            envelope["resultSet"] = {
+                **envelope["resultSet"],
+                "count": len(matches),
+                "played": sum(m.get("status") == FINISHED for m in matches),
+                **({"first": min(dates)[:10], "last": max(dates)[:10]} if dates else {}),
+            }
+        envelope["matches"] = matches
+        return envelope
+
+    @staticmethod
+    def _row(m: dict, ord_: int) -> tuple:
+        return (m["id"], m.get("lastUpdated"), m.get("utcDate"), m.get("status"), ord_,
+                json.dumps(m, ensure_ascii=False))
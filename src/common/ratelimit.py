@@ -0,0 +1,126 @@
+# src/common/ratelimit.py
+# Balde de fichas compartilhado entre processos: o estado (fichas, última
+# recarga, bloqueio até o reset) fica num JSON local protegido por lock de
+# arquivo, então pipelines e partições rodando ao mesmo tempo dividem a mesma
+# cota. As respostas da API corrigem o balde pelos cabeçalhos de cota
+# (X-Requests-Available-Minute / X-RequestCounter-Reset).
+import os, json, time, threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.common.logging_utils import warn
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+WINDOW_S = 60.0
+
+@contextmanager
+def _file_lock(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK desiste depois de ~10 s; tenta de novo
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class RateLimiter:
+    """`per_minute` chamadas por minuto (valor inicial; os cabeçalhos da API
+    podem aumentá-lo). `acquire()` bloqueia até haver ficha; `update(headers)`
+    ajusta o balde depois de cada resposta."""
+
+    def __init__(self, state_path, per_minute: int = 10):
+        self.path = Path(state_path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.per_minute = per_minute
+        self._thread_lock = threading.Lock()  # flock é por descritor; threads do mesmo processo também esperam
+
+    @contextmanager
+    def _state(self):
+        with self._thread_lock, _file_lock(self.lock_path):
+            st = {}
+            if self.path.exists():
+                try:
+                    st = json.loads(self.path.read_text(encoding="utf-8"))
+                except ValueError:
+                    warn(f"estado do limitador ilegível: {self.path}; recomeçando")
+            now = time.time()
+            cap = float(st.get("capacity", self.per_minute))
+            tokens = float(st.get("tokens", cap))
+            tokens = min(cap, tokens + (now - float(st.get("updated", now))) * cap / WINDOW_S)
+            # chamadas liberadas e ainda sem resposta (as de processos que morreram expiram)
+            inflight = [t for t in st.get("inflight", []) if now - t < WINDOW_S]
+            st.update(capacity=cap, tokens=tokens, updated=now, inflight=inflight)
+            yield st, now
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(st), encoding="utf-8")
+            tmp.replace(self.path)
+
+    def acquire(self) -> float:
+        """Consome uma ficha; devolve quantos segundos esperou."""
+        waited = 0.0
+        while True:
+            with self._state() as (st, now):
+                blocked = float(st.get("blocked_until", 0)) - now
+                if blocked <= 0 and st["tokens"] >= 1:
+                    st["tokens"] -= 1
+                    st["inflight"].append(now)
+                    return waited
+                if blocked <= 0:
+                    st.pop("blocked_until", None)
+                    wait = (1 - st["tokens"]) * WINDOW_S / st["capacity"]
+                else:
+                    wait = blocked
+            time.sleep(wait)
+            waited += wait
+
+    def eta(self, calls: int) -> float:
+        """Segundos até a cota liberar mais `calls` chamadas (no ritmo atual do balde)."""
+        with self._state() as (st, now):
+            blocked = max(0.0, float(st.get("blocked_until", 0)) - now)
+            tokens = 0.0 if blocked else st["tokens"]
+            return blocked + max(0.0, calls - tokens) * WINDOW_S / st["capacity"]
+
+    def update(self, headers, status: int | None = None) -> None:
+        """Cota informada pela API: fichas = chamadas restantes no minuto; com
+        zero restantes (ou 429) ninguém chama até o contador zerar."""
+        headers = headers or {}
+        available, reset = headers.get("X-Requests-Available-Minute"), headers.get("X-RequestCounter-Reset")
+        try:
+            available = int(available) if available is not None else None
+        except ValueError:
+            available = None
+        try:
+            reset = float(reset) if reset is not None else None
+        except ValueError:
+            reset = None
+        with self._state() as (st, now):
+            if st["inflight"]:
+                st["inflight"].pop(0)
+            if available is not None:
+                # cota maior que a configurada (plano pago): o balde cresce junto
+                st["capacity"] = max(st["capacity"], float(available + 1))
+                # o servidor manda; descontadas as chamadas que ele ainda não contou
+                st["tokens"] = max(0.0, float(available - len(st["inflight"])))
+            if status == 429 or available == 0:
+                st["tokens"] = 0.0
+                # o reset vem em segundos inteiros (truncado): +1 s de folga
+                until = now + (reset + 1 if reset is not None else WINDOW_S)
+                st["blocked_until"] = max(float(st.get("blocked_until", 0)), until)
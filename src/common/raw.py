@@ -0,0 +1,244 @@
+# src/common/raw.py
+# Leitura única dos JSON brutos do Football-Data.org: detecta a codificação uma
+# vez, faz o parse uma vez por processo e compartilha o objeto entre as
+# transformações (cache por caminho + mtime + tamanho). Para arquivos grandes
+# (várias temporadas), iter_matches/match_batches percorrem as partidas sem
+# montar o documento inteiro em memória. Aceita também .json.gz.
+import os, re, gzip, json, codecs, threading
+from pathlib import Path
+
+_cache: dict[str, tuple[int, int, object]] = {}
+_locks: dict[str, threading.Lock] = {}
+_guard = threading.Lock()
+
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK = 1 << 16       # bytes lidos por vez no modo streaming
+BATCH_SIZE = 5000     # partidas por lote
+
+def decode(b: bytes) -> str:
+    if b.startswith(codecs.BOM_UTF8):
+        return b[len(codecs.BOM_UTF8):].decode("utf-8")
+    try:
+        return b.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    try:
+        return b.decode("cp1252")
+    except UnicodeDecodeError:
+        return b.decode("latin-1")  # aceita qualquer byte
+
+def _read(p: Path) -> bytes:
+    b = p.read_bytes()
+    return gzip.decompress(b) if b[:2] == GZIP_MAGIC else b
+
+def _key_lock(key: str) -> threading.Lock:
+    with _guard:
+        return _locks.setdefault(key, threading.Lock())
+
+def load_json(src):
+    """Caminho -> objeto (cacheado). Objetos já carregados passam direto."""
+    if isinstance(src, (dict, list)):
+        return src
+    p = Path(src)
+    key = str(p.resolve())
+    with _key_lock(key):  # duas transformações pedindo o mesmo arquivo: um parse só
+        st = p.stat()
+        hit = _cache.get(key)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        try:
+            obj = json.loads(decode(_read(p)))
+        except ValueError as e:
+            raise ValueError(f"Falha ao decodificar JSON em {p}: {e}") from e
+        _cache[key] = (st.st_mtime_ns, st.st_size, obj)
+        return obj
+
+def prime(path, obj) -> None:
+    """Registra um objeto recém-gravado em `path` (evita reler o arquivo)."""
+    p = Path(path)
+    st = p.stat()
+    with _key_lock(str(p.resolve())):
+        _cache[str(p.resolve())] = (st.st_mtime_ns, st.st_size, obj)
+
+def cached(src):
+    """Objeto já carregado para `src` (e ainda em dia com o arquivo), ou None."""
+    p = Path(src)
+    hit = _cache.get(str(p.resolve()))
+    if hit:
+        st = p.stat()
+        if hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+    return None
+
+def dumps(obj) -> bytes:
+    """Forma gravada dos brutos: JSON compacto em UTF-8 (todo leitor passa por
+    load_json; o arquivo histórico usa os mesmos bytes)."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def save(path, obj) -> bool:
+    """Grava o bruto em `path` só se o conteúdo for diferente do que o arquivo
+    já tem; devolve se gravou. A comparação é com o próprio arquivo, não com o
+    cache HTTP (que é compartilhado entre saídas da mesma URL)."""
+    p = Path(path)
+    body = dumps(obj)
+    try:
+        if p.stat().st_size == len(body) and p.read_bytes() == body:
+            return False
+    except FileNotFoundError:
+        pass
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(body)
+    tmp.replace(p)
+    return True
+
+def clear_cache() -> None:
+    with _guard:
+        _cache.clear()
+
+# ----------------- streaming -----------------
+_WS = re.compile(r"[ \t\n\r]*")
+
+def _text_chunks(p: Path, encoding: str, size: int):
+    with open(p, "rb") as f:
+        gz = f.read(2) == GZIP_MAGIC
+    dec = codecs.getincrementaldecoder(encoding)()
+    with (gzip.open(p, "rb") if gz else open(p, "rb")) as f:
+        while True:
+            b = f.read(size)
+            text = dec.decode(b, final=not b)
+            if text:  # pedaço só com parte de um caractere (ou do BOM) não vira texto
+                yield text
+            if not b:
+                return
+
+class _Reader:
+    """Leitor JSON incremental: decodifica um valor por vez de um buffer que
+    só guarda o trecho ainda não consumido."""
+
+    def __init__(self, chunks):
+        self.chunks, self.buf, self.pos, self.eof = chunks, "", 0, False
+        self.dec = json.JSONDecoder()
+
+    def _more(self) -> bool:
+        if self.eof:
+            return False
+        piece = next(self.chunks, "")
+        if not piece:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + piece
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"esperado {ch!r} na posição {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.dec.raw_decode(self.buf, self.pos)
+                # um número no fim do buffer pode estar cortado: só aceita com algo depois
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._more():
+                obj, self.pos = self.dec.raw_decode(self.buf, self.pos)
+                return obj
+
+def _stream_array(p: Path, key: str, size: int, encoding: str):
+    r = _Reader(_text_chunks(p, encoding, size))
+    r.expect("{")
+    while r.peek() not in ("}", ""):
+        k = r.value()
+        r.expect(":")
+        if k != key:
+            r.value()  # outras chaves (filters, resultSet...) são pequenas
+        elif r.peek() == "[":
+            r.pos += 1
+            while r.peek() != "]":
+                yield r.value()
+                if r.peek() == ",":
+                    r.pos += 1
+            r.pos += 1
+        else:
+            r.value()  # null
+        if r.peek() == ",":
+            r.pos += 1
+
+def iter_matches(src, chunk_size: int = CHUNK):
+    """Partidas de `src` uma a uma. Arquivo já em cache sai do cache; senão é
+    lido em pedaços, sem carregar o documento inteiro."""
+    if isinstance(src, dict):
+        yield from src.get("matches") or []
+        return
+    p = Path(src)
+    obj = cached(p)
+    if obj is not None:
+        yield from obj.get("matches") or []
+        return
+    n = 0
+    for enc in ("utf-8-sig", "cp1252", "latin-1"):  # mesma ordem de decode()
+        try:
+            for i, m in enumerate(_stream_array(p, "matches", chunk_size, enc)):
+                if i >= n:  # numa nova tentativa, pula o que já foi entregue
+                    n += 1
+                    yield m
+            return
+        except UnicodeDecodeError:
+            continue
+        except ValueError as e:
+            raise ValueError(f"Falha ao decodificar JSON em {p}: {e}") from e
+
+def match_batches(srcs, size: int = BATCH_SIZE):
+    """Listas de até `size` partidas, de um ou vários arquivos (ex.: uma
+    temporada por partição), na ordem dos arquivos."""
+    if isinstance(srcs, (str, Path, dict)):
+        srcs = [srcs]
+    batch = []
+    for src in srcs:
+        for m in iter_matches(src):
+            batch.append(m)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+# ----------------- acessores -----------------
+def matches(src) -> list[dict]:
+    return load_json(src).get("matches", []) or []
+
+def standings_blocks(src) -> dict[str, list[dict]]:
+    """Linhas da classificação por tipo (TOTAL/HOME/AWAY); blocos do mesmo tipo
+    (fases de grupos) são concatenados."""
+    out: dict[str, list[dict]] = {}
+    for s in load_json(src).get("standings", []) or []:
+        out.setdefault(s.get("type"), []).extend(s.get("table", []) or [])
+    return out
+
+def teams(src) -> list[dict]:
+    obj = load_json(src)
+    return [t for t in (obj.get("teams") or obj.get("response") or []) if isinstance(t, dict)]
+
+def squads(src) -> list[tuple[dict, dict]]:
+    """Pares (time, jogador) do elenco de cada time."""
+    return [(t, p) for t in teams(src) for p in (t.get("squad") or []) if isinstance(p, dict)]
+
+def scorers(src) -> list[dict]:
+    obj = load_json(src)
+    return obj.get("scorers") or obj.get("response") or []
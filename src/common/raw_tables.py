@@ -0,0 +1,220 @@
+# src/common/raw_tables.py
+# Camada bruta colunar: tabelas achatadas e tipadas (Parquet) gravadas ao lado
+# de cada JSON da API. As transformações leem só as colunas que usam; sem o
+# Parquet (ou se ele estiver mais velho que o JSON) a tabela é montada do JSON.
+from pathlib import Path
+import pandas as pd
+
+from src.common import raw
+from src.common.logging_utils import warn
+
+MATCHES_SCHEMA = {
+    "id": "Int64", "competition_code": "string", "season_id": "Int64",
+    "utc_date": "datetime", "status": "string", "matchday": "Int64", "stage": "string", "group": "string",
+    "last_updated": "datetime",
+    "home_id": "Int64", "home_name": "string", "home_short_name": "string", "home_tla": "string",
+    "away_id": "Int64", "away_name": "string", "away_short_name": "string", "away_tla": "string",
+    "winner": "string", "duration": "string",
+    "ft_home": "Int64", "ft_away": "Int64", "ht_home": "Int64", "ht_away": "Int64",
+}
+
+STANDINGS_SCHEMA = {
+    "type": "string", "stage": "string", "group": "string", "position": "Int64",
+    "team_id": "Int64", "team_name": "string", "team_short_name": "string", "team_tla": "string",
+    "played_games": "Int64", "form": "string", "won": "Int64", "draw": "Int64", "lost": "Int64",
+    "points": "Int64", "goals_for": "Int64", "goals_against": "Int64", "goal_difference": "Int64",
+}
+
+TEAMS_SCHEMA = {
+    "id": "Int64", "name": "string", "short_name": "string", "tla": "string", "crest": "string",
+    "address": "string", "website": "string", "founded": "Int64", "club_colors": "string", "venue": "string",
+    "area_name": "string", "area_code": "string", "area_flag": "string",
+    "coach_name": "string", "coach_nationality": "string", "contract_start": "string", "contract_until": "string",
+    "competition_codes": "string", "last_updated": "datetime",
+}
+
+SQUADS_SCHEMA = {
+    "team_id": "Int64", "team_name": "string", "team_short_name": "string",
+    "player_id": "Int64", "player_name": "string", "position": "string",
+    "date_of_birth": "datetime", "nationality": "string",
+}
+
+SCORERS_SCHEMA = {
+    "player_id": "Int64", "player_name": "string", "nationality": "string", "position": "string",
+    "team_id": "Int64", "team_name": "string",
+    "played_matches": "Int64", "goals": "Int64", "assists": "Int64", "penalties": "Int64",
+}
+
+def _typed(rows: list[dict], schema: dict) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=list(schema))
+    for c, t in schema.items():
+        if t == "datetime":
+            df[c] = pd.to_datetime(df[c], utc=True, errors="coerce")
+        else:
+            df[c] = df[c].astype(t)
+    return df
+
+# ----------------- achatamento -----------------
+def match_row(m: dict) -> dict:
+    home, away = (m.get("homeTeam") or {}), (m.get("awayTeam") or {})
+    score = m.get("score") or {}
+    ft, ht = (score.get("fullTime") or {}), (score.get("halfTime") or {})
+    return {
+        "id": m.get("id"),
+        "competition_code": (m.get("competition") or {}).get("code"),
+        "season_id": (m.get("season") or {}).get("id"),
+        "utc_date": m.get("utcDate"), "status": m.get("status"),
+        "matchday": m.get("matchday"), "stage": m.get("stage"), "group": m.get("group"),
+        "last_updated": m.get("lastUpdated"),
+        "home_id": home.get("id"), "home_name": home.get("name"),
+        "home_short_name": home.get("shortName"), "home_tla": home.get("tla"),
+        "away_id": away.get("id"), "away_name": away.get("name"),
+        "away_short_name": away.get("shortName"), "away_tla": away.get("tla"),
+        "winner": score.get("winner"), "duration": score.get("duration"),
+        "ft_home": ft.get("home"), "ft_away": ft.get("away"),
+        "ht_home": ht.get("home"), "ht_away": ht.get("away"),
+    }
+
+def matches_batches(srcs, size: int = raw.BATCH_SIZE, columns: list[str] | None = None):
+    """Tabela de partidas em lotes tipados de até `size` linhas, lida em streaming
+    de um ou vários JSON (ex.: várias temporadas) sem carregar nenhum inteiro."""
+    for batch in raw.match_batches(srcs, size):
+        df = _typed([match_row(m) for m in batch], MATCHES_SCHEMA)
+        yield df[columns] if columns else df
+
+def matches_table(src, columns: list[str] | None = None) -> pd.DataFrame:
+    """Tabela inteira, montada dos lotes tipados: a memória cresce com a tabela
+    (só `columns`, se dadas), não com o JSON nem com a lista de dicts."""
+    parts = list(matches_batches(src, columns=columns))
+    if not parts:
+        df = _typed([], MATCHES_SCHEMA)
+        return df[columns] if columns else df
+    return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+def standings_table(src) -> pd.DataFrame:
+    rows = []
+    for s in raw.load_json(src).get("standings", []) or []:
+        for t in s.get("table", []) or []:
+            team = t.get("team") or {}
+            rows.append({
+                "type": s.get("type"), "stage": s.get("stage"), "group": s.get("group"),
+                "position": t.get("position"),
+                "team_id": team.get("id"), "team_name": team.get("name"),
+                "team_short_name": team.get("shortName"), "team_tla": team.get("tla"),
+                "played_games": t.get("playedGames"), "form": t.get("form"),
+                "won": t.get("won"), "draw": t.get("draw"), "lost": t.get("lost"), "points": t.get("points"),
+                "goals_for": t.get("goalsFor"), "goals_against": t.get("goalsAgainst"),
+                "goal_difference": t.get("goalDifference"),
+            })
+    return _typed(rows, STANDINGS_SCHEMA)
+
+def teams_table(src) -> pd.DataFrame:
+    rows = []
+    for t in raw.teams(src):
+        area, coach = (t.get("area") or {}), (t.get("coach") or {})
+        contract = coach.get("contract") or {}
+        comps = [c.get("code") for c in (t.get("runningCompetitions") or []) if isinstance(c, dict) and c.get("code")]
+        rows.append({
+            "id": t.get("id"), "name": t.get("name"), "short_name": t.get("shortName"), "tla": t.get("tla"),
+            "crest": t.get("crest"), "address": t.get("address"), "website": t.get("website"),
+            "founded": t.get("founded"), "club_colors": t.get("clubColors"), "venue": t.get("venue"),
+            "area_name": area.get("name"), "area_code": area.get("code"), "area_flag": area.get("flag"),
+            "coach_name": coach.get("name"), "coach_nationality": coach.get("nationality"),
+            "contract_start": contract.get("start"), "contract_until": contract.get("until"),
+            "competition_codes": "; ".join(comps), "last_updated": t.get("lastUpdated"),
+        })
+    return _typed(rows, TEAMS_SCHEMA)
+
+def squads_table(src) -> pd.DataFrame:
+    rows = []
+    for t, p in raw.squads(src):
+        rows.append({
+            "team_id": t.get("id"), "team_name": t.get("name"), "team_short_name": t.get("shortName"),
+            "player_id": p.get("id"), "player_name": p.get("name"), "position": p.get("position"),
+            "date_of_birth": p.get("dateOfBirth"), "nationality": p.get("nationality"),
+        })
+    return _typed(rows, SQUADS_SCHEMA)
+
+def scorers_table(src) -> pd.DataFrame:
+    rows = []
+    for it in raw.scorers(src):
+        player, team = (it.get("player") or {}), (it.get("team") or {})
+        rows.append({
+            "player_id": player.get("id"), "player_name": player.get("name"),
+            "nationality": player.get("nationality"), "position": player.get("position"),
+            "team_id": team.get("id"), "team_name": team.get("name"),
+            "played_matches": it.get("playedMatches"), "goals": it.get("goals"),
+            "assists": it.get("assists"), "penalties": it.get("penalties"),
+        })
+    return _typed(rows, SCORERS_SCHEMA)
+
+BUILDERS = {
+    "matches": matches_table,
+    "standings": standings_table,
+    "teams": teams_table,
+    "squads": squads_table,
+    "scorers": scorers_table,
+}
+
+# JSON de origem de cada tabela (squads sai do teams_fdorg.json)
+SOURCE = {"matches": "matches", "standings": "standings", "teams": "teams", "squads": "teams", "scorers": "scorers"}
+TABLES_BY_SOURCE = {"matches": ["matches"], "standings": ["standings"], "teams": ["teams", "squads"], "scorers": ["scorers"]}
+
+def sidecar(json_path, table: str) -> Path:
+    """data/raw/teams_fdorg.json + squads -> data/raw/squads_fdorg.parquet;
+    sem o nome da fonte no arquivo: data/raw/foo.json + squads -> data/raw/foo.squads.parquet"""
+    p = Path(json_path)
+    stem = p.stem.replace(SOURCE[table], table, 1)
+    if table not in stem:  # o nome da tabela sempre entra (times e elencos não podem colidir)
+        stem = f"{p.stem}.{table}"
+    return p.with_name(stem + ".parquet")
+
+def write_tables(kind: str, obj, json_path) -> list[Path]:
+    """Grava as tabelas Parquet derivadas de um JSON recém-baixado."""
+    written = []
+    for table in TABLES_BY_SOURCE[kind]:
+        out = sidecar(json_path, table)
+        try:
+            BUILDERS[table](obj).to_parquet(out, index=False)
+        except ImportError as e:  # pyarrow ausente: transformações caem no JSON
+            warn(f"Parquet não gravado ({e}); usando só o JSON")
+            break
+        written.append(out)
+    return written
+
+def fresh_sidecar(table: str, json_path) -> Path | None:
+    """Parquet da tabela, se existir e não for mais antigo que o JSON."""
+    if isinstance(json_path, (dict, list)):
+        return None
+    src, pq = Path(json_path), sidecar(json_path, table)
+    if pq.exists() and (not src.exists() or pq.stat().st_mtime_ns >= src.stat().st_mtime_ns):
+        return pq
+    return None
+
+def load_table(table: str, json_path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Lê a tabela do Parquet (só `columns`) se ele estiver em dia com o JSON;
+    senão monta a partir do JSON (via cache de src.common.raw)."""
+    pq = fresh_sidecar(table, json_path)
+    if pq:
+        try:
+            return pd.read_parquet(pq, columns=columns)
+        except ImportError:
+            pass
+    if table == "matches":  # lotes já reduzidos às colunas pedidas
+        return matches_table(json_path, columns)
+    df = BUILDERS[table](json_path)
+    return df[columns] if columns else df
+
+def numpy_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Inteiros/booleanos anuláveis -> tipos numpy, como sairiam de
+    pd.DataFrame(list[dict]); mantém os CSV curados idênticos aos de antes."""
+    out = df.copy()
+    for c in out.columns:
+        s = out[c]
+        if isinstance(s.dtype, pd.Int64Dtype):
+            out[c] = s.astype("float64") if s.isna().any() else s.astype("int64")
+        elif isinstance(s.dtype, pd.BooleanDtype):
+            out[c] = s.astype(object) if s.isna().any() else s.astype(bool)
+        elif isinstance(s.dtype, pd.StringDtype):
+            out[c] = s.astype(object).where(s.notna(), None)
+    return out
@@ -0,0 +1,128 @@
+# src/common/snapshots.py
+# Arquivo histórico dos JSON brutos: cada conteúdo é gravado uma vez só, em
+# JSON compacto comprimido (gzip), com o nome igual ao seu hash; um índice
+# (index.jsonl) registra (arquivo, coletado_em, hash) a cada mudança. Com ele
+# dá para recuperar os brutos de qualquer momento e refazer o painel daquele dia.
+import os, sys, gzip, json, hashlib, pathlib, argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common import raw
+from src.common.logging_utils import info, ok, warn, err
+
+ROOT = Path(__file__).resolve().parents[2]
+ARCHIVE_DIR = os.getenv("RAW_ARCHIVE_DIR", str(ROOT / "data/_archive/raw"))
+ENABLED = os.getenv("RAW_ARCHIVE", "1").lower() not in ("0", "false", "off", "no")
+
+def _name(path) -> str:
+    """Identidade do bruto: caminho relativo à raiz (data/raw/.../matches_fdorg.json)."""
+    p = Path(path).resolve()
+    try:
+        return p.relative_to(ROOT).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+def _object(sha: str, root) -> Path:
+    return Path(root) / "objects" / sha[:2] / f"{sha}.json.gz"
+
+def _when(ts) -> datetime:
+    if isinstance(ts, datetime):
+        return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    d = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+    return d if d.tzinfo else d.replace(tzinfo=timezone.utc)
+
+def index(root=None) -> list[dict]:
+    p = Path(root or ARCHIVE_DIR) / "index.jsonl"
+    if not p.exists():
+        return []
+    out = []
+    with open(p, encoding="utf-8") as f:
+        for line in f:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue  # linha cortada por um processo interrompido
+    return out
+
+def archive(path, obj, fetched_at=None, root=None) -> str | None:
+    """Guarda `obj` (o conteúdo de `path`) no arquivo; devolve o hash. Conteúdo
+    já guardado não é regravado, e o índice só cresce quando o arquivo muda."""
+    if not ENABLED:
+        return None
+    root = Path(root or ARCHIVE_DIR)
+    name = _name(path)
+    body = raw.dumps(obj)  # os mesmos bytes do data/raw: o hash identifica o arquivo
+    sha = hashlib.sha256(body).hexdigest()
+    dest = _object(sha, root)
+    if not dest.exists():
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + f".{os.getpid()}.tmp")
+        tmp.write_bytes(gzip.compress(body, compresslevel=6, mtime=0))
+        tmp.replace(dest)
+    last = next((e for e in reversed(index(root)) if e["name"] == name), None)
+    if last is None or last["sha256"] != sha:
+        when = _when(fetched_at or datetime.now(timezone.utc)).isoformat()
+        line = json.dumps({"name": name, "fetched_at": when, "sha256": sha, "bytes": len(body)}) + "\n"
+        with open(root / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write(line)  # uma escrita por linha: processos em paralelo não se misturam
+    return sha
+
+def load_object(sha: str, root=None):
+    return json.loads(gzip.decompress(_object(sha, root or ARCHIVE_DIR).read_bytes()))
+
+def history(path, root=None) -> list[dict]:
+    name = _name(path)
+    return [e for e in index(root) if e["name"] == name]
+
+def as_of(path, when, root=None):
+    """Conteúdo de `path` como estava em `when` (última versão coletada até lá)."""
+    t = _when(when)
+    hits = [e for e in history(path, root) if _when(e["fetched_at"]) <= t]
+    if not hits:
+        raise LookupError(f"nenhum snapshot de {_name(path)} até {t.isoformat()}")
+    return load_object(max(hits, key=lambda e: _when(e["fetched_at"]))["sha256"], root)
+
+def restore(when, dest=".", root=None) -> list[Path]:
+    """Grava em `dest` todos os brutos como estavam em `when` (mesmos caminhos)."""
+    t = _when(when)
+    latest: dict[str, dict] = {}
+    for e in index(root):
+        if _when(e["fetched_at"]) <= t and (e["name"] not in latest or _when(e["fetched_at"]) >= _when(latest[e["name"]]["fetched_at"])):
+            latest[e["name"]] = e
+    written = []
+    for name, e in sorted(latest.items()):
+        out = Path(dest) / name
+        raw.save(out, load_object(e["sha256"], root))
+        written.append(out)
+    return written
+
+def main():
+    ap = argparse.ArgumentParser(prog="snapshots", description="Arquivo histórico dos JSON brutos")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ls = sub.add_parser("list", help="versões guardadas")
+    ls.add_argument("path", nargs="?", help="bruto (padrão: todos)")
+    rs = sub.add_parser("restore", help="grava os brutos como estavam num momento")
+    rs.add_argument("--as-of", required=True, help="ex.: 2025-08-10T22:00:00Z")
+    rs.add_argument("--dest", default=".", help="raiz onde recriar data/raw/... (padrão: o próprio projeto)")
+    args = ap.parse_args()
+
+    if args.cmd == "list":
+        entries = history(args.path) if args.path else index()
+        for e in entries:
+            print(f"{e['fetched_at']}  {e['sha256'][:12]}  {e['bytes']:>10}  {e['name']}")
+        info(f"{len(entries)} versão(ões)")
+    else:
+        written = restore(args.as_of, args.dest)
+        if not written:
+            warn(f"nenhum snapshot até {args.as_of}")
+        for p in written:
+            ok(f"restaurado: {p}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        err(f"Falha: {e}")
+        raise
@@ -0,0 +1,34 @@
+# src/common/sql.py
+# Conexão DuckDB em memória com as tabelas brutas colunares como views.
+# Cada view ganha a coluna `ord` (ordem original das linhas no arquivo), usada
+# para reproduzir desempates e "primeiro valor" exatamente como no pandas.
+from src.common import raw_tables
+
+def _lit(s) -> str:
+    return "'" + str(s).replace("'", "''") + "'"
+
+def connect(**tables):
+    """connect(matches="data/raw/matches_fdorg.json", standings=...) -> conexão
+    com uma view por tabela. Usa o Parquet se estiver em dia; senão o JSON."""
+    import duckdb
+
+    con = duckdb.connect()
+    for name, src in tables.items():
+        pq = raw_tables.fresh_sidecar(name, src)
+        if pq:
+            con.execute(f"CREATE VIEW {name} AS SELECT * EXCLUDE (file_row_number), file_row_number AS ord "
+                        f"FROM read_parquet({_lit(pq.resolve().as_posix())}, file_row_number=true)")
+        else:
+            df = raw_tables.load_table(name, src)
+            df["ord"] = range(len(df))
+            con.register(name, df)
+    return con
+
+def frame(con, query: str, params=None):
+    """Resultado como DataFrame montado de tuplas Python, com a mesma inferência
+    de tipos de pd.DataFrame(list[dict]) usada pelas versões em pandas."""
+    import pandas as pd
+
+    cur = con.execute(query, params or [])
+    cols = [d[0] for d in cur.description]
+    return pd.DataFrame(cur.fetchall(), columns=cols)
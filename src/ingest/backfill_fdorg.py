@@ -0,0 +1,254 @@
+# src/ingest/backfill_fdorg.py
+# Carga histórica: baixa várias temporadas/competições para o layout
+# particionado (data/raw/competition=BSA/season=2015/...). Cada endpoint ×
+# partição vira um item numa fila persistente (SQLite em data/_pipeline); os
+# itens saem em paralelo, sob o limitador de cota do client_fdorg, e a fila
+# sobrevive a interrupções: rodar de novo continua do que faltou. Partições já
+# no disco são marcadas como feitas sem chamar a API.
+import sys, json, time, sqlite3, pathlib, argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.config_fdorg import validate_config
+from src.common.logging_utils import info, ok, warn, err
+from src.common import raw
+from src.ingest import client_fdorg
+from src.ingest.fetch_all_fdorg import ENDPOINTS
+from src.pipeline.partitions import Partition, parse_partitions
+
+QUEUE_PATH = "data/_pipeline/backfill_fdorg.sqlite"
+WORKERS = 4
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    competition TEXT NOT NULL,
+    season TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    out TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',   -- pending | running | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    seconds REAL,
+    error TEXT,
+    updated REAL
+);
+"""
+
+def out_path(part: Partition, endpoint: str) -> str:
+    """Mesmo caminho das etapas particionadas do run_all."""
+    return f"{part.dir('raw')}/{endpoint}_fdorg.json"
+
+def complete(path) -> bool:
+    """JSON já no disco e legível: a partição deste endpoint não precisa de chamada."""
+    p = Path(path)
+    if not p.exists() or p.stat().st_size == 0:
+        return False
+    try:
+        return isinstance(json.loads(raw.decode(p.read_bytes())), dict)
+    except ValueError:
+        return False
+
+class Queue:
+    def __init__(self, path=QUEUE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(path, isolation_level=None, timeout=30)
+        self.con.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.con.close()
+
+    def add(self, parts: list[Partition], endpoints: list[str]) -> int:
+        """Enfileira endpoint × partição; itens já na fila ficam como estão."""
+        before = self.con.total_changes
+        self.con.executemany(
+            "INSERT OR IGNORE INTO items (id, competition, season, endpoint, out, updated) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"{p.tag}/{e}", p.competition, p.season, e, out_path(p, e), time.time()) for p in parts for e in endpoints])
+        return self.con.total_changes - before
+
+    def recover(self) -> int:
+        """Itens 'running' de uma execução interrompida voltam para a fila."""
+        return self.con.execute("UPDATE items SET state = 'pending' WHERE state = 'running'").rowcount
+
+    def retry_failed(self) -> int:
+        return self.con.execute("UPDATE items SET state = 'pending', attempts = 0 WHERE state = 'failed'").rowcount
+
+    def claim(self, ids: list[str] | None = None) -> dict | None:
+        """Próximo item pendente (de `ids`, se dado), já marcado como 'running'."""
+        self.con.execute("BEGIN IMMEDIATE")  # outro backfill na mesma fila não pega o mesmo item
+        try:
+            sql = "SELECT id, competition, season, endpoint, out, attempts FROM items WHERE state = 'pending'"
+            args = []
+            if ids is not None:
+                sql += f" AND id IN ({','.join('?' * len(ids))})"
+                args = ids
+            row = self.con.execute(sql + " ORDER BY competition, season DESC, endpoint LIMIT 1", args).fetchone()
+            if row:
+                self.con.execute("UPDATE items SET state = 'running', updated = ? WHERE id = ?", (time.time(), row[0]))
+            self.con.execute("COMMIT")
+        except BaseException:
+            self.con.execute("ROLLBACK")
+            raise
+        if not row:
+            return None
+        return dict(zip(("id", "competition", "season", "endpoint", "out", "attempts"), row))
+
+    def finish(self, item_id: str, state: str, seconds: float | None = None, error: str | None = None,
+               attempt: bool = False) -> None:
+        """Novo estado do item; `attempt`: conta uma ida à API."""
+        self.con.execute(
+            "UPDATE items SET state = ?, seconds = ?, error = ?, updated = ?, attempts = attempts + ? WHERE id = ?",
+            (state, seconds, error, time.time(), int(attempt), item_id))
+
+    def counts(self, ids: list[str] | None = None) -> dict[str, int]:
+        sql, args = "SELECT state, count(*) FROM items", []
+        if ids is not None:
+            sql += f" WHERE id IN ({','.join('?' * len(ids))})"
+            args = ids
+        return dict(self.con.execute(sql + " GROUP BY state", args).fetchall())
+
+    def failures(self) -> list[tuple[str, str]]:
+        return self.con.execute("SELECT id, error FROM items WHERE state = 'failed' ORDER BY id").fetchall()
+
+def _eta(seconds: float) -> str:
+    m, s = divmod(int(seconds + 0.5), 60)
+    h, m = divmod(m, 60)
+    return f"{h}h{m:02d}m" if h else (f"{m}m{s:02d}s" if m else f"{s}s")
+
+def _permanent(e: BaseException) -> bool:
+    # 4xx (temporada fora do plano, competição inexistente): tentar de novo não adianta
+    r = getattr(e, "response", None)
+    return isinstance(e, requests.HTTPError) and r is not None and 400 <= r.status_code < 500 and r.status_code != 429
+
+def _fetch(item: dict) -> float:
+    t = time.perf_counter()
+    ENDPOINTS[item["endpoint"]].run(item["out"], competition=item["competition"], season=item["season"])
+    return time.perf_counter() - t
+
+def run(partitions, endpoints=None, workers=WORKERS, queue=QUEUE_PATH, refresh=False,
+        retry_failed=False, max_attempts=MAX_ATTEMPTS) -> dict:
+    """Executa a fila para `partitions` × `endpoints` (padrão: todos). Devolve a
+    contagem por estado dos itens pedidos."""
+    parts = parse_partitions(partitions) if isinstance(partitions, str) else list(partitions)
+    names = list(endpoints or ENDPOINTS)
+    if not parts:
+        raise ValueError("nenhuma partição (ex.: --partitions BSA:2015-2025)")
+    validate_config()
+    q = Queue(queue)
+    try:
+        added = q.add(parts, names)
+        if q.recover():
+            warn("itens de uma execução interrompida voltaram para a fila")
+        if retry_failed:
+            q.retry_failed()
+        ids = [f"{p.tag}/{e}" for p in parts for e in names]
+        if refresh:
+            q.con.execute(f"UPDATE items SET state = 'pending', attempts = 0 WHERE id IN ({','.join('?' * len(ids))})", ids)
+
+        # o que já está no disco não vai à rede
+        skipped, todo = 0, []
+        for item_id, out in q.con.execute(
+                f"SELECT id, out FROM items WHERE state = 'pending' AND id IN ({','.join('?' * len(ids))})", ids).fetchall():
+            if not refresh and complete(out):
+                q.finish(item_id, "done")
+                skipped += 1
+            else:
+                todo.append(item_id)
+
+        counts = q.counts(ids)
+        info(f"Backfill: {len(parts)} partição(ões) × {len(names)} endpoint(s) = {len(ids)} itens "
+             f"({added} novo(s) na fila, {skipped} já no disco, {counts.get('done', 0)} feito(s), "
+             f"{len(todo)} a baixar, {counts.get('failed', 0)} com falha)")
+        if not todo:
+            ok("Nada a baixar")
+            return counts
+
+        t0, fetched, total = time.perf_counter(), 0, len(todo)
+        with ThreadPoolExecutor(max_workers=max(1, int(workers))) as ex:
+            running = {}
+
+            def refill():
+                while len(running) < max(1, int(workers)):
+                    item = q.claim(todo)
+                    if item is None:
+                        return
+                    running[ex.submit(_fetch, item)] = item
+
+            refill()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    item = running.pop(fut)
+                    try:
+                        secs = fut.result()
+                        q.finish(item["id"], "done", round(secs, 2), attempt=True)
+                        fetched += 1
+                        status, log = f"ok em {secs:.1f}s", ok
+                    except Exception as e:
+                        last = _permanent(e) or item["attempts"] + 1 >= max_attempts
+                        q.finish(item["id"], "failed" if last else "pending", error=str(e)[:500], attempt=True)
+                        status, log = f"falhou ({e})" + ("" if last else "; volta para a fila"), warn
+                    left = q.counts(todo).get("pending", 0) + len(running)
+                    elapsed = time.perf_counter() - t0
+                    # o maior entre o ritmo medido e o que a cota ainda permite (1 chamada por item)
+                    eta = f", ETA {_eta(max(elapsed / fetched * left, client_fdorg.limiter.eta(left)))}" if fetched and left else ""
+                    log(f"[{total - left}/{total}] {item['id']} {status}{eta}")
+                refill()
+        client_fdorg.close()
+
+        counts = q.counts(ids)
+        for item_id, error in q.failures():
+            if item_id in ids:
+                err(f"{item_id}: {error}")
+        ok(f"Backfill: {fetched} item(ns) baixado(s) em {_eta(time.perf_counter() - t0)}; "
+           f"{counts.get('done', 0)}/{len(ids)} feitos, {counts.get('failed', 0)} com falha, "
+           f"{counts.get('pending', 0)} pendente(s)")
+        return counts
+    finally:
+        q.close()
+
+def status(queue=QUEUE_PATH) -> None:
+    if not Path(queue).exists():
+        info("Fila de backfill vazia")
+        return
+    q = Queue(queue)
+    try:
+        rows = q.con.execute("SELECT competition, season, endpoint, state, attempts, seconds FROM items "
+                             "ORDER BY competition, season, endpoint").fetchall()
+        for comp, season, ep, state, attempts, secs in rows:
+            print(f"{comp:<5} {season:<6} {ep:<10} {state:<8} tentativas={attempts} {'' if secs is None else f'{secs:.1f}s'}")
+        info(", ".join(f"{n} {s}" for s, n in sorted(q.counts().items())) or "Fila vazia")
+    finally:
+        q.close()
+
+def main():
+    ap = argparse.ArgumentParser(prog="backfill_fdorg", description="Carga histórica de temporadas do Football-Data.org")
+    ap.add_argument("--partitions", help="ex.: BSA:2015-2025,PL:2024 (obrigatório, exceto com --status)")
+    ap.add_argument("--only", nargs="+", choices=list(ENDPOINTS), help="endpoints (padrão: todos)")
+    ap.add_argument("--workers", type=int, default=WORKERS, help="itens em paralelo (a cota é dividida entre eles)")
+    ap.add_argument("--queue", default=QUEUE_PATH)
+    ap.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    ap.add_argument("--refresh", action="store_true", help="baixa de novo mesmo o que já está no disco")
+    ap.add_argument("--retry-failed", action="store_true", help="devolve à fila os itens que falharam de vez")
+    ap.add_argument("--status", action="store_true", help="só mostra a fila")
+    args = ap.parse_args()
+    if args.status:
+        status(args.queue)
+        return
+    if not args.partitions:
+        ap.error("--partitions é obrigatório")
+    counts = run(args.partitions, args.only, args.workers, args.queue, args.refresh, args.retry_failed, args.max_attempts)
+    if counts.get("failed") or counts.get("pending"):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+        ok("Concluído")
+    except Exception as e:
+        err(f"Falha: {e}")
+        raise
@@ -0,0 +1,99 @@
+# src/ingest/client_fdorg.py
+# Cliente único do Football-Data.org: uma sessão HTTP com pool de conexões
+# keep-alive (um handshake TLS por conexão, não por chamada) e uma política de
+# retentativa compartilhada por todos os fetch_*_fdorg. Toda chamada passa
+# antes pelo cache HTTP (src/common/http_cache.py: TTL por endpoint e GET
+# condicional) e, se for à rede, pelo limitador de cota (src/common/ratelimit.py),
+# comum a todos os processos da máquina. Cada ida à rede é medida e registrada
+# por src/common/http_metrics.py.
+import re, sys, json, pathlib, threading
+import requests
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.config_fdorg import FDORG_BASE_URL, FDORG_RATE_LIMIT, FDORG_RATE_STATE, headers
+from src.common.ratelimit import RateLimiter
+from src.common.logging_utils import warn
+from src.common import http_cache, http_metrics
+
+POOL_SIZE = 8
+TIMEOUT = 30
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# validade do cache por endpoint (segundos); depois dela a chamada vai condicional
+TTL = {"teams": 24 * 3600, "standings": 120, "matches": 120, "scorers": 600}
+
+_session: requests.Session | None = None
+_guard = threading.Lock()
+limiter = RateLimiter(FDORG_RATE_STATE, FDORG_RATE_LIMIT)
+
+def session() -> requests.Session:
+    """Sessão do processo (criada na primeira chamada)."""
+    global _session
+    with _guard:
+        if _session is None:
+            _session = http_metrics.session(POOL_SIZE)
+        return _session
+
+def close() -> None:
+    global _session
+    with _guard:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def _retryable(e: BaseException) -> bool:
+    # erro de rede ou 429/5xx; 4xx (token inválido, temporada inexistente) falha na hora
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code in RETRY_STATUS
+    return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+def endpoint(path: str) -> str:
+    """Rótulo do endpoint nas métricas: /competitions/BSA/matches -> competitions/{code}/matches."""
+    path = re.sub(r"/\d+(?=/|$)", "/{id}", path.strip("/"))
+    return re.sub(r"^competitions/[^/]+", "competitions/{code}", path)
+
+def _before_sleep(state) -> None:
+    http_metrics.set_attempt(state.attempt_number)
+    path = state.args[0] if state.args else "?"
+    warn(f"{path}: tentativa {state.attempt_number} falhou ({state.outcome.exception()}); "
+         f"nova tentativa em {state.next_action.sleep:.0f}s")
+
+def _send(url, params=None, headers=None, timeout=TIMEOUT) -> requests.Response:
+    limiter.acquire()
+    try:
+        r = http_metrics.get(session(), url, endpoint(url.removeprefix(FDORG_BASE_URL)),
+                             params=params, headers=headers, timeout=timeout)
+    except requests.RequestException:
+        limiter.update(None)
+        raise
+    limiter.update(r.headers, r.status_code)
+    return r
+
+def fetch(path: str, params: dict | None = None, extra_headers: dict | None = None,
+          ttl: float | None = None, use_cache: bool = True) -> tuple[dict, bool]:
+    """GET {FDORG_BASE_URL}{path} -> (JSON, mudou desde a última coleta?).
+    `ttl` padrão: TTL do endpoint (último trecho de `path`). `use_cache=False`
+    para respostas que o chamador já guarda (ex.: detalhes de partidas)."""
+    http_metrics.set_attempt(0)
+    return _fetch(path, params, extra_headers, ttl, use_cache)
+
+@retry(retry=retry_if_exception(_retryable), stop=stop_after_attempt(3),
+       wait=wait_exponential(multiplier=1, min=2, max=8), before_sleep=_before_sleep, reraise=True)
+def _fetch(path, params, extra_headers, ttl, use_cache) -> tuple[dict, bool]:
+    h = headers()
+    h.update(extra_headers or {})
+    if not use_cache:
+        r = _send(f"{FDORG_BASE_URL}{path}", params, h)
+        r.raise_for_status()
+        return r.json(), True
+    if ttl is None:
+        ttl = TTL.get(path.rstrip("/").rsplit("/", 1)[-1], 0)
+    c = http_cache.get(f"{FDORG_BASE_URL}{path}", params, h, ttl=ttl, send=_send,
+                       vary=extra_headers, timeout=TIMEOUT)
+    return json.loads(c.content), c.changed
+
+def get(path: str, params: dict | None = None, extra_headers: dict | None = None) -> dict:
+    """GET {FDORG_BASE_URL}{path} -> JSON."""
+    return fetch(path, params, extra_headers)[0]
@@ -0,0 +1,66 @@
+# src/ingest/fetch_all_fdorg.py
+# Ingestão completa do Football-Data.org num processo só: os quatro endpoints
+# em paralelo sobre a mesma sessão (client_fdorg), cada JSON gravado assim que
+# a sua resposta chega. Leva o tempo do endpoint mais lento, não a soma.
+import sys, time, pathlib, argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.config_fdorg import FDORG_COMPETITION, SEASON
+from src.common.logging_utils import info, ok, err
+from src.ingest import client_fdorg, fetch_teams_fdorg, fetch_standings_fdorg, fetch_matches_fdorg, fetch_scorers_fdorg
+
+OUT_DIR = "data/raw"
+
+ENDPOINTS = {
+    "teams": fetch_teams_fdorg,
+    "standings": fetch_standings_fdorg,
+    "matches": fetch_matches_fdorg,
+    "scorers": fetch_scorers_fdorg,
+}
+
+def run(out_dir=OUT_DIR, competition=FDORG_COMPETITION, season=SEASON, endpoints=None) -> dict:
+    """Baixa `endpoints` (padrão: todos) para {out_dir}/{nome}_fdorg.json.
+    Devolve {nome: segundos}; falha (depois de tentar todos) se algum falhar."""
+    names = list(endpoints or ENDPOINTS)
+    t0, took, failed = time.perf_counter(), {}, {}
+
+    def fetch(name):
+        t = time.perf_counter()
+        ENDPOINTS[name].run(f"{out_dir}/{name}_fdorg.json", competition=competition, season=season)
+        return time.perf_counter() - t
+
+    info(f"Coletando {', '.join(names)} ({competition} {season}) em paralelo...")
+    with ThreadPoolExecutor(max_workers=len(names)) as ex:
+        futs = {ex.submit(fetch, n): n for n in names}
+        for f in as_completed(futs):
+            name = futs[f]
+            try:
+                took[name] = f.result()
+                ok(f"{name}: {took[name]:.1f}s")
+            except Exception as e:
+                failed[name] = e
+                err(f"{name}: {e}")
+    client_fdorg.close()
+    if failed:
+        raise RuntimeError(f"falha em {', '.join(failed)}")
+    ok(f"Ingestão concluída em {time.perf_counter() - t0:.1f}s (soma dos endpoints: {sum(took.values()):.1f}s)")
+    return took
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out-dir", default=OUT_DIR)
+    ap.add_argument("--competition", default=FDORG_COMPETITION)
+    ap.add_argument("--season", default=SEASON)
+    ap.add_argument("--only", nargs="+", choices=list(ENDPOINTS))
+    args = ap.parse_args()
+    run(args.out_dir, args.competition, args.season, args.only)
+
+if __name__ == "__main__":
+    try:
+        main()
+        ok("Concluído")
+    except Exception as e:
+        err(f"Falha: {e}")
+        raise
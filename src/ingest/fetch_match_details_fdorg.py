@@ -0,0 +1,132 @@
+# src/ingest/fetch_match_details_fdorg.py
+# Detalhes por partida (gols, substituições, escalações, cartões) via
+# /matches/{id}, só para partidas encerradas que ainda não estão no arquivo.
+# O arquivo é JSON Lines compacto e só cresce: cada resposta é acrescentada e
+# gravada em disco assim que chega, então ele mesmo serve de checkpoint — uma
+# coleta interrompida continua de onde parou.
+import sys, json, os, pathlib, argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.config_fdorg import validate_config
+from src.common.logging_utils import info, ok, warn, err
+from src.common import raw
+from src.ingest import client_fdorg
+
+MATCHES_IN = "data/raw/matches_fdorg.json"
+OUT_DEFAULT = "data/raw/match_details_fdorg.jsonl"
+WORKERS = 4  # o limitador de cota é que dita o ritmo; isto só limita as conexões abertas
+DONE = {"FINISHED", "AWARDED"}
+# sem estes cabeçalhos a API pode devolver as listas dobradas (vazias)
+UNFOLD = {"X-Unfold-Lineups": "true", "X-Unfold-Bookings": "true", "X-Unfold-Subs": "true", "X-Unfold-Goals": "true"}
+
+def _repair(path: Path) -> None:
+    """Descarta uma última linha incompleta (processo morto no meio da gravação)."""
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return
+        f.seek(0)
+        f.truncate(f.read().rfind(b"\n") + 1)
+    warn(f"{path}: última linha incompleta descartada")
+
+def stored_ids(path) -> set[int]:
+    path = Path(path)
+    ids = set()
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    ids.add(int(json.loads(line)["id"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    return ids
+
+def load(path=OUT_DEFAULT) -> dict[int, dict]:
+    """{id da partida: detalhe}; com repetições vale a última."""
+    out = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            d = json.loads(line)
+            out[int(d["id"])] = d
+    return out
+
+def _fetch(match_id: int) -> dict:
+    data, _ = client_fdorg.fetch(f"/matches/{match_id}", extra_headers=UNFOLD, use_cache=False)
+    return data
+
+def run(matches_in=MATCHES_IN, out=OUT_DEFAULT, workers=WORKERS, limit=None) -> dict:
+    """Baixa os detalhes das partidas encerradas que faltam em `out` (no máximo
+    `limit` por execução). Devolve {"fetched", "failed", "pending"}."""
+    validate_config()
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    _repair(out)
+    have = stored_ids(out)
+    todo = [int(m["id"]) for m in raw.iter_matches(matches_in) if m.get("status") in DONE and m.get("id") is not None]
+    todo = [i for i in dict.fromkeys(todo) if i not in have]
+    pending = len(todo)
+    if limit:
+        todo = todo[:int(limit)]
+    if not todo:
+        ok(f"Detalhes de partidas em dia ({len(have)} no arquivo)")
+        return {"fetched": 0, "failed": 0, "pending": 0}
+
+    info(f"Coletando detalhes de {len(todo)} partida(s) ({len(have)} já no arquivo, {workers} conexões)...")
+    fetched = failed = 0
+    queue = iter(todo)
+    with open(out, "a", encoding="utf-8") as f, ThreadPoolExecutor(max_workers=max(1, int(workers))) as ex:
+        running = {}
+
+        def refill():
+            # só `workers` partidas submetidas por vez: num Ctrl-C ou erro, sair do
+            # `with` espera só as que estão em andamento, não a fila inteira
+            while len(running) < max(1, int(workers)):
+                match_id = next(queue, None)
+                if match_id is None:
+                    return
+                running[ex.submit(_fetch, match_id)] = match_id
+
+        refill()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                match_id = running.pop(fut)
+                try:
+                    d = fut.result()
+                except Exception as e:
+                    failed += 1
+                    err(f"partida {match_id}: {e}")
+                    continue
+                # só esta thread escreve; cada linha vai para o disco antes da próxima
+                f.write(json.dumps(d, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                fetched += 1
+                if fetched % 25 == 0:
+                    info(f"{fetched}/{len(todo)} partidas")
+            refill()
+    ok(f"Detalhes salvos em {out}: {fetched} nova(s), {failed} falha(s), {pending - fetched} pendente(s)")
+    if failed and not fetched:
+        raise RuntimeError("nenhum detalhe de partida coletado")
+    return {"fetched": fetched, "failed": failed, "pending": pending - fetched}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--matches-in", default=MATCHES_IN)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--limit", type=int, help="máximo de partidas por execução")
+    args = ap.parse_args()
+    run(args.matches_in, args.out, args.workers, args.limit)
+
+if __name__ == "__main__":
+    try:
+        main()
+        ok("Concluído")
+    except Exception as e:
+        err(f"Falha: {e}")
+        raise
@@ -1,32 +1,69 @@
-import sys, pathlib, json, requests
+import sys, pathlib, argparse
+from datetime import date, timedelta
 from pathlib import Path
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
-from src.common.config_fdorg import FDORG_BASE_URL, FDORG_COMPETITION, SEASON, headers, validate_config
+from src.common.config_fdorg import FDORG_COMPETITION, SEASON, validate_config
 from src.common.logging_utils import info, ok, err
+from src.common import raw, raw_tables, snapshots
+from src.common.match_store import MatchStore, store_path
+from src.ingest import client_fdorg
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=8))
-def _call_api():
-    url = f"{FDORG_BASE_URL}/competitions/{FDORG_COMPETITION}/matches"
-    params = {"season": SEASON}
-    h = headers()
-    h.update({
-        "X-Unfold-Bookings": "true"
-    })
-    r = requests.get(url, params=params, headers=h, timeout=30)
-    r.raise_for_status()
-    return r.json()
+def _call_api(competition=FDORG_COMPETITION, season=SEASON, date_from=None, date_to=None):
+    params = {"season": season}
+    if date_from and date_to:
+        params.update(dateFrom=date_from, dateTo=date_to)
+    return client_fdorg.fetch(f"/competitions/{competition}/matches", params,
+                              {"X-Unfold-Bookings": "true"})
 
-def main():
+OUT_DEFAULT = "data/raw/matches_fdorg.json"
+MODES = ("full", "delta")
+
+# janela da coleta delta (a API aceita no máximo 10 dias entre dateFrom e dateTo)
+DAYS_BACK = 3
+DAYS_AHEAD = 7
+
+def run(out=OUT_DEFAULT, competition=FDORG_COMPETITION, season=SEASON, mode="full",
+        days_back=DAYS_BACK, days_ahead=DAYS_AHEAD) -> dict:
+    """mode="full": temporada inteira; mode="delta": só a janela em volta de
+    hoje, mesclada no armazém local (matches_fdorg.sqlite) de onde o JSON
+    completo é remontado. Sem armazém ainda, o delta vira coleta completa."""
     validate_config()
-    info("Coletando partidas no Football-Data.org...")
-    data = _call_api()
-    out = Path("data/raw/matches_fdorg.json")
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    ok("Partidas salvas em data/raw/matches_fdorg.json")
+    out = Path(out)
+    with MatchStore(store_path(out)) as store:
+        if mode == "delta" and store.seeded() and out.exists():
+            lo, hi = date.today() - timedelta(days=days_back), date.today() + timedelta(days=days_ahead)
+            info(f"Coletando partidas no Football-Data.org ({competition} {season}, {lo} a {hi})...")
+            window, _ = _call_api(competition, season, lo.isoformat(), hi.isoformat())
+            n = store.upsert(window.get("matches", []) or [])
+            info(f"{len(window.get('matches', []) or [])} partida(s) na janela, {n} nova(s) ou atualizada(s)")
+            data = store.materialize()
+        else:
+            if mode == "delta":
+                info("Armazém de partidas vazio: coleta completa")
+            info(f"Coletando partidas no Football-Data.org ({competition} {season})...")
+            data, _ = _call_api(competition, season)
+            store.replace(data)
+    # "sem mudanças" é decidido pelo próprio arquivo de saída, não pelo cache HTTP
+    if not raw.save(out, data):
+        ok(f"Partidas sem mudanças desde a última coleta ({out})")
+        return data
+    ok(f"Partidas salvas em {out}")
+    raw_tables.write_tables("matches", data, out)
+    snapshots.archive(out, data)
+    return data
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--competition", default=FDORG_COMPETITION)
+    ap.add_argument("--season", default=SEASON)
+    ap.add_argument("--mode", choices=MODES, default="full", help="delta: só a janela em volta de hoje")
+    ap.add_argument("--days-back", type=int, default=DAYS_BACK)
+    ap.add_argument("--days-ahead", type=int, default=DAYS_AHEAD)
+    args = ap.parse_args()
+    run(args.out, args.competition, args.season, args.mode, args.days_back, args.days_ahead)
 
 if __name__ == "__main__":
     try:
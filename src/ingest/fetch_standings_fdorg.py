@@ -1,29 +1,37 @@
-import sys, pathlib, json, requests
-from pathlib import Path
-from tenacity import retry, stop_after_attempt, wait_exponential
+import sys, pathlib, argparse
 
 # hotfix para execução direta: python src/ingest/fetch_standings_fdorg.py
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
-from src.common.config_fdorg import FDORG_BASE_URL, FDORG_COMPETITION, SEASON, headers, validate_config
+from src.common.config_fdorg import FDORG_COMPETITION, SEASON, validate_config
 from src.common.logging_utils import info, ok, err
+from src.common import raw, raw_tables, snapshots
+from src.ingest import client_fdorg
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=8))
-def _call_api():
-    url = f"{FDORG_BASE_URL}/competitions/{FDORG_COMPETITION}/standings"
-    params = {"season": SEASON}
-    r = requests.get(url, params=params, headers=headers(), timeout=30)
-    r.raise_for_status()
-    return r.json()
+def _call_api(competition=FDORG_COMPETITION, season=SEASON):
+    return client_fdorg.fetch(f"/competitions/{competition}/standings", {"season": season})
 
-def main():
+OUT_DEFAULT = "data/raw/standings_fdorg.json"
+
+def run(out=OUT_DEFAULT, competition=FDORG_COMPETITION, season=SEASON) -> dict:
     validate_config()
-    info("Coletando standings no Football-Data.org...")
-    data = _call_api()
-    out = Path("data/raw/standings_fdorg.json")
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(data, ensure_ascii=False, indent=2),encoding="utf-8")
-    ok("Standings salvos em data/raw/standings_fdorg.json")
+    info(f"Coletando standings no Football-Data.org ({competition} {season})...")
+    data, _ = _call_api(competition, season)
+    if not raw.save(out, data):
+        ok(f"Standings sem mudanças desde a última coleta ({out})")
+        return data
+    ok(f"Standings salvos em {out}")
+    raw_tables.write_tables("standings", data, out)
+    snapshots.archive(out, data)
+    return data
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--competition", default=FDORG_COMPETITION)
+    ap.add_argument("--season", default=SEASON)
+    args = ap.parse_args()
+    run(args.out, args.competition, args.season)
 
 if __name__ == "__main__":
     try:
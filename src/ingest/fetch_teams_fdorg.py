@@ -1,15 +1,29 @@
-import sys, pathlib, requests
+import sys, pathlib, argparse
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
-from src.common.config_fdorg import FDORG_BASE_URL, FDORG_COMPETITION, headers, validate_config
-from src.common.io import save_json
+from src.common.config_fdorg import FDORG_COMPETITION, validate_config
+from src.common import raw, raw_tables, snapshots
+from src.ingest import client_fdorg
 
-def main():
+OUT_DEFAULT = "data/raw/teams_fdorg.json"
+
+def run(out=OUT_DEFAULT, competition=FDORG_COMPETITION, season=None) -> dict:
     validate_config()
-    url = f"{FDORG_BASE_URL}/competitions/{FDORG_COMPETITION}/teams"
-    r = requests.get(url, headers=headers(), timeout=30)
-    r.raise_for_status()
-    save_json("data/raw/teams_fdorg.json", r.json())
+    params = {"season": season} if season else None  # sem temporada: a atual
+    data, _ = client_fdorg.fetch(f"/competitions/{competition}/teams", params)
+    if not raw.save(out, data):
+        return data  # nada novo: não regrava (e as dependentes são puladas)
+    raw_tables.write_tables("teams", data, out)
+    snapshots.archive(out, data)
+    return data
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--competition", default=FDORG_COMPETITION)
+    ap.add_argument("--season")
+    args = ap.parse_args()
+    run(args.out, args.competition, args.season)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,432 @@
+# src/ingest/standin_fdorg.py
+# Servidor local que imita o Football-Data.org (v4) para testar e medir a
+# ingestão sem token nem rede: /competitions/{code}/matches|standings|teams|scorers
+# e /matches/{id}. Serve os JSON gravados de uma pasta (layout de data/raw,
+# com ou sem competition=X/season=Y) ou uma liga sintética determinística, e
+# injeta latência, 5xx, 429, cota por minuto (com os cabeçalhos da API) e
+# corpos lentos. As falhas podem ser trocadas com o servidor no ar (/_faults).
+#
+#   python -m src.ingest.standin_fdorg --port 8088 --latency-ms 150 --quota 10
+#   FDORG_BASE_URL=http://127.0.0.1:8088/v4 FDORG_TOKEN=x python -m src.ingest.fetch_all_fdorg
+from __future__ import annotations
+
+import sys, json, math, time, random, hashlib, pathlib, argparse, threading
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.logging_utils import info, ok
+
+KINDS = ("matches", "standings", "teams", "scorers")
+
+@dataclass
+class Faults:
+    latency_ms: float = 0.0      # atraso antes de responder
+    jitter_ms: float = 0.0       # +- aleatório sobre latency_ms
+    error_rate: float = 0.0      # fração de respostas 503
+    throttle_rate: float = 0.0   # fração de 429 aleatórios (além da cota)
+    quota: int = 0               # chamadas por minuto; 0 = sem cota
+    slow_kbps: float = 0.0       # corpo enviado a esta taxa; 0 = de uma vez
+
+    def update(self, values: dict) -> None:
+        """Aplica os valores (texto da query) só se todos forem válidos;
+        ValueError nomeia o campo inválido."""
+        parsed = {}
+        for f in fields(self):
+            if f.name in values:
+                try:
+                    v = float(values[f.name])
+                    parsed[f.name] = int(v) if isinstance(f.default, int) else v
+                except (TypeError, ValueError, OverflowError):
+                    raise ValueError(f"valor inválido para {f.name}: {values[f.name]!r}") from None
+        for name, v in parsed.items():
+            setattr(self, name, v)
+
+# ----------------- liga sintética -----------------
+def _rng(*key) -> random.Random:
+    return random.Random(int(hashlib.sha256(repr(key).encode()).hexdigest()[:16], 16))
+
+def _goals(r: random.Random, lam: float) -> int:
+    # Poisson por inversão (sem numpy)
+    n = 0
+    p = acc = math.exp(-lam)
+    u = r.random()
+    while u > acc and n < 10:
+        n += 1
+        p *= lam / n
+        acc += p
+    return n
+
+class League:
+    """Liga de `n_teams` em turno e returno, uma rodada por semana a partir de
+    abril; partidas antes de `now` estão encerradas."""
+
+    def __init__(self, competition: str, season: str, seed: int = 0, n_teams: int = 20, now: datetime | None = None):
+        self.competition, self.season = competition, str(season)
+        r = _rng(seed, competition, season)
+        self.now = now or datetime.now(timezone.utc)
+        base_id = 1000 + (int(hashlib.md5(competition.encode()).hexdigest()[:4], 16) % 50) * 100
+        self.teams = [{
+            "id": base_id + i, "name": f"{competition} Clube {i + 1:02d}", "shortName": f"Clube {i + 1:02d}",
+            "tla": f"C{i + 1:02d}", "crest": f"https://crests.example/{base_id + i}.png",
+            "strength": r.uniform(0.8, 1.8),
+        } for i in range(n_teams)]
+        self.players = {t["id"]: [{
+            "id": t["id"] * 100 + k, "name": f"Jogador {t['tla']}-{k + 1:02d}",
+            "position": ("Goalkeeper", "Defence", "Midfield", "Offence")[min(k // 6, 3)],
+            "dateOfBirth": f"{1990 + k % 12}-0{1 + k % 9}-1{k % 9}", "nationality": "Brazil",
+        } for k in range(23)] for t in self.teams}
+        self.matches, self.details = self._schedule(r, seed)
+
+    def _schedule(self, r: random.Random, seed: int):
+        ids = [t["id"] for t in self.teams]
+        by_id = {t["id"]: t for t in self.teams}
+        n = len(ids)
+        rounds = []
+        rot = ids[:]
+        for _ in range(n - 1):  # método do círculo
+            rounds.append([(rot[i], rot[n - 1 - i]) for i in range(n // 2)])
+            rot = [rot[0], rot[-1], *rot[1:-1]]
+        rounds += [[(b, a) for a, b in rd] for rd in rounds]  # returno
+        start = datetime(int(self.season), 4, 5, 19, 0, tzinfo=timezone.utc) if self.season.isdigit() else self.now
+        matches, details = [], {}
+        mid = int(hashlib.md5(f"{self.competition}{self.season}".encode()).hexdigest()[:5], 16) * 1000
+        for md, rd in enumerate(rounds, start=1):
+            for k, (h, a) in enumerate(rd):
+                mid += 1
+                kickoff = start + timedelta(weeks=md - 1, hours=(k % 5) * 2 - 4)
+                finished = kickoff + timedelta(hours=2) <= self.now
+                live = kickoff <= self.now < kickoff + timedelta(hours=2)
+                home, away = by_id[h], by_id[a]
+                hg = _goals(r, 1.4 * home["strength"] / away["strength"]) if finished else None
+                ag = _goals(r, 1.0 * away["strength"] / home["strength"]) if finished else None
+                winner = None if not finished else ("HOME_TEAM" if hg > ag else "AWAY_TEAM" if hg < ag else "DRAW")
+                updated = (min(self.now, kickoff + timedelta(hours=2, minutes=15)) if finished else kickoff - timedelta(days=7))
+                m = {
+                    "area": {"id": 2032, "name": "Brazil", "code": "BRA"},
+                    "competition": {"id": 2013, "name": self.competition, "code": self.competition, "type": "LEAGUE"},
+                    "season": {"id": int(self.season) if self.season.isdigit() else 0,
+                               "startDate": f"{self.season}-04-01", "endDate": f"{self.season}-12-15"},
+                    "id": mid, "utcDate": kickoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "status": "FINISHED" if finished else "IN_PLAY" if live else "TIMED",
+                    "matchday": md, "stage": "REGULAR_SEASON", "group": None,
+                    "lastUpdated": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "homeTeam": {k2: home[k2] for k2 in ("id", "name", "shortName", "tla", "crest")},
+                    "awayTeam": {k2: away[k2] for k2 in ("id", "name", "shortName", "tla", "crest")},
+                    "score": {"winner": winner, "duration": "REGULAR",
+                              "fullTime": {"home": hg, "away": ag},
+                              "halfTime": {"home": None if hg is None else hg // 2, "away": None if ag is None else ag // 2}},
+                    "odds": {"msg": "Activate Odds-Package in User-Panel to retrieve odds."},
+                    "referees": [],
+                }
+                matches.append(m)
+                if finished:
+                    details[mid] = self._detail(m, _rng(seed, mid))
+        return matches, details
+
+    def _detail(self, m: dict, r: random.Random) -> dict:
+        goals = []
+        for side, n in (("homeTeam", m["score"]["fullTime"]["home"]), ("awayTeam", m["score"]["fullTime"]["away"])):
+            squad = self.players[m[side]["id"]]
+            for _ in range(n):
+                p = r.choice(squad[12:])
+                goals.append({"minute": r.randint(1, 90), "injuryTime": None, "type": "REGULAR",
+                              "team": {"id": m[side]["id"], "name": m[side]["name"]},
+                              "scorer": {"id": p["id"], "name": p["name"]}, "assist": None,
+                              "score": None})
+        goals.sort(key=lambda g: g["minute"])
+        h = a = 0
+        for g in goals:
+            h, a = (h + 1, a) if g["team"]["id"] == m["homeTeam"]["id"] else (h, a + 1)
+            g["score"] = {"home": h, "away": a}
+        bookings = [{"minute": r.randint(1, 90), "team": {"id": m[s]["id"], "name": m[s]["name"]},
+                     "player": {"id": (p := r.choice(self.players[m[s]["id"]][:18]))["id"], "name": p["name"]},
+                     "card": "YELLOW"} for s in ("homeTeam", "awayTeam") for _ in range(r.randint(0, 4))]
+        return {**m, "goals": goals, "bookings": sorted(bookings, key=lambda b: b["minute"]),
+                "substitutions": [], "penalties": []}
+
+    def payload(self, kind: str) -> dict:
+        filters = {"season": self.season}
+        if kind == "matches":
+            fin = [m for m in self.matches if m["status"] == "FINISHED"]
+            return {"filters": filters, "resultSet": {"count": len(self.matches), "first": self.matches[0]["utcDate"][:10],
+                    "last": self.matches[-1]["utcDate"][:10], "played": len(fin)},
+                    "competition": self.matches[0]["competition"], "matches": self.matches}
+        if kind == "standings":
+            return {"filters": filters, "competition": self.matches[0]["competition"],
+                    "season": self.matches[0]["season"],
+                    "standings": [{"stage": "REGULAR_SEASON", "type": t, "group": None, "table": self._table(t)}
+                                  for t in ("TOTAL", "HOME", "AWAY")]}
+        if kind == "teams":
+            return {"count": len(self.teams), "filters": filters, "competition": self.matches[0]["competition"],
+                    "season": self.matches[0]["season"], "teams": [{
+                        "area": {"id": 2032, "name": "Brazil", "code": "BRA", "flag": None},
+                        **{k: t[k] for k in ("id", "name", "shortName", "tla", "crest")},
+                        "address": None, "website": None, "founded": 1900 + t["id"] % 100,
+                        "clubColors": "Red / White", "venue": f"Estádio {t['shortName']}",
+                        "runningCompetitions": [self.matches[0]["competition"]],
+                        "coach": {"id": t["id"] * 7, "name": f"Técnico {t['tla']}", "nationality": "Brazil",
+                                  "contract": {"start": f"{self.season}-01", "until": f"{self.season}-12"}},
+                        "squad": self.players[t["id"]], "staff": [],
+                        "lastUpdated": f"{self.season}-03-01T00:00:00Z",
+                    } for t in self.teams]}
+        if kind == "scorers":
+            count: dict[int, dict] = {}
+            for d in self.details.values():
+                for g in d["goals"]:
+                    e = count.setdefault(g["scorer"]["id"], {"team": g["team"], "goals": 0, "name": g["scorer"]["name"]})
+                    e["goals"] += 1
+            played = sum(1 for m in self.matches if m["status"] == "FINISHED") * 2 // max(1, len(self.teams))
+            top = sorted(count.items(), key=lambda kv: (-kv[1]["goals"], kv[0]))
+            return {"count": len(top), "filters": filters, "competition": self.matches[0]["competition"],
+                    "season": self.matches[0]["season"], "scorers": [{
+                        "player": {"id": pid, "name": e["name"], "nationality": "Brazil", "position": "Offence"},
+                        "team": e["team"], "playedMatches": played, "goals": e["goals"],
+                        "assists": None, "penalties": None} for pid, e in top]}
+        raise KeyError(kind)
+
+    def _table(self, kind: str) -> list[dict]:
+        rows = {t["id"]: {"team": {k: t[k] for k in ("id", "name", "shortName", "tla", "crest")},
+                          "playedGames": 0, "form": None, "won": 0, "draw": 0, "lost": 0, "points": 0,
+                          "goalsFor": 0, "goalsAgainst": 0, "goalDifference": 0} for t in self.teams}
+        for m in self.matches:
+            if m["status"] != "FINISHED":
+                continue
+            ft = m["score"]["fullTime"]
+            for side, gf, ga in (("homeTeam", ft["home"], ft["away"]), ("awayTeam", ft["away"], ft["home"])):
+                if (kind == "HOME" and side != "homeTeam") or (kind == "AWAY" and side != "awayTeam"):
+                    continue
+                d = rows[m[side]["id"]]
+                d["playedGames"] += 1
+                d["goalsFor"] += gf
+                d["goalsAgainst"] += ga
+                d["won"] += gf > ga
+                d["draw"] += gf == ga
+                d["lost"] += gf < ga
+                d["points"] += 3 if gf > ga else 1 if gf == ga else 0
+                d["goalDifference"] = d["goalsFor"] - d["goalsAgainst"]
+        table = sorted(rows.values(), key=lambda d: (-d["points"], -d["goalDifference"], -d["goalsFor"], d["team"]["id"]))
+        return [{"position": i, **d} for i, d in enumerate(table, start=1)]
+
+# ----------------- dados servidos -----------------
+class Fixtures:
+    """Payloads por (competição, temporada): arquivos gravados em `root` (se houver)
+    ou a liga sintética."""
+
+    def __init__(self, root=None, seed: int = 0, now: datetime | None = None):
+        self.root = Path(root) if root else None
+        self.seed, self.now = seed, now
+        self._leagues: dict[tuple, League] = {}
+        self._files: dict[Path, dict] = {}
+        self._lock = threading.Lock()
+
+    def _file(self, competition: str, season: str | None, name: str) -> dict | None:
+        if not self.root:
+            return None
+        for p in ([self.root / f"competition={competition}" / f"season={season}" / name] if season else []) + [self.root / name]:
+            if p.exists():
+                return self._load(p)
+        return None
+
+    def league(self, competition: str, season: str | None) -> League:
+        key = (competition, season or str(datetime.now(timezone.utc).year))
+        with self._lock:
+            if key not in self._leagues:
+                self._leagues[key] = League(*key, seed=self.seed, now=self.now)
+            return self._leagues[key]
+
+    def competition(self, competition: str, season: str | None, kind: str) -> dict:
+        return self._file(competition, season, f"{kind}_fdorg.json") or self.league(competition, season).payload(kind)
+
+    def match(self, match_id: int) -> dict | None:
+        if self.root:
+            for p in self.root.rglob("match_details_fdorg.jsonl"):
+                for line in p.read_text(encoding="utf-8").splitlines():
+                    d = json.loads(line)
+                    if d.get("id") == match_id:
+                        return d
+            for p in self.root.rglob("matches_fdorg.json"):
+                for m in self._load(p).get("matches", []):
+                    if m.get("id") == match_id:
+                        return {**m, "goals": [], "bookings": [], "substitutions": [], "penalties": []}
+        with self._lock:
+            leagues = list(self._leagues.values())
+        for lg in leagues:
+            if match_id in lg.details:
+                return lg.details[match_id]
+            for m in lg.matches:
+                if m["id"] == match_id:
+                    return m
+        return None
+
+    def _load(self, p: Path) -> dict:
+        with self._lock:
+            if p not in self._files:
+                self._files[p] = json.loads(p.read_text(encoding="utf-8-sig"))
+            return self._files[p]
+
+def _filter_matches(payload: dict, q: dict) -> dict:
+    ms = payload.get("matches", []) or []
+    if "dateFrom" in q and "dateTo" in q:
+        ms = [m for m in ms if q["dateFrom"] <= (m.get("utcDate") or "")[:10] <= q["dateTo"]]
+    if "status" in q:
+        wanted = set(q["status"].split(","))
+        ms = [m for m in ms if m.get("status") in wanted]
+    if "matchday" in q:
+        ms = [m for m in ms if str(m.get("matchday")) == q["matchday"]]
+    if len(ms) == len(payload.get("matches", []) or []):
+        return payload
+    return {**payload, "filters": {**payload.get("filters", {}), **q},
+            "resultSet": {**payload.get("resultSet", {}), "count": len(ms)}, "matches": ms}
+
+# ----------------- servidor -----------------
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, fixtures: Fixtures, faults: Faults, quiet: bool = True):
+        super().__init__(addr, Handler)
+        self.fixtures, self.faults, self.quiet = fixtures, faults, quiet
+        self.lock = threading.Lock()
+        self.window_start, self.used = time.time(), 0
+        self.stats = {"requests": 0, "429": 0, "503": 0, "304": 0, "by_path": {}}
+        self.rng = random.Random(0)
+
+    def admit(self) -> tuple[int, int, int]:
+        """(status, restantes no minuto, segundos até o reset) desta chamada."""
+        f = self.faults
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= 60:
+                self.window_start, self.used = now, 0
+            reset = max(0, int(60 - (now - self.window_start)))
+            self.stats["requests"] += 1
+            if f.quota and self.used >= f.quota:
+                self.stats["429"] += 1
+                return 429, 0, reset
+            self.used += 1
+            left = max(0, f.quota - self.used) if f.quota else 9999
+            if f.throttle_rate and self.rng.random() < f.throttle_rate:
+                self.stats["429"] += 1
+                return 429, left, reset
+            if f.error_rate and self.rng.random() < f.error_rate:
+                self.stats["503"] += 1
+                return 503, left, reset
+            return 200, left, reset
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandIn
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+    def _send(self, status: int, body: bytes, headers: dict | None = None, slow_kbps: float = 0) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        if not slow_kbps:
+            self.wfile.write(body)
+            return
+        chunk = max(1, int(slow_kbps * 1024 / 10))  # 10 pedaços por segundo
+        for i in range(0, len(body), chunk):
+            self.wfile.write(body[i:i + chunk])
+            self.wfile.flush()
+            time.sleep(0.1)
+
+    def _json(self, status: int, obj, headers: dict | None = None, slow_kbps: float = 0) -> None:
+        self._send(status, json.dumps(obj, ensure_ascii=False).encode("utf-8"), headers, slow_kbps)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        if parts and parts[0] == "v4":
+            parts = parts[1:]
+        srv = self.server
+
+        if parts[:1] == ["_faults"]:  # controle: /_faults?latency_ms=200&quota=10
+            try:
+                srv.faults.update(q)
+            except ValueError as e:
+                return self._json(400, {"message": str(e), "errorCode": 400})
+            return self._json(200, asdict(srv.faults))
+        if parts[:1] == ["_stats"]:
+            with srv.lock:
+                return self._json(200, srv.stats)
+
+        f = srv.faults
+        if f.latency_ms or f.jitter_ms:
+            time.sleep(max(0.0, f.latency_ms + srv.rng.uniform(-f.jitter_ms, f.jitter_ms)) / 1000)
+        status, left, reset = srv.admit()
+        quota = {"X-Requests-Available-Minute": left, "X-RequestCounter-Reset": reset}
+        if status == 429:
+            return self._json(429, {"message": f"You reached your request limit. Wait {reset} seconds.", "errorCode": 429}, quota)
+        if status == 503:
+            return self._json(503, {"message": "Service unavailable (simulado)", "errorCode": 503}, quota)
+        if not self.headers.get("X-Auth-Token"):
+            return self._json(403, {"message": "The resource you are looking for is restricted.", "errorCode": 403}, quota)
+
+        if len(parts) == 3 and parts[0] == "competitions" and parts[2] in KINDS:
+            comp, kind = parts[1].upper(), parts[2]
+            payload = srv.fixtures.competition(comp, q.get("season"), kind)
+            if kind == "matches":
+                payload = _filter_matches(payload, {k: v for k, v in q.items() if k != "season"})
+            elif kind == "scorers" and "limit" in q:
+                payload = {**payload, "scorers": (payload.get("scorers") or [])[:int(q["limit"])]}
+        elif len(parts) == 2 and parts[0] == "matches" and parts[1].isdigit():
+            payload = srv.fixtures.match(int(parts[1]))
+            if payload is None:
+                return self._json(404, {"message": "Resource not found", "errorCode": 404}, quota)
+        else:
+            return self._json(404, {"message": "Resource not found", "errorCode": 404}, quota)
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        with srv.lock:
+            key = "/".join(parts[:3] if parts[0] == "competitions" else parts[:1])
+            srv.stats["by_path"][key] = srv.stats["by_path"].get(key, 0) + 1
+        if self.headers.get("If-None-Match") == etag:
+            with srv.lock:
+                srv.stats["304"] += 1
+            return self._send(304, b"", {**quota, "ETag": etag})
+        self._send(200, body, {**quota, "ETag": etag}, f.slow_kbps)
+
+def start(port: int = 0, fixtures=None, faults: Faults | None = None, seed: int = 0, now=None) -> tuple[StandIn, str]:
+    """Sobe o servidor numa thread (porta 0: qualquer livre). Devolve (servidor,
+    base_url para FDORG_BASE_URL). Pare com servidor.shutdown()."""
+    srv = StandIn(("127.0.0.1", port), Fixtures(fixtures, seed, now), faults or Faults())
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}/v4"
+
+def main():
+    ap = argparse.ArgumentParser(prog="standin_fdorg", description="Football-Data.org local para testes e benchmarks")
+    ap.add_argument("--port", type=int, default=8088)
+    ap.add_argument("--fixtures", help="pasta com *_fdorg.json (ex.: data/raw); sem ela, liga sintética")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--now", help="data de referência da liga sintética (ISO, UTC); padrão: agora")
+    ap.add_argument("--verbose", action="store_true", help="loga cada requisição")
+    for fl in fields(Faults):
+        ap.add_argument("--" + fl.name.replace("_", "-"), type=type(fl.default), default=fl.default)
+    args = ap.parse_args()
+    now = datetime.fromisoformat(args.now.replace("Z", "+00:00")) if args.now else None
+    if now and not now.tzinfo:
+        now = now.replace(tzinfo=timezone.utc)
+    faults = Faults(**{fl.name: getattr(args, fl.name) for fl in fields(Faults)})
+    srv = StandIn(("127.0.0.1", args.port), Fixtures(args.fixtures, args.seed, now), faults, quiet=not args.verbose)
+    info(f"Stand-in do Football-Data.org em http://127.0.0.1:{args.port}/v4 "
+         f"({'fixtures ' + args.fixtures if args.fixtures else 'liga sintética'}; falhas: {asdict(faults)})")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        ok("Servidor encerrado.")
+
+if __name__ == "__main__":
+    main()
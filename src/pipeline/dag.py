@@ -0,0 +1,218 @@
+# src/pipeline/dag.py
+from __future__ import annotations
+
+import sys, time, threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.common.logging_utils import info, ok, err
+
+# tipos de etapa: cada um pode ter seu próprio limite de concorrência
+KINDS = ("local", "network", "browser")
+
+@dataclass
+class Step:
+    name: str
+    module: str
+    inputs: dict = field(default_factory=dict)   # parâmetro -> arquivo lido (ou lista de arquivos)
+    outputs: dict = field(default_factory=dict)  # parâmetro -> arquivo gerado
+    params: dict = field(default_factory=dict)   # demais argumentos
+    flags: dict = field(default_factory=dict)    # parâmetro -> flag de CLI (quando difere de --nome)
+    kind: str = "local"
+    optional: bool = False  # fora do plano padrão; entra com --with NOME (ou --only NOME)
+
+    @property
+    def base(self) -> str:
+        """Nome sem a partição: metrics_team_form_fdorg@BSA-2024 -> metrics_team_form_fdorg"""
+        return self.name.split("@", 1)[0]
+
+    def flag(self, key: str) -> str:
+        return self.flags.get(key, "--" + key.replace("_", "-"))
+
+    def input_files(self) -> list:
+        return _flat(self.inputs.values())
+
+    def output_files(self) -> list:
+        return _flat(self.outputs.values())
+
+    def argv(self, python: str = sys.executable) -> list[str]:
+        cmd = [python, "-m", self.module]
+        for k, v in {**self.inputs, **self.outputs, **self.params}.items():
+            cmd += [self.flag(k), *map(str, v)] if isinstance(v, (list, tuple)) else [self.flag(k), str(v)]
+        return cmd
+
+def _flat(values) -> list:
+    out = []
+    for v in values:
+        out.extend(v) if isinstance(v, (list, tuple)) else out.append(v)
+    return out
+
+class StepError(RuntimeError):
+    def __init__(self, name: str, returncode: int = 1, msg: str = ""):
+        super().__init__(msg or f"etapa {name} falhou (código {returncode})")
+        self.name = name
+        self.returncode = returncode
+
+def _key(p) -> str:
+    return Path(p).as_posix()
+
+# ----------------- grafo -----------------
+def build_graph(steps: list[Step]) -> dict[str, set[str]]:
+    """Dependências de cada etapa, inferidas de inputs/outputs declarados."""
+    names = [s.name for s in steps]
+    dup = {n for n in names if names.count(n) > 1}
+    if dup:
+        raise ValueError(f"etapas duplicadas: {', '.join(sorted(dup))}")
+    if any(s.kind not in KINDS for s in steps):
+        raise ValueError(f"kind inválido (use {', '.join(KINDS)})")
+
+    producers = {}
+    for s in steps:
+        for p in s.output_files():
+            k = _key(p)
+            if k in producers:
+                raise ValueError(f"{p} é gerado por {producers[k]} e {s.name}")
+            producers[k] = s.name
+
+    deps = {}
+    for s in steps:
+        deps[s.name] = {producers[_key(p)] for p in s.input_files() if _key(p) in producers} - {s.name}
+    toposort(steps, deps)  # valida ciclos
+    return deps
+
+def toposort(steps: list[Step], deps: dict[str, set[str]]) -> list[Step]:
+    by_name = {s.name: s for s in steps}
+    left = {s.name: set(deps.get(s.name, ())) & by_name.keys() for s in steps}
+    order = []
+    while left:
+        ready = [n for n in by_name if n in left and not left[n]]  # mantém ordem de declaração
+        if not ready:
+            raise ValueError(f"ciclo entre etapas: {', '.join(sorted(left))}")
+        for n in ready:
+            order.append(by_name[n])
+            del left[n]
+        for rest in left.values():
+            rest.difference_update(ready)
+    return order
+
+def _closure(start: set[str], edges: dict[str, set[str]]) -> set[str]:
+    seen, stack = set(start), list(start)
+    while stack:
+        for nxt in edges.get(stack.pop(), ()):
+            if nxt not in seen:
+                seen.add(nxt); stack.append(nxt)
+    return seen
+
+def _names(arg, known) -> set[str]:
+    """Nomes citados; um nome sem partição vale para todas as partições."""
+    if not arg:
+        return set()
+    wanted = {n.strip() for n in (arg.split(",") if isinstance(arg, str) else arg) if n.strip()}
+    found = {k for k in known if k in wanted or k.split("@", 1)[0] in wanted}
+    unknown = {n for n in wanted if not any(k == n or k.split("@", 1)[0] == n for k in known)}
+    if unknown:
+        raise ValueError(f"etapas desconhecidas: {', '.join(sorted(unknown))}")
+    return found
+
+def select(steps: list[Step], deps: dict[str, set[str]], only=None, from_=None, until=None, include=None,
+           exclude=None) -> list[Step]:
+    """--only: só as etapas citadas; --from: elas e tudo que depende delas;
+    --until: elas e tudo de que dependem. Critérios combinados se intersectam.
+    Etapas opcionais ficam de fora, a menos que citadas em --only; `include`
+    (--with) acrescenta etapas à seleção e `exclude` (--skip) retira."""
+    known = [s.name for s in steps]
+    extra = _names(include, known)
+    chosen = {s.name for s in steps if not s.optional or s.name in _names(only, known)}
+    if only:
+        chosen &= _names(only, known)
+    if from_:
+        children = {n: set() for n in known}
+        for n, ds in deps.items():
+            for d in ds:
+                children[d].add(n)
+        chosen &= _closure(_names(from_, known), children)
+    if until:
+        chosen &= _closure(_names(until, known), deps)
+    return [s for s in steps if s.name in (chosen | extra) - _names(exclude, known)]
+
+def critical_path(steps: list[Step], deps: dict[str, set[str]], durations: dict[str, float]) -> tuple[list[str], float]:
+    finish, prev = {}, {}
+    for s in toposort(steps, deps):
+        before = [d for d in deps.get(s.name, ()) if d in finish]
+        best = max(before, key=lambda d: finish[d], default=None)
+        prev[s.name] = best
+        finish[s.name] = (finish[best] if best else 0.0) + durations.get(s.name, 0.0)
+    if not finish:
+        return [], 0.0
+    last = max(finish, key=finish.get)
+    path, node = [], last
+    while node:
+        path.append(node); node = prev[node]
+    return path[::-1], finish[last]
+
+# ----------------- execução -----------------
+def execute(steps: list[Step], deps: dict[str, set[str]], run_step, workers: int = 4, limits: dict | None = None) -> dict[str, float]:
+    """Roda as etapas assim que suas dependências terminam, respeitando
+    `workers` no total e `limits[kind]` por tipo. Retorna segundos por etapa."""
+    limits = limits or {}
+    workers = max(1, workers)
+    selected = {s.name for s in steps}
+    pending = {s.name: s for s in toposort(steps, deps)}
+    waiting = {n: set(deps.get(n, ())) & selected for n in pending}  # dependências fora da seleção já estão prontas
+    busy = {k: 0 for k in KINDS}
+    running, durations, failures = {}, {}, []
+
+    def _timed(st):
+        t0 = time.perf_counter()
+        run_step(st)
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="step") as pool:
+        while pending or running:
+            if not failures:
+                for name in list(pending):
+                    st = pending[name]
+                    if waiting[name] or len(running) >= workers:
+                        continue
+                    if busy[st.kind] >= max(1, limits.get(st.kind, workers)):
+                        continue
+                    del pending[name]
+                    busy[st.kind] += 1
+                    running[pool.submit(_timed, st)] = st
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                st = running.pop(fut)
+                busy[st.kind] -= 1
+                try:
+                    durations[st.name] = fut.result()
+                except Exception as e:
+                    failures.append(e)
+                    err(f"[{st.name}] {e}")
+                    continue
+                for rest in waiting.values():
+                    rest.discard(st.name)
+
+    if failures:
+        first = failures[0]
+        raise first if isinstance(first, StepError) else StepError("pipeline", 1, str(first))
+    return durations
+
+_print_lock = threading.Lock()
+
+def emit(name: str, stdout: str = "", stderr: str = "") -> None:
+    # saídas de etapas concorrentes são impressas em bloco, sem intercalar
+    with _print_lock:
+        if stdout.strip(): print(stdout.strip())
+        if stderr.strip(): err(f"[{name}] {stderr.strip()}")
+
+def log_summary(steps: list[Step], deps: dict[str, set[str]], durations: dict[str, float], wall: float) -> None:
+    if not durations:
+        info(f"tempo total {wall:.2f}s | nenhuma etapa executada")
+        return
+    path, cp = critical_path(steps, deps, durations)
+    info(f"tempo total {wall:.1f}s | soma das etapas {sum(durations.values()):.1f}s | caminho crítico {cp:.1f}s")
+    if path:
+        ok("caminho crítico: " + " → ".join(path))
@@ -0,0 +1,112 @@
+# src/pipeline/manifest.py
+from __future__ import annotations
+
+import json, hashlib, threading
+from pathlib import Path
+
+from src.pipeline.dag import Step
+
+ROOT = Path(__file__).resolve().parents[2]
+MANIFEST_PATH = "data/_pipeline/manifest.json"
+
+# código compartilhado por todas as etapas: mudou aqui, tudo é refeito
+COMMON_CODE = sorted((ROOT / "src" / "common").glob("*.py"))
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _rel(p: Path) -> str:
+    try:
+        return p.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+def module_path(module: str) -> Path:
+    return ROOT.joinpath(*module.split(".")).with_suffix(".py")
+
+class Manifest:
+    """Registro por etapa de (hash das entradas, versão do código, parâmetros).
+    Uma etapa local é pulada quando os três batem e as saídas ainda existem."""
+
+    def __init__(self, path: str | Path = MANIFEST_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        data = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+        self.steps: dict = data.get("steps", {})
+        self.files: dict = data.get("files", {})  # cache de hash por (mtime, tamanho)
+
+    def file_hash(self, path: str | Path) -> str | None:
+        p = Path(path)
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            return None
+        key = _rel(p)
+        with self._lock:
+            cached = self.files.get(key)
+        if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached["sha256"]
+        digest = _sha256(p)
+        with self._lock:
+            self.files[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+        return digest
+
+    def code_version(self, step: Step) -> str:
+        h = hashlib.sha256()
+        for p in [module_path(step.module), *COMMON_CODE]:
+            h.update(p.name.encode())
+            h.update(self.file_hash(p).encode() if p.exists() else b"-")
+        return h.hexdigest()
+
+    def fingerprint(self, step: Step) -> dict:
+        params = {"outputs": step.outputs, "params": step.params}
+        return {
+            "inputs": {p: self.file_hash(p) for p in step.input_files()},
+            "code": self.code_version(step),
+            "params": hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest(),
+        }
+
+    def is_fresh(self, step: Step, fp: dict) -> bool:
+        if any(h is None for h in fp["inputs"].values()):
+            return False
+        if not all(Path(p).exists() for p in step.output_files()):
+            return False
+        with self._lock:
+            return self.steps.get(step.name) == fp
+
+    def record(self, step: Step, fp: dict) -> None:
+        with self._lock:
+            self.steps[step.name] = fp
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"steps": self.steps, "files": self.files}, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+
+def incremental(runner, manifest: Manifest, force: bool = False, skipped: set | None = None):
+    """Envolve um runner: etapas locais sem mudanças são puladas.
+    Etapas de rede/navegador sempre rodam (a fonte é externa); se trouxerem
+    o mesmo conteúdo, as dependentes é que serão puladas."""
+    def _run(step: Step):
+        if step.kind != "local":
+            return runner(step)
+        fp = manifest.fingerprint(step)
+        if not force and manifest.is_fresh(step, fp):
+            if skipped is not None:
+                skipped.add(step.name)
+            return None
+        usage = runner(step)
+        manifest.record(step, fp)
+        return usage
+    return _run
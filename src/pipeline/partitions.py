@@ -0,0 +1,43 @@
+# src/pipeline/partitions.py
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from src.common.config_fdorg import FDORG_COMPETITION, SEASON
+
+@dataclass(frozen=True, order=True)
+class Partition:
+    competition: str
+    season: str
+
+    @property
+    def tag(self) -> str:
+        return f"{self.competition}-{self.season}"
+
+    def dir(self, layer: str) -> str:
+        """data/<camada>/competition=BSA/season=2024"""
+        return f"data/{layer}/competition={self.competition}/season={self.season}"
+
+DEFAULT = Partition(FDORG_COMPETITION, str(SEASON))
+
+def parse_partitions(spec: str | None) -> list[Partition]:
+    """"BSA:2015-2025,PL:2024" -> [BSA 2015, ..., BSA 2025, PL 2024].
+    Sem competição ("2024") vale a de FDORG_COMPETITION."""
+    out = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        comp, _, seasons = item.rpartition(":")
+        comp = (comp or FDORG_COMPETITION).strip().upper()
+        first, _, last = seasons.partition("-")
+        try:
+            years = range(int(first), int(last or first) + 1)
+        except ValueError:
+            raise ValueError(f"partição inválida: {item!r} (use COMP:ANO ou COMP:ANO-ANO)")
+        out += [Partition(comp, str(y)) for y in years]
+    return sorted(set(out))
+
+def from_env() -> list[Partition]:
+    return parse_partitions(os.getenv("FDORG_PARTITIONS"))
@@ -0,0 +1,236 @@
+# src/pipeline/report.py
+from __future__ import annotations
+
+import sys, json, time, threading, statistics
+from pathlib import Path
+from datetime import datetime, timezone
+
+try:
+    import resource  # indisponível no Windows: CPU/RSS de subprocessos ficam vazios
+except ImportError:
+    resource = None
+
+from src.common import raw, raw_tables
+from src.common.logging_utils import info, ok, warn
+from src.pipeline.dag import Step
+
+RUNS_DIR = "data/_pipeline/runs"
+HISTORY_PATH = "data/_pipeline/run_history.jsonl"
+
+def maxrss_mb(ru) -> float:
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return round(ru.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def self_peak_rss_mb() -> float | None:
+    return maxrss_mb(resource.getrusage(resource.RUSAGE_SELF)) if resource else None
+
+def _size(p) -> int:
+    try:
+        return Path(p).stat().st_size
+    except OSError:
+        return 0
+
+def payload_rows(obj) -> int | None:
+    """Linhas de um JSON bruto já em memória (partidas, times, artilheiros, classificação)."""
+    if isinstance(obj, dict):
+        for key in ("matches", "teams", "scorers"):
+            if isinstance(obj.get(key), list):
+                return len(obj[key])
+        if isinstance(obj.get("standings"), list):
+            return sum(len(s.get("table") or []) for s in obj["standings"])
+    return None
+
+def _json_sidecar(p: Path) -> Path | None:
+    for kind, tables in raw_tables.TABLES_BY_SOURCE.items():
+        if kind in p.stem:
+            return raw_tables.fresh_sidecar(tables[0], p)
+    return None
+
+def count_rows(path) -> int | None:
+    """Linhas de um arquivo sem parse do conteúdo: JSON pelo cache de
+    src.common.raw ou pelos metadados do Parquet ao lado, Parquet pelos
+    metadados, CSV contando quebras de linha."""
+    p = Path(path)
+    if not p.exists():
+        return None
+    suffix = p.suffix.lower()
+    try:
+        if suffix == ".json":
+            obj = raw.cached(p)
+            if obj is not None:
+                return payload_rows(obj)
+            p = _json_sidecar(p)
+            if p is None:
+                return None
+            suffix = ".parquet"
+        if suffix == ".csv":
+            with open(p, "rb") as f:
+                return max(0, sum(1 for _ in f) - 1)
+        if suffix == ".parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(p).metadata.num_rows
+    except Exception:
+        return None
+    return None
+
+class RunReport:
+    """Coleta tempo de parede, CPU, pico de RSS, bytes e linhas por etapa."""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.started_at = datetime.now(timezone.utc)
+        self.steps: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._rows: dict[str, int | None] = {}  # caminho -> linhas, já contadas nesta execução
+
+    def measure(self, runner, skipped: set | None = None):
+        """Envolve um runner. Se ele devolver {"cpu_s", "peak_rss_mb"} (modo
+        subprocess: pico de RSS da própria etapa), esses valores prevalecem.
+        Num processo compartilhado o pico é do processo inteiro e só sobe; aí
+        vale `rss_growth_mb`, quanto a etapa elevou esse pico (com etapas em
+        paralelo, aproximado), e `proc_peak_rss_mb` fica só como referência."""
+        def _run(step: Step):
+            rec = {"kind": step.kind, "status": "ok"}
+            t0, c0 = time.perf_counter(), time.thread_time()
+            rss0 = self_peak_rss_mb()
+            try:
+                usage = runner(step) or {}
+            except BaseException:
+                rec["status"] = "failed"
+                usage = {}
+                raise
+            finally:
+                rec["wall_s"] = round(time.perf_counter() - t0, 3)
+                rec["cpu_s"] = round(usage["cpu_s"], 3) if usage.get("cpu_s") is not None else round(time.thread_time() - c0, 3)
+                if usage.get("peak_rss_mb") is not None:
+                    rec["peak_rss_mb"] = usage["peak_rss_mb"]
+                elif "rss_growth_mb" in usage:  # medido no processo do pool
+                    rec["rss_growth_mb"] = usage["rss_growth_mb"]
+                elif rss0 is not None:
+                    rec["proc_peak_rss_mb"] = self_peak_rss_mb()
+                    rec["rss_growth_mb"] = round(max(0.0, rec["proc_peak_rss_mb"] - rss0), 1)
+                if skipped is not None and step.name in skipped:
+                    rec["status"] = "skipped"
+                if rec["status"] == "ok":
+                    # depois da etapa, fora do tempo medido; etapas puladas não custam nada.
+                    # bytes: tamanho dos arquivos de entrada/saída, não I/O medido.
+                    # linhas: do resultado da etapa (run() em processo), das etapas
+                    # anteriores desta execução ou de metadados, sem reler os JSON
+                    outs = step.output_files()
+                    rec["bytes_read"] = sum(_size(p) for p in step.input_files())
+                    rec["bytes_written"] = sum(_size(p) for p in outs)
+                    rec["rows_in"] = self._sum_rows(step.input_files())
+                    for p in outs:
+                        self._rows.pop(str(p), None)
+                    if usage.get("rows_out") is not None and len(outs) == 1:
+                        self._rows[str(outs[0])] = usage["rows_out"]
+                    rec["rows_out"] = self._sum_rows(outs)
+                with self._lock:
+                    self.steps[step.name] = rec
+            return usage
+        return _run
+
+    def _sum_rows(self, paths) -> int | None:
+        counts = []
+        for p in map(str, paths):
+            if p not in self._rows:
+                self._rows[p] = count_rows(p)
+            counts.append(self._rows[p])
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+
+    def to_dict(self, wall_s: float, status: str) -> dict:
+        return {
+            "run_id": self.started_at.strftime("%Y%m%dT%H%M%SZ"),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "mode": self.mode,
+            "status": status,
+            "wall_s": round(wall_s, 3),
+            "steps": self.steps,
+        }
+
+    def save(self, wall_s: float, status: str = "ok", runs_dir: str = RUNS_DIR, history: str = HISTORY_PATH) -> Path:
+        data = self.to_dict(wall_s, status)
+        out = Path(runs_dir) / f"run_{data['run_id']}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        hist = Path(history)
+        hist.parent.mkdir(parents=True, exist_ok=True)
+        with open(hist, "a", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+        return out
+
+# ----------------- comparação com o histórico -----------------
+def load_history(path: str = HISTORY_PATH) -> list[dict]:
+    p = Path(path)
+    if not p.exists():
+        return []
+    runs = []
+    for line in p.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                pass
+    return runs
+
+def compare(runs: list[dict], window: int = 10, threshold: float = 1.5, min_delta_s: float = 0.5) -> list[dict]:
+    """Compara a última execução com a mediana das `window` anteriores.
+    Regressão: valor > threshold × mediana (e, para tempos, > min_delta_s de diferença)."""
+    if not runs:
+        return []
+    latest, previous = runs[-1], runs[:-1][-window:]
+    rows = []
+    for name, rec in latest.get("steps", {}).items():
+        if rec.get("status") != "ok":
+            rows.append({"step": name, "status": rec.get("status"), "wall_s": rec.get("wall_s"), "flags": []})
+            continue
+        row = {"step": name, "status": "ok", "flags": []}
+        for m in ("wall_s", "cpu_s", "peak_rss_mb", "rss_growth_mb", "rows_out"):
+            hist = [r["steps"][name][m] for r in previous
+                    if r.get("steps", {}).get(name, {}).get("status") == "ok"
+                    and r["steps"][name].get(m) is not None]
+            cur = rec.get(m)
+            med = statistics.median(hist) if hist else None
+            row[m] = cur
+            row[f"{m}_mediana"] = med
+            if cur is None or not med:
+                continue
+            if m in ("wall_s", "cpu_s") and cur - med < min_delta_s:
+                continue
+            if cur > threshold * med:
+                row["flags"].append(f"{m} {cur:g} vs mediana {med:g} (x{cur / med:.1f})")
+        rows.append(row)
+    return sorted(rows, key=lambda r: -(r.get("wall_s") or 0))
+
+def _rss(r: dict) -> str:
+    if r.get("peak_rss_mb") is not None:
+        return f"{r['peak_rss_mb']:7.1f}"
+    if r.get("rss_growth_mb") is not None:
+        return f"+{r['rss_growth_mb']:.1f}".rjust(7)
+    return "-".rjust(7)
+
+def print_report(rows: list[dict], latest: dict) -> int:
+    info(f"Execução {latest.get('run_id')} ({latest.get('mode')}, {latest.get('status')}) — {latest.get('wall_s')}s")
+    # rss: pico da etapa (subprocess) ou quanto ela elevou o pico do processo (+)
+    print(f"{'etapa':<36} {'status':<8} {'parede':>8} {'mediana':>8} {'cpu':>7} {'rss MB':>7} {'linhas':>7}")
+    fmt = lambda v, w, d: f"{v:{w}.{d}f}" if isinstance(v, (int, float)) else "-".rjust(w)
+    regressions = 0
+    for r in rows:
+        print(f"{r['step']:<36} {r['status']:<8} {fmt(r.get('wall_s'), 8, 2)} {fmt(r.get('wall_s_mediana'), 8, 2)}"
+              f" {fmt(r.get('cpu_s'), 7, 2)} {_rss(r)} {fmt(r.get('rows_out'), 7, 0)}")
+        for flag in r["flags"]:
+            warn(f"  regressão em {r['step']}: {flag}")
+            regressions += 1
+    if not regressions:
+        ok("nenhuma regressão em relação à mediana")
+    return regressions
+
+def main_report(args) -> int:
+    runs = load_history(args.history)
+    if not runs:
+        warn(f"histórico vazio: {args.history}")
+        return 0
+    rows = compare(runs, window=args.window, threshold=args.threshold, min_delta_s=args.min_delta)
+    found = print_report(rows, runs[-1])
+    return 1 if (found and args.fail_on_regression) else 0
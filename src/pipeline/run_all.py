@@ -1,95 +1,312 @@
 # src/pipeline/run_all.py
-import sys, pathlib, subprocess
+import os, sys, time, pathlib, argparse, importlib, subprocess, tempfile, traceback, dataclasses
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 from src.common.logging_utils import info, ok, err
-from src.common.config_fdorg import FDORG_COMPETITION, SEASON
+from src.common import raw, http_metrics
+from src.pipeline.partitions import DEFAULT, Partition, parse_partitions, from_env
+from src.pipeline.dag import Step, StepError, build_graph, select, execute, emit, log_summary
+from src.pipeline.manifest import MANIFEST_PATH, Manifest, incremental
+from src.pipeline.report import HISTORY_PATH, RunReport, maxrss_mb, self_peak_rss_mb, payload_rows, main_report
 
 PY = sys.executable
 
-STEPS = [
-    # Ingestão (raw)
-    (PY, "-m", "src.ingest.fetch_teams_fdorg",     "--out", "data/raw/teams_fdorg.json"),
-    (PY, "-m", "src.ingest.fetch_standings_fdorg", "--out", "data/raw/standings_fdorg.json"),
-    (PY, "-m", "src.ingest.fetch_matches_fdorg",   "--out", "data/raw/matches_fdorg.json"),
-    (PY, "-m", "src.ingest.fetch_scorers_fdorg",   "--out", "data/raw/scorers_fdorg.json"),
-
-    # Derivados baseados em TEAMS (clubes, cores, hex, etc.)
-    (PY, "-m", "src.transform.club_info_from_teams_fdorg",
-        "--in", "data/raw/teams_fdorg.json",
-        "--out", "data/curated/info_clube.csv"),
-
-    # Métricas (curated)
-    (PY, "-m", "src.transform.metrics_team_performance_fdorg",
-        "--in", "data/raw/standings_fdorg.json",
-        "--out", "data/curated/desempenho_times.csv"),
-
-    (PY, "-m", "src.transform.metrics_team_form_fdorg",
-        "--in", "data/raw/matches_fdorg.json",
-        "--out", "data/curated/forma_times.csv"),
-
-    (PY, "-m", "src.transform.metrics_goal_trends_fdorg",
-        "--in", "data/raw/matches_fdorg.json",
-        "--out", "data/curated/tendencias_gols_times.csv"),
-
-    (PY, "-m", "src.transform.metrics_comparative_rankings_fdorg",
-        "--in", "data/raw/standings_fdorg.json",
-        "--out", "data/curated/rankings_comparativos.csv"),
-
-    (PY, "-m", "src.transform.metrics_calendar_strength_fdorg",
-        "--matches-in","data/raw/matches_fdorg.json",
-        "--standings-in","data/raw/standings_fdorg.json",
-        "--out","data/curated/forca_calendario_proximos5.csv"),
-
-    (PY, "-m", "src.transform.build_dim_calendario",
-        "--matches-in","data/raw/matches_fdorg.json",
-        "--out","data/curated/dim_calendario.csv"),
-
-    (PY, "-m", "src.transform.metrics_matches_fdorg",
-        "--in", "data/raw/matches_fdorg.json",
-        "--out", "data/curated/matches_metrics.csv"),
-
-    (PY, "-m", "src.transform.metrics_scorers_ranking_fdorg",
-        "--scorers-in","data/raw/scorers_fdorg.json",
-        "--teams-in","data/raw/teams_fdorg.json",
-        "--out","data/curated/artilharia.csv",
-        "--top","50"),
-
-    # Merge com paths explícitos (saída em curated)
-    (PY, "-m", "src.transform.merge_ogol_teams_fdorg",
-    "--fdorg-json", "data/raw/teams_fdorg.json",
-    "--ogol-csv",   "data/scraper/ogol_melhores_2025_full.csv",
-    "--out",        "data/scraper/merged_players_2025.csv"),
-
-    # Scraper ogol (Desempenhos)
-    (PY, "-m", "src.scraper.scraper_ogol",
-        "--url", "https://www.ogol.com.br/edicao/brasileirao-serie-a-2025/194851/melhores-desempenhos",
-        "--out", "data/scraper/ogol_melhores_2025_full.csv"),
-
-    # Scraper UFMG
-    (PY, "-m", "src.scraper.scraper_ufmg", 
-    "--out", "data/curated/prob_ufmg.csv",
-    "--info", "data/curated/info_clube.csv"),
-
-]
-
-def run(cmd):
+RAW_TEAMS     = "data/raw/teams_fdorg.json"
+RAW_STANDINGS = "data/raw/standings_fdorg.json"
+RAW_MATCHES   = "data/raw/matches_fdorg.json"
+RAW_SCORERS   = "data/raw/scorers_fdorg.json"
+OGOL_CSV      = "data/scraper/ogol_melhores_2025_full.csv"
+INFO_CLUBE    = "data/curated/info_clube.csv"
+WAREHOUSE     = "data/warehouse/brasileirao.duckdb"
+OGOL_URL      = "https://www.ogol.com.br/edicao/brasileirao-serie-a-2025/194851/melhores-desempenhos"
+
+def build_steps(part: Partition | None = None, scrapers: bool = True) -> list[Step]:
+    """Etapas de uma partição (competição, temporada). Sem partição: layout
+    plano de sempre (data/raw/*.json, data/curated/*.csv). Os scrapers (ogol,
+    UFMG) só existem para a temporada atual do Brasileirão: `scrapers`."""
+    def path(layer: str, name: str) -> str:
+        return f"{part.dir(layer) if part else 'data/' + layer}/{name}"
+
+    def step(name: str, module: str, **kw) -> Step:
+        return Step(f"{name}@{part.tag}" if part else name, module, **kw)
+
+    raw_teams, raw_standings = path("raw", "teams_fdorg.json"), path("raw", "standings_fdorg.json")
+    raw_matches, raw_scorers = path("raw", "matches_fdorg.json"), path("raw", "scorers_fdorg.json")
+    ogol_csv, info_clube = path("scraper", "ogol_melhores_2025_full.csv"), path("curated", "info_clube.csv")
+    api = {"competition": part.competition, "season": part.season} if part else {}
+
+    # Cada etapa declara o que lê e o que gera; a ordem de execução sai do grafo.
+    steps = [
+        # Ingestão (raw)
+        step("fetch_teams_fdorg", "src.ingest.fetch_teams_fdorg",
+             outputs={"out": raw_teams}, params=dict(api), kind="network"),
+        step("fetch_standings_fdorg", "src.ingest.fetch_standings_fdorg",
+             outputs={"out": raw_standings}, params=dict(api), kind="network"),
+        step("fetch_matches_fdorg", "src.ingest.fetch_matches_fdorg",
+             outputs={"out": raw_matches}, params=dict(api), kind="network"),
+        step("fetch_scorers_fdorg", "src.ingest.fetch_scorers_fdorg",
+             outputs={"out": raw_scorers}, params=dict(api), kind="network"),
+
+        # Derivados baseados em TEAMS (clubes, cores, hex, etc.)
+        step("club_info_from_teams_fdorg", "src.transform.club_info_from_teams_fdorg",
+             inputs={"inp": raw_teams}, outputs={"out": info_clube}, flags={"inp": "--in"}),
+
+        # Métricas (curated)
+        step("metrics_team_performance_fdorg", "src.transform.metrics_team_performance_fdorg",
+             inputs={"inp": raw_standings}, outputs={"out": path("curated", "desempenho_times.csv")},
+             flags={"inp": "--in"}),
+        step("metrics_team_form_fdorg", "src.transform.metrics_team_form_fdorg",
+             inputs={"inp": raw_matches}, outputs={"out": path("curated", "forma_times.csv")},
+             flags={"inp": "--in"}),
+        step("metrics_goal_trends_fdorg", "src.transform.metrics_goal_trends_fdorg",
+             inputs={"inp": raw_matches}, outputs={"out": path("curated", "tendencias_gols_times.csv")},
+             flags={"inp": "--in"}),
+        step("metrics_comparative_rankings_fdorg", "src.transform.metrics_comparative_rankings_fdorg",
+             inputs={"inp": raw_standings}, outputs={"out": path("curated", "rankings_comparativos.csv")},
+             flags={"inp": "--in"}),
+        step("metrics_calendar_strength_fdorg", "src.transform.metrics_calendar_strength_fdorg",
+             inputs={"matches_in": raw_matches, "standings_in": raw_standings},
+             outputs={"out": path("curated", "forca_calendario_proximos5.csv")}),
+        step("build_dim_calendario", "src.transform.build_dim_calendario",
+             inputs={"matches_in": raw_matches}, outputs={"out": path("curated", "dim_calendario.csv")}),
+        step("metrics_matches_fdorg", "src.transform.metrics_matches_fdorg",
+             inputs={"inp": raw_matches}, outputs={"out": path("curated", "matches_metrics.csv")},
+             flags={"inp": "--in"}),
+        step("metrics_scorers_ranking_fdorg", "src.transform.metrics_scorers_ranking_fdorg",
+             inputs={"scorers_in": raw_scorers, "teams_in": raw_teams},
+             outputs={"out": path("curated", "artilharia.csv")},
+             params={"top": 50}),
+
+        # Detalhes por partida (uma chamada por jogo encerrado; incremental): --with
+        step("fetch_match_details_fdorg", "src.ingest.fetch_match_details_fdorg",
+             inputs={"matches_in": raw_matches}, outputs={"out": path("raw", "match_details_fdorg.jsonl")},
+             kind="network", optional=True),
+    ]
+    if scrapers:
+        steps += [
+            # Scraper ogol (Desempenhos)
+            step("scraper_ogol", "src.scraper.scraper_ogol",
+                 outputs={"out": ogol_csv}, params={"url": OGOL_URL}, kind="browser"),
+
+            # Merge com paths explícitos (saída em scraper), depende do CSV do ogol
+            step("merge_ogol_teams_fdorg", "src.transform.merge_ogol_teams_fdorg",
+                 inputs={"fdorg_json": raw_teams, "ogol_csv": ogol_csv},
+                 outputs={"out": path("scraper", "merged_players_2025.csv")}),
+
+            # Scraper UFMG (precisa do info_clube para casar id_time)
+            step("scraper_ufmg", "src.scraper.scraper_ufmg",
+                 inputs={"info": info_clube}, outputs={"out": path("prob", "prob_ufmg.csv")},
+                 kind="network"),
+        ]
+    return steps
+
+def warehouse_step(steps: list[Step], optional: bool = True) -> Step:
+    """Warehouse DuckDB com todas as tabelas curadas; com várias partições, cada
+    tabela une as partições (colunas competition/season)."""
+    curated = [p for s in steps for p in s.output_files() if p.startswith("data/curated/")]
+    return Step("build_warehouse", "src.transform.build_warehouse",
+                inputs={"tables": curated}, outputs={"out": WAREHOUSE}, optional=optional)
+
+def plan(partitions: list[Partition] | None = None) -> list[Step]:
+    """Sem partições: o plano de sempre. Com partições: as etapas de cada uma
+    (scrapers só na temporada atual) mais o warehouse consolidado."""
+    if not partitions:
+        steps = build_steps()
+        return steps + [warehouse_step(steps)]
+    steps = [st for p in partitions for st in build_steps(p, scrapers=(p == DEFAULT))]
+    return steps + [warehouse_step(steps, optional=False)]
+
+STEPS = plan()
+
+# Métricas com implementação alternativa em SQL (DuckDB): --engine sql
+ENGINE_STEPS = {"metrics_team_performance_fdorg", "metrics_goal_trends_fdorg",
+                "metrics_comparative_rankings_fdorg", "metrics_calendar_strength_fdorg"}
+
+def with_engine(steps: list[Step], engine: str) -> list[Step]:
+    if engine == "pandas":
+        return steps  # padrão dos módulos; não entra nos parâmetros (nem no manifesto)
+    return [dataclasses.replace(s, params={**s.params, "engine": engine}) if s.base in ENGINE_STEPS else s
+            for s in steps]
+
+def with_matches_mode(steps: list[Step], mode: str) -> list[Step]:
+    """--matches delta: fetch_matches_fdorg só pede a janela em volta de hoje
+    e remonta o JSON completo do armazém local de partidas."""
+    if mode == "full":
+        return steps
+    return [dataclasses.replace(s, params={**s.params, "mode": mode}) if s.base == "fetch_matches_fdorg" else s
+            for s in steps]
+
+def run_subprocess(step: Step) -> dict:
+    # isolamento total: um interpretador por etapa
+    cmd = step.argv(PY)
     info(" ".join(map(str, cmd)))
-    res = subprocess.run(cmd, capture_output=True, text=True)
-    if res.returncode != 0:
-        if res.stdout.strip(): print(res.stdout.strip())
-        if res.stderr.strip(): err(res.stderr.strip())
-        raise SystemExit(res.returncode)
-    out = (res.stdout or "").strip()
-    if out: print(out)
-
-def main():
-    info(f"Pipeline Brasileirão — competição={FDORG_COMPETITION}, temporada={SEASON}")
+    usage = {}
+    with tempfile.TemporaryFile("w+") as out, tempfile.TemporaryFile("w+") as errf:
+        proc = subprocess.Popen(cmd, stdout=out, stderr=errf, text=True)
+        if hasattr(os, "wait4"):
+            # wait4 devolve o rusage do próprio filho (CPU e pico de RSS)
+            _, status, ru = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            usage = {"cpu_s": ru.ru_utime + ru.ru_stime, "peak_rss_mb": maxrss_mb(ru)}
+        else:
+            proc.wait()
+        out.seek(0); errf.seek(0)
+        emit(step.name, out.read(), errf.read() if proc.returncode != 0 else "")
+    if proc.returncode != 0:
+        raise StepError(step.name, proc.returncode)
+    return usage
+
+def run_inprocess(step: Step):
+    # mesmo interpretador: chama <módulo>.run(...); os JSON baixados entram no
+    # cache de src.common.raw e as transformações seguintes não relêem o disco
+    mod = importlib.import_module(step.module)
+    kwargs = {**step.inputs, **step.outputs, **step.params}
+    info(f"{step.module}.run({', '.join(f'{k}={v}' for k, v in kwargs.items())})")
+    try:
+        result = mod.run(**kwargs)
+    except SystemExit as e:
+        raise StepError(step.name, e.code if isinstance(e.code, int) else 1)
+    except Exception:
+        emit(step.name, stderr=traceback.format_exc())
+        raise StepError(step.name, 1)
+    if isinstance(result, dict):
+        for p in step.outputs.values():
+            if p.endswith(".json"):
+                raw.prime(p, result)
+        return {"rows_out": payload_rows(result)}
+    if hasattr(result, "columns"):  # DataFrame (sem importar pandas aqui)
+        return {"rows_out": len(result)}
+
+def _pool_call(module: str, kwargs: dict) -> tuple:
+    # executado num processo do pool (interpretador já aquecido)
+    c0, rss0 = time.process_time(), self_peak_rss_mb()
+    code, tb = 0, ""
+    try:
+        importlib.import_module(module).run(**kwargs)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception:
+        code, tb = 1, traceback.format_exc()
+    # o processo do pool roda várias etapas: o pico dele não é desta etapa, só o quanto ela o elevou
+    growth = round(max(0.0, self_peak_rss_mb() - rss0), 1) if rss0 is not None else None
+    return code, tb, time.process_time() - c0, growth
+
+def pool_runner(procs: int):
+    """Transformações num pool de processos (usa todos os núcleos, útil com
+    várias partições); rede e navegador continuam em threads, in-process."""
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+    pool = ProcessPoolExecutor(max_workers=max(1, procs), mp_context=ctx)
+
+    def _run(step: Step):
+        if step.kind != "local":
+            return run_inprocess(step)
+        kwargs = {**step.inputs, **step.outputs, **step.params}
+        info(f"[pool] {step.module}.run({', '.join(f'{k}={v}' for k, v in kwargs.items())})")
+        code, tb, cpu, rss = pool.submit(_pool_call, step.module, kwargs).result()
+        if code:
+            emit(step.name, stderr=tb)
+            raise StepError(step.name, code)
+        return {"cpu_s": cpu, "rss_growth_mb": rss}
+    return _run, pool
+
+RUNNERS = {"inprocess": run_inprocess, "subprocess": run_subprocess, "pool": None}
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="run_all", description="Pipeline Brasileirão (grafo de etapas)")
+    ap.add_argument("--mode", choices=sorted(RUNNERS),
+                    help="inprocess: um interpretador só; subprocess: um processo por etapa; "
+                         "pool: transformações num pool de processos (padrão com várias partições)")
+    ap.add_argument("--partitions", help="pares competição:temporada, ex.: BSA:2015-2025,PL:2024 "
+                                         "(padrão: FDORG_PARTITIONS; vazio = layout plano de sempre)")
+    ap.add_argument("--procs", type=int, default=os.cpu_count() or 1, help="processos do modo pool")
+    ap.add_argument("--engine", choices=["pandas", "sql"], default="pandas",
+                    help="implementação das métricas de times (saídas idênticas)")
+    ap.add_argument("--matches", choices=["full", "delta"], default="full",
+                    help="delta: partidas só da janela em volta de hoje, mescladas no armazém local")
+    ap.add_argument("--workers", type=int, default=min(8, (os.cpu_count() or 1) + 4),
+                    help="etapas simultâneas no total")
+    ap.add_argument("--max-network", type=int, default=4, help="etapas de rede simultâneas")
+    ap.add_argument("--max-browser", type=int, default=1, help="etapas com navegador simultâneas")
+    ap.add_argument("--only", help="roda só estas etapas (separadas por vírgula)")
+    ap.add_argument("--from", dest="from_", help="roda estas etapas e tudo que depende delas")
+    ap.add_argument("--until", help="roda estas etapas e tudo de que elas dependem")
+    ap.add_argument("--with", dest="with_", help="inclui etapas opcionais (ex.: build_warehouse)")
+    ap.add_argument("--skip", help="retira estas etapas da seleção")
+    ap.add_argument("--force", action="store_true", help="ignora o manifesto e refaz todas as etapas")
+    ap.add_argument("--manifest", default=MANIFEST_PATH, help="arquivo de manifesto (hashes por etapa)")
+    ap.add_argument("--no-report", action="store_true", help="não grava o relatório de desempenho")
+    ap.add_argument("--list", action="store_true", help="mostra o plano e sai")
+
+    sub = ap.add_subparsers(dest="cmd")
+    rp = sub.add_parser("report", help="compara a última execução com a mediana do histórico")
+    rp.add_argument("--history", default=HISTORY_PATH)
+    rp.add_argument("--window", type=int, default=10, help="execuções anteriores usadas na mediana")
+    rp.add_argument("--threshold", type=float, default=1.5, help="fator acima da mediana que conta como regressão")
+    rp.add_argument("--min-delta", type=float, default=0.5, help="diferença mínima em segundos para tempos")
+    rp.add_argument("--fail-on-regression", action="store_true", help="sai com código 1 se houver regressão")
+    return ap.parse_args(argv)
+
+def http_summary(path: Path) -> None:
+    """Percentis por endpoint das chamadas HTTP da execução + metrics.prom."""
+    if not path.exists():
+        return
+    http_metrics.log_summary(http_metrics.write_summary(path))
+    info(f"métricas HTTP: {path} ({http_metrics.PROM_PATH})")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.cmd == "report":
+        raise SystemExit(main_report(args))
+
+    partitions = parse_partitions(args.partitions) if args.partitions else from_env()
+    all_steps = plan(partitions)
+    deps = build_graph(all_steps)
+    steps = select(all_steps, deps, only=args.only, from_=args.from_, until=args.until, include=args.with_,
+                   exclude=args.skip)
+    steps = with_matches_mode(with_engine(steps, args.engine), args.matches)
+
+    if args.list:
+        for s in steps:
+            after = ", ".join(sorted(deps[s.name])) or "-"
+            print(f"{s.name:<48} [{s.kind}{', opcional' if s.optional else ''}] depois de: {after}")
+        return
+
+    mode = args.mode or ("pool" if len(partitions) > 1 else "inprocess")
+    where = ", ".join(p.tag for p in partitions) if partitions else f"competição={DEFAULT.competition}, temporada={DEFAULT.season}"
+    info(f"Pipeline Brasileirão — {where}, modo={mode}, engine={args.engine}")
     Path("data/curated").mkdir(parents=True, exist_ok=True)
-    for step in STEPS:
-        run(step)
+    limits = {"local": args.workers, "network": args.max_network, "browser": args.max_browser}
+    skipped = set()
+    report = RunReport(mode)
+    # herdado pelos subprocessos e pelo pool: todas as etapas gravam no mesmo arquivo
+    http_file = Path(http_metrics.METRICS_DIR) / f"{report.started_at:%Y%m%dT%H%M%SZ}.jsonl"
+    os.environ["HTTP_METRICS_FILE"] = str(http_file)
+    base, pool = pool_runner(args.procs) if mode == "pool" else (RUNNERS[mode], None)
+    runner = incremental(base, Manifest(args.manifest), force=args.force, skipped=skipped)
+    runner = report.measure(runner, skipped)
+    t0 = time.perf_counter()
+    try:
+        durations = execute(steps, deps, runner, workers=args.workers, limits=limits)
+    except StepError as e:
+        err(str(e))
+        if not args.no_report:
+            report.save(time.perf_counter() - t0, status="failed")
+        raise SystemExit(e.returncode)
+    finally:
+        if pool:
+            pool.shutdown()
+        http_summary(http_file)
+    if skipped:
+        info(f"{len(skipped)} etapa(s) sem mudanças desde a última execução: {', '.join(sorted(skipped))}")
+    ran = {n: d for n, d in durations.items() if n not in skipped}
+    wall = time.perf_counter() - t0
+    log_summary(steps, deps, ran, wall)
+    if not args.no_report:
+        info(f"relatório de desempenho: {report.save(wall)}")
     ok("Pipeline concluído com sucesso.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
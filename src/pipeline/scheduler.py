@@ -0,0 +1,214 @@
+# src/pipeline/scheduler.py
+# Modo daemon: decide quando e o que atualizar a partir de utcDate/status das
+# partidas já baixadas, em vez de um cron de intervalo fixo.
+#   - jogo em andamento ou começando: atualização rápida (partidas/classificação/artilharia)
+#   - rodada perto (< near-hours): de hora em hora; longe: uma vez por dia, com times
+#   - scrapers (ogol, UFMG) só quando uma rodada termina
+#   - atualizações ao vivo/horárias pedem só a janela de partidas (--matches delta);
+#     a diária e a de fim de rodada trazem a temporada inteira
+from __future__ import annotations
+
+import sys, json, time, pathlib, argparse
+from pathlib import Path
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+from src.common.logging_utils import info, ok, warn, err
+from src.common import raw_tables
+from src.pipeline import run_all
+from src.pipeline.partitions import DEFAULT, Partition, parse_partitions, from_env
+
+STATE_PATH = "data/_pipeline/scheduler.json"
+BROWSER_KEEP_S = 15 * 60  # pausa maior que isto: o Chrome dos scrapers é fechado até o próximo ciclo
+
+LIVE = {"IN_PLAY", "PAUSED"}
+UPCOMING = {"SCHEDULED", "TIMED"}
+CLOSED = {"FINISHED", "AWARDED", "CANCELLED", "POSTPONED"}
+
+# subconjuntos do grafo (nomes sem partição valem para todas)
+FAST_FETCH = ["fetch_matches_fdorg", "fetch_standings_fdorg", "fetch_scorers_fdorg"]
+ALL_FETCH = ["fetch_teams_fdorg", *FAST_FETCH]
+SCRAPERS = ["scraper_ogol", "merge_ogol_teams_fdorg", "scraper_ufmg"]
+
+@dataclass
+class Decision:
+    kind: str                   # full | rounds | live | daily | hourly | idle
+    reason: str
+    argv: list[str] | None      # None: nada a rodar agora
+    sleep_s: float
+    closed_rounds: list = field(default_factory=list)
+
+def _subset(from_: list[str], skip: list[str] | None = None, delta: bool = False) -> list[str]:
+    argv = ["--from", ",".join(from_)]
+    argv += ["--skip", ",".join(skip)] if skip else []
+    return argv + (["--matches", "delta"] if delta else [])
+
+def decide(matches, now: datetime, state: dict, live_s=120, near_s=3600, far_s=86400,
+           near_hours=24, kickoff_lead_min=10, match_hours=2.5) -> Decision:
+    """Pura: a partir das partidas (colunas utc_date, status, matchday) e do estado
+    anterior, diz o que rodar e quanto dormir até a próxima checagem."""
+    if matches is None or matches.empty:
+        return Decision("full", "sem partidas locais: atualização completa", [], far_s)
+
+    utc, status = matches["utc_date"], matches["status"].astype(str)
+    lead, span = timedelta(minutes=kickoff_lead_min), timedelta(hours=match_hours)
+    live = status.isin(LIVE) | (status.isin(UPCOMING) & (utc <= now + lead) & (utc >= now - span))
+
+    closed = closed_rounds(matches)
+    new_closed = [md for md in closed if md not in set(state.get("closed_rounds", []))]
+
+    upcoming = utc[status.isin(UPCOMING) & (utc > now)]
+    next_kickoff = upcoming.min() if not upcoming.empty else None
+    until_kickoff = (next_kickoff - lead - now).total_seconds() if next_kickoff is not None else None
+
+    def _sleep(interval):
+        # acorda a tempo do próximo pontapé inicial
+        return max(30.0, min(interval, until_kickoff)) if until_kickoff and until_kickoff > 0 else float(interval)
+
+    last = state.get("last_run", {})
+    def _due(kind, interval):
+        t = last.get(kind)
+        return t is None or (now - datetime.fromisoformat(t)).total_seconds() >= interval - 1
+
+    if "closed_rounds" not in state:
+        return Decision("full", "primeira execução: atualização completa", [], _sleep(far_s), closed)
+    if new_closed and not live.any():
+        return Decision("rounds", f"rodada(s) {', '.join(map(str, new_closed))} encerrada(s): scrapers e métricas",
+                        _subset(FAST_FETCH + SCRAPERS), _sleep(near_s), closed)
+    if live.any():
+        n = int(live.sum())
+        return Decision("live", f"{n} jogo(s) em andamento/começando", _subset(FAST_FETCH, SCRAPERS, delta=True), live_s, closed)
+    if _due("daily", far_s):
+        return Decision("daily", "atualização diária", _subset(ALL_FETCH, SCRAPERS), _sleep(far_s), closed)
+    near = until_kickoff is not None and until_kickoff <= near_hours * 3600
+    if near and _due("hourly", near_s):
+        return Decision("hourly", "rodada próxima: atualização horária", _subset(FAST_FETCH, SCRAPERS, delta=True),
+                        _sleep(near_s), closed)
+    return Decision("idle", "sem mudanças esperadas", None, _sleep(near_s if near else far_s), closed)
+
+def retry_sleep(failures: int, live_s: float, sleep_s: float) -> float:
+    """Espera depois de `failures` execuções falhas seguidas: começa no intervalo
+    ao vivo e dobra a cada falha, sem passar da espera normal da decisão."""
+    return min(sleep_s, live_s * 2 ** max(0, failures - 1))
+
+def closed_rounds(matches) -> list[int]:
+    """Rodadas com todos os jogos encerrados (e ao menos um FINISHED)."""
+    status = matches["status"].astype(str)
+    rounds = matches.assign(closed=status.isin(CLOSED), done=status.eq("FINISHED")).groupby("matchday")
+    return sorted(int(md) for md, g in rounds if g["closed"].all() and g["done"].any())
+
+def record_run(state: dict, d: Decision, now: datetime, matches) -> dict:
+    """Atualiza o estado depois de uma execução bem-sucedida. Rodadas só contam
+    como tratadas quando os scrapers rodaram junto (full/rounds)."""
+    last = state.setdefault("last_run", {})
+    last[d.kind] = now.isoformat()
+    if d.kind in ("full", "daily"):
+        last["daily"] = last["hourly"] = now.isoformat()
+    if d.kind == "full":
+        state["closed_rounds"] = closed_rounds(matches) if matches is not None and not matches.empty else []
+    elif d.kind == "rounds":
+        state["closed_rounds"] = d.closed_rounds
+    return state
+
+def load_state(path=STATE_PATH) -> dict:
+    p = Path(path)
+    if p.exists():
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except ValueError:
+            warn(f"estado do agendador ilegível: {p}; recomeçando")
+    return {}
+
+def save_state(state: dict, path=STATE_PATH) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(p)
+
+def current_partition(extra: list[str]) -> Partition | None:
+    """Partição acompanhada: a temporada atual (ou a mais recente da lista);
+    None no layout plano. As temporadas passadas não mudam e não são atualizadas."""
+    spec = None
+    if "--partitions" in extra and extra.index("--partitions") + 1 < len(extra):
+        spec = extra[extra.index("--partitions") + 1]
+    partitions = parse_partitions(spec) if spec else from_env()
+    if not partitions:
+        return None
+    return DEFAULT if DEFAULT in partitions else partitions[-1]
+
+def scoped(argv: list[str], part: Partition | None) -> list[str]:
+    """--from/--skip só com as etapas da partição acompanhada."""
+    if not part:
+        return argv
+    out = list(argv)
+    for i, a in enumerate(out[:-1]):
+        if a in ("--from", "--skip"):
+            out[i + 1] = ",".join(f"{n}@{part.tag}" for n in out[i + 1].split(","))
+    return out
+
+def load_matches(path):
+    if not Path(path).exists():
+        return None
+    df = raw_tables.load_table("matches", path, columns=["utc_date", "status", "matchday"])
+    return df.dropna(subset=["utc_date"])
+
+def run_pipeline(argv: list[str]) -> bool:
+    try:
+        run_all.main(argv)
+        return True
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            err(f"pipeline falhou (código {e.code})")
+            return False
+        return True
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="scheduler", description="Atualização contínua guiada pelo calendário de jogos",
+                                 epilog="Argumentos desconhecidos são repassados ao run_all (ex.: --partitions, --engine).")
+    ap.add_argument("--live-interval", type=float, default=120, help="segundos entre atualizações com jogo em andamento")
+    ap.add_argument("--near-interval", type=float, default=3600, help="segundos entre atualizações com rodada próxima")
+    ap.add_argument("--far-interval", type=float, default=86400, help="segundos entre atualizações longe de rodada")
+    ap.add_argument("--near-hours", type=float, default=24, help="horas antes do próximo jogo que contam como rodada próxima")
+    ap.add_argument("--state", default=STATE_PATH)
+    ap.add_argument("--once", action="store_true", help="decide, roda (se for o caso) e sai")
+    ap.add_argument("--dry-run", action="store_true", help="só mostra a decisão")
+    args, extra = ap.parse_known_args(argv)
+
+    part = current_partition(extra)
+    path = f"{part.dir('raw')}/matches_fdorg.json" if part else run_all.RAW_MATCHES
+    info(f"Agendador iniciado — partidas em {path}")
+    failures = 0
+    while True:
+        state = load_state(args.state)
+        now = datetime.now(timezone.utc)
+        d = decide(load_matches(path), now, state, live_s=args.live_interval, near_s=args.near_interval,
+                   far_s=args.far_interval, near_hours=args.near_hours)
+        argv = scoped(d.argv, part) + extra if d.argv is not None else None
+        info(f"{now:%Y-%m-%d %H:%M:%S}Z {d.reason}" + (f" → run_all {' '.join(argv)}" if argv is not None else ""))
+        sleep_s = d.sleep_s
+        if argv is not None and not args.dry_run:
+            if run_pipeline(argv):
+                save_state(record_run(state, d, now, load_matches(path)), args.state)
+                failures = 0
+            else:
+                # o estado não avançou: tenta de novo logo, não só depois da espera da decisão
+                failures += 1
+                sleep_s = retry_sleep(failures, args.live_interval, d.sleep_s)
+                warn(f"execução falhou ({failures}x seguida(s)); nova tentativa em {sleep_s / 60:.1f} min")
+        if args.once or args.dry_run:
+            return
+        # só fecha o Chrome se algum scraper o carregou (sem importar selenium à toa)
+        browser = sys.modules.get("src.scraper.browser")
+        if browser and sleep_s > BROWSER_KEEP_S:
+            browser.close()
+        info(f"próxima checagem em {sleep_s / 60:.1f} min")
+        try:
+            time.sleep(sleep_s)
+        except KeyboardInterrupt:
+            ok("Agendador encerrado.")
+            return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# src/scraper/browser.py
+# Navegador compartilhado pelos scrapers: um Chrome headless aquecido por
+# processo, reaproveitado entre os scrapes de uma execução do run_all e entre
+# os ciclos do agendador. O perfil é persistente (cache HTTP e cookies de
+# consentimento sobrevivem entre execuções). Imagens, mídia, fontes e domínios
+# de anúncio/consentimento são bloqueados na camada de rede: nem são baixados,
+# e os overlays de anúncio não chegam a existir.
+import os, time, atexit, tempfile, threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+
+from src.common.logging_utils import info, warn
+
+ROOT = Path(__file__).resolve().parents[2]
+PROFILE_DIR = os.getenv("BROWSER_PROFILE_DIR", str(ROOT / "data/_cache/chrome-profile"))
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+
+BLOCKED_TYPES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg",
+]
+BLOCKED_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "adservice.google.",
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com", "fundingchoicesmessages.google.com",
+    "amazon-adsystem.com", "adnxs.com", "criteo.", "pubmatic.com", "rubiconproject.com", "casalemedia.com",
+    "taboola.com", "outbrain.com", "teads.tv", "smartadserver.com", "facebook.net", "connect.facebook.",
+    "hotjar.com", "scorecardresearch.com", "quantserve.com", "quantcast.", "cookielaw.org", "onetrust.com",
+    "consensu.org", "didomi.io", "privacy-center.org",
+]
+BLOCKED_URLS = BLOCKED_TYPES + [f"*{d}*" for d in BLOCKED_DOMAINS]
+
+# carga da página e do que ela baixou (só o que passou pelo bloqueio)
+JS_STATS = """
+var nav = performance.getEntriesByType('navigation')[0] || {}, res = performance.getEntriesByType('resource');
+var bytes = (nav.transferSize || 0) + res.reduce(function(s, r) { return s + (r.transferSize || 0); }, 0);
+return {load_ms: Math.round(nav.domContentLoadedEventEnd || 0), bytes: bytes, resources: res.length,
+        heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null};
+"""
+
+def build_driver(headless: bool = True, profile: str | None = PROFILE_DIR) -> webdriver.Chrome:
+    opts = Options()
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--window-size=1280,900")
+    opts.add_argument("--ignore-certificate-errors")
+    opts.add_argument(f"user-agent={USER_AGENT}")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_argument("--mute-audio")
+    opts.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    if profile:
+        Path(profile).mkdir(parents=True, exist_ok=True)
+        opts.add_argument(f"--user-data-dir={profile}")
+    opts.page_load_strategy = "eager"  # DOM pronto basta; não espera anúncios e afins
+    driver = webdriver.Chrome(options=opts)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    return driver
+
+class BrowserSession:
+    """Um Chrome reaproveitado; `lease()` empresta o driver a um scrape por vez
+    e o recria se ele tiver morrido."""
+
+    def __init__(self, headless: bool = True, profile: str | None = PROFILE_DIR):
+        self.headless, self.profile = headless, profile
+        self.driver: webdriver.Chrome | None = None
+        self.scrapes = 0
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.driver = build_driver(self.headless, self.profile)
+        except SessionNotCreatedException as e:
+            # perfil em uso por outro Chrome (outro processo): segue com um temporário
+            warn(f"perfil {self.profile} indisponível ({e.msg}); usando um perfil temporário")
+            self.driver = build_driver(self.headless, tempfile.mkdtemp(prefix="chrome-profile-"))
+        info(f"navegador iniciado em {time.perf_counter() - t0:.1f}s")
+
+    def _alive(self) -> bool:
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    @contextmanager
+    def lease(self):
+        with self._lock:
+            if self.driver is None or not self._alive():
+                self.close_driver()
+                self._start()
+            t0 = time.perf_counter()
+            try:
+                yield self.driver
+            finally:
+                self.scrapes += 1
+                self._report(time.perf_counter() - t0)
+                try:
+                    self.driver.get("about:blank")  # solta a memória da página entre scrapes
+                except WebDriverException:
+                    self.close_driver()
+
+    def _report(self, seconds: float) -> None:
+        try:
+            st = self.driver.execute_script(JS_STATS) or {}
+        except WebDriverException:
+            return
+        heap = f", heap JS {st['heap_mb']:.0f} MB" if st.get("heap_mb") is not None else ""
+        info(f"navegador: scrape {self.scrapes} em {seconds:.1f}s, DOM pronto em {st.get('load_ms', 0)} ms, "
+             f"{st.get('bytes', 0) / 1024:.0f} KB em {st.get('resources', 0)} recursos{heap}")
+
+    def close_driver(self) -> None:
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+_session: BrowserSession | None = None
+_guard = threading.Lock()
+
+def session() -> BrowserSession:
+    """Sessão do processo (o Chrome sobe no primeiro scrape e fecha na saída)."""
+    global _session
+    with _guard:
+        if _session is None:
+            _session = BrowserSession()
+            atexit.register(close)
+        return _session
+
+def close() -> None:
+    """Fecha o Chrome (o próximo scrape abre outro)."""
+    with _guard:
+        if _session is not None:
+            with _session._lock:
+                _session.close_driver()
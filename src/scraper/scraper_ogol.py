@@ -1,11 +1,9 @@
 # src/scraper/scraper_ogol.py
-import time
-import hashlib
 import argparse
+from urllib.parse import urljoin, urlsplit
 import pandas as pd
+import lxml.html
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -16,10 +14,72 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "..", "common"))
 
 
 from common.logging_utils import info, ok, warn, err
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.common import http_metrics
+from src.scraper import browser
 
 URL_DEFAULT = "https://www.ogol.com.br/edicao/brasileirao-serie-a-2025/194851/melhores-desempenhos"
 OUT_DEFAULT = "data/scraper/ogol_melhores_2025_full.csv"
 
+TABLE_SEL = "#DataTables_Table_0"
+USER_AGENT = browser.USER_AGENT
+MODES = ("auto", "http", "browser")
+MAX_PAGES = 50
+NUMERIC_COLS = ["P","N","M","J","MJ","MOM","G","GC","ASS","A","V","PEN","PD","PP"]
+
+# Texto de um nó como o get_text(strip=True) do BeautifulSoup: cada trecho de
+# texto sem espaços nas pontas, tudo junto.
+_JS_TEXT = """
+function txt(n) {
+  var w = document.createTreeWalker(n, NodeFilter.SHOW_TEXT), out = [], x;
+  while ((x = w.nextNode())) { var v = x.nodeValue.trim(); if (v) out.push(v); }
+  return out.join('');
+}
+function cell(td, i) {
+  if (i === 1) { var a = td.querySelector('.micrologo_and_text .text a'); if (a) return txt(a); }
+  return txt(td);
+}
+"""
+
+# Dados da tabela direto da API do DataTables, numa chamada: cabeçalhos e todas
+# as linhas (page='all') ou só as da página exibida (page='current', usado com
+# processamento no servidor, em que o navegador só tem a página atual).
+JS_READ = _JS_TEXT + """
+var sel = arguments[0], page = arguments[1], $ = window.jQuery || window.$;
+if (!$ || !$.fn.dataTable || !$.fn.dataTable.isDataTable(sel)) return null;
+var t = $(sel).DataTable();
+if (page === 'all' && t.page.info().serverSide) return null;
+var headers = t.columns().header().toArray().map(function(th) { return txt(th); });
+var src = t.columns().dataSrc().toArray();
+var rows = t.rows({order: 'current', search: 'applied', page: page}).indexes().toArray().map(function(i) {
+  var tr = t.row(i).node();
+  if (tr) return Array.prototype.map.call(tr.querySelectorAll('td'), cell);
+  // linha ainda não desenhada (deferRender): monta as células a partir dos dados
+  var d = t.row(i).data(), vals = Array.isArray(d) ? d : src.map(function(k) { return d[k]; });
+  return vals.map(function(v, j) {
+    var td = document.createElement('td'); td.innerHTML = v == null ? '' : String(v); return cell(td, j);
+  });
+});
+return {headers: headers, rows: rows};
+"""
+
+# DataTables inicializada na página?
+JS_READY = """
+var $ = window.jQuery || window.$;
+return !!($ && $.fn.dataTable && $.fn.dataTable.isDataTable(arguments[0]));
+"""
+
+# Próxima página, respondendo só depois do evento 'draw' (false na última).
+JS_NEXT_PAGE = """
+var sel = arguments[0], done = arguments[arguments.length - 1], $ = window.jQuery || window.$;
+try {
+  var t = $(sel).DataTable(), info = t.page.info();
+  if (info.page >= info.pages - 1) { done(false); return; }
+  t.one('draw', function() { done(true); });
+  t.page('next').draw('page');
+} catch (e) { done(false); }
+"""
+
 def normalize_decimal(s):
     if not isinstance(s, str):
         return s
@@ -29,6 +89,27 @@ def normalize_decimal(s):
     except ValueError:
         return s.strip()
 
+def normalize_decimal_col(s: pd.Series) -> pd.Series:
+    """normalize_decimal na coluna inteira de uma vez: "1.234,5" -> 1234.5; o
+    que não é número fica como texto (sem espaços nas pontas)."""
+    txt = s.astype(str).str.strip()
+    num = pd.to_numeric(txt.str.replace(".", "", regex=False).str.replace(",", ".", regex=False), errors="coerce")
+    if num.notna().all():
+        return num.astype(float)
+    return num.astype(object).where(num.notna(), txt)
+
+def frame(headers: list[str], rows: list[list[str]]) -> pd.DataFrame:
+    """Linhas de texto -> DataFrame tipado (mesmo esquema do CSV de sempre)."""
+    headers = ["Jogador" if h == "" else h for h in headers]
+    n = len(headers)
+    df = pd.DataFrame([(r + [""] * (n - len(r)))[:n] for r in rows], columns=headers)
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = normalize_decimal_col(df[col])
+    if "Equipe" in df.columns:
+        df["Equipe"] = df["Equipe"].astype(str).str.strip()
+    return df
+
 def parse_table(html) -> pd.DataFrame:
     soup = BeautifulSoup(html, "html.parser")
     table = soup.find("table", {"id": "DataTables_Table_0"}) \
@@ -37,159 +118,174 @@ def parse_table(html) -> pd.DataFrame:
     if table is None:
         raise RuntimeError("tabela não encontrada")
 
-    headers = []
-    for th in table.select("thead th"):
-        txt = (th.get_text(strip=True) or "")
-        headers.append("Jogador" if txt == "" else txt)
-
+    headers = [th.get_text(strip=True) for th in table.select("thead th")]
     rows = []
     for tr in table.select("tbody tr"):
-        tds = tr.find_all("td")
         cells = []
-        for i, td in enumerate(tds):
+        for i, td in enumerate(tr.find_all("td")):
             if i == 1:
                 a = td.select_one(".micrologo_and_text .text a")
                 cells.append(a.get_text(strip=True) if a else td.get_text(strip=True))
             else:
                 cells.append(td.get_text(strip=True))
-        if len(cells) < len(headers):
-            cells += [""] * (len(headers) - len(cells))
-        rows.append(cells[:len(headers)])
+        rows.append(cells)
+    return frame(headers, rows)
 
-    df = pd.DataFrame(rows, columns=headers)
-    for col in ["P","N","M","J","MJ","MOM","G","GC","ASS","A","V","PEN","PD","PP"]:
-        if col in df.columns:
-            df[col] = df[col].apply(normalize_decimal)
-    if "Equipe" in df.columns:
-        df["Equipe"] = df["Equipe"].astype(str).str.strip()
-    return df
+# ----------------- caminho HTTP (sem navegador) -----------------
+def _cls(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
 
-def dismiss_overlays(driver):
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-    time.sleep(0.3)
-    js_remove = """
-    (function(){
-      var nodes = Array.prototype.slice.call(document.querySelectorAll('div,section'));
-      nodes.forEach(function(n){
-        var cs = window.getComputedStyle(n);
-        var zi = parseInt(cs.zIndex) || 0;
-        if ((cs.position === 'fixed' || cs.position === 'sticky') && zi >= 9999) {
-          n.remove();
-        }
-      });
-      var backs = document.querySelectorAll('.modal-backdrop, .fc-ab-root, .fc-dialog-overlay');
-      backs.forEach(n => n.remove());
-    })();
-    """
-    try:
-        driver.execute_script(js_remove)
-    except Exception:
-        pass
+XP_TABLES = [f"//table[@id='DataTables_Table_0']", f"//table[{_cls('zztable')} and {_cls('stats')}]", f"//table[{_cls('zztable')}]"]
+XP_PLAYER = f".//*[{_cls('micrologo_and_text')}]//*[{_cls('text')}]//a"
+XP_PAGES = f"//a[@rel='next']/@href | //*[{_cls('pagination')} or {_cls('paginate')} or {_cls('dataTables_paginate')}]//a/@href"
 
-def get_active_page_num(driver) -> str:
-    try:
-        el = driver.find_element(By.CSS_SELECTOR, ".dataTables_paginate .paginate_button.current")
-        return el.text.strip()
-    except Exception:
-        return ""
+def _text(el) -> str:
+    """Como get_text(strip=True): trechos de texto sem espaços nas pontas, juntos."""
+    return "".join(t.strip() for t in el.xpath(".//text()[not(ancestor::script) and not(ancestor::style)]"))
+
+def parse_table_lxml(doc) -> pd.DataFrame | None:
+    """parse_table com lxml (C) sobre um documento já parseado; None sem tabela."""
+    table = next((t[0] for t in (doc.xpath(xp) for xp in XP_TABLES) if t), None)
+    if table is None:
+        return None
+    headers = [_text(th) for th in table.xpath(".//thead//th")]
+    rows = []
+    for tr in table.xpath(".//tbody//tr"):
+        cells = []
+        for i, td in enumerate(tr.xpath(".//td")):
+            a = td.xpath(XP_PLAYER) if i == 1 else None
+            cells.append(_text(a[0] if a else td))
+        rows.append(cells)
+    return frame(headers, rows)
+
+def _get_doc(sess, url: str):
+    r = http_metrics.get(sess, url, f"ogol{urlsplit(url).path}", headers={"User-Agent": USER_AGENT}, timeout=20)
+    r.raise_for_status()
+    # sem charset no cabeçalho, o lxml usa o <meta charset> da página
+    enc = r.encoding if "charset" in r.headers.get("Content-Type", "").lower() else None
+    return lxml.html.document_fromstring(r.content, parser=lxml.html.HTMLParser(encoding=enc))
 
-def table_signature(driver) -> str:
+def _page_links(doc, url: str) -> list[str]:
+    """Links de paginação da mesma página (mesmo caminho, outra query)."""
+    base = urlsplit(url)
+    out = []
+    for href in doc.xpath(XP_PAGES):
+        u = urljoin(url, href.strip())
+        parts = urlsplit(u)
+        if parts.netloc == base.netloc and parts.path == base.path and parts.query and u != url and u not in out:
+            out.append(u)
+    return out
+
+def scrape_http(url: str) -> pd.DataFrame | None:
+    """Tabela via HTTP puro (sessão keep-alive + lxml), seguindo a paginação
+    do servidor se houver. None se o HTML não trouxer a tabela com linhas."""
+    sess = http_metrics.session(4)
     try:
-        tbody_html = driver.find_element(By.CSS_SELECTOR, "table.zztable tbody").get_attribute("innerHTML")
-    except Exception:
-        tbody_html = driver.page_source
-    return hashlib.md5(tbody_html.encode("utf-8", errors="ignore")).hexdigest()
-
-def paginate_via_js(driver) -> bool:
-    script = """
-    try {
-      var t = (window.jQuery || window.$) && (window.jQuery || window.$)('#DataTables_Table_0').DataTable();
-      if (t) { t.page('next').draw(false); return true; }
-      return false;
-    } catch(e) { return false; }
-    """
-    return bool(driver.execute_script(script))
-
-def try_set_page_length(driver) -> bool:
+        info(f"HTTP: {url}")
+        doc = _get_doc(sess, url)
+        df = parse_table_lxml(doc)
+        if df is None or df.empty:
+            return None
+        dfs, queue, seen = [df], _page_links(doc, url), {url}
+        while queue and len(seen) < MAX_PAGES:
+            u = queue.pop(0)
+            if u in seen:
+                continue
+            seen.add(u)
+            doc = _get_doc(sess, u)
+            page = parse_table_lxml(doc)
+            if page is None or page.empty:
+                continue
+            dfs.append(page)
+            info(f"HTTP: página {len(dfs)} | linhas: {len(page)}")
+            queue += [v for v in _page_links(doc, url) if v not in seen and v not in queue]
+        return pd.concat(dfs, ignore_index=True).drop_duplicates() if len(dfs) > 1 else df.drop_duplicates()
+    finally:
+        sess.close()
+
+# ----------------- caminho navegador -----------------
+def read_datatable(driver, page: str = "all") -> pd.DataFrame | None:
+    """Tabela pela API do DataTables (None se a página não usa DataTables ou,
+    com page='all', se os dados ficam no servidor)."""
+    res = driver.execute_script(JS_READ, TABLE_SEL, page)
+    if not res:
+        return None
+    return frame(res["headers"], res["rows"])
+
+def next_page(driver) -> bool:
+    """Avança uma página e espera o 'draw'; False na última página."""
     try:
-        sel = driver.find_element(By.CSS_SELECTOR, "div.dataTables_length select")
-        options = sel.find_elements(By.TAG_NAME, "option")
-        for o in options:
-            txt = (o.text or "").strip().lower()
-            val = (o.get_attribute("value") or "").strip()
-            if val == "-1" or txt in ("todos", "all", "100"):
-                o.click()
-                time.sleep(1.2)
-                return True
+        return bool(driver.execute_async_script(JS_NEXT_PAGE, TABLE_SEL))
     except Exception:
-        pass
-    return False
-
-def build_driver(headless: bool = True) -> webdriver.Chrome:
-    opts = Options()
-    if headless:
-        opts.add_argument("--headless=new")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1280,900")
-    opts.add_argument("--ignore-certificate-errors")
-    opts.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
-    return webdriver.Chrome(options=opts)
+        return False
 
 def scrape_all_pages(url: str) -> pd.DataFrame:
-    with build_driver(headless=True) as driver:
+    with browser.session().lease() as driver:
         info(f"abrindo {url}")
+        driver.set_script_timeout(15)
         driver.get(url)
 
         WebDriverWait(driver, 20).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "table.zztable.stats, table#DataTables_Table_0"))
         )
-        time.sleep(0.6)
-        dismiss_overlays(driver)
-
-        if try_set_page_length(driver):
-            info("page length: ALL/100")
+        try:
+            WebDriverWait(driver, 5, poll_frequency=0.1).until(lambda d: d.execute_script(JS_READY, TABLE_SEL))
+        except Exception:
+            warn("DataTables não inicializou; lendo o HTML da página")
             return parse_table(driver.page_source)
 
-        info("paginação via DataTables API")
-        dfs = []
-        seen = 0
-        while True:
-            html = driver.page_source
-            df = parse_table(html)
-            dfs.append(df)
-            seen += 1
-            info(f"página {seen} | linhas: {len(df)}")
-
-            before_sig = table_signature(driver)
-            before_page = get_active_page_num(driver)
-
-            if not paginate_via_js(driver):
-                warn("não foi possível avançar (API DataTables indisponível)")
-                break
-
-            try:
-                WebDriverWait(driver, 10).until(
-                    lambda d: table_signature(d) != before_sig or get_active_page_num(d) != before_page
-                )
-            except Exception:
-                warn("fim da paginação detectado")
-                break
-
-            time.sleep(0.5)
+        df = read_datatable(driver)
+        if df is not None:
+            info(f"DataTables: {len(df)} linhas numa chamada")
+            return df.drop_duplicates()
 
+        info("DataTables com dados no servidor: lendo página a página")
+        dfs = [read_datatable(driver, "current")]
+        info(f"página 1 | linhas: {len(dfs[0])}")
+        while next_page(driver):
+            dfs.append(read_datatable(driver, "current"))
+            info(f"página {len(dfs)} | linhas: {len(dfs[-1])}")
         return pd.concat(dfs, ignore_index=True).drop_duplicates()
 
+def scrape(url: str, mode: str = "auto") -> tuple[pd.DataFrame, str]:
+    """(tabela, caminho usado: "http" ou "browser"). `auto` tenta HTTP e só
+    abre o navegador se o HTML não trouxer a tabela."""
+    if mode not in MODES:
+        raise ValueError(f"modo inválido: {mode} (use {', '.join(MODES)})")
+    if mode != "browser":
+        try:
+            df = scrape_http(url)
+        except Exception as e:
+            if mode == "http":
+                raise
+            warn(f"HTTP falhou ({e})")
+            df = None
+        if df is not None:
+            return df, "http"
+        if mode == "http":
+            raise RuntimeError("tabela não encontrada no HTML")
+        warn("HTML sem a tabela; usando o navegador")
+    return scrape_all_pages(url), "browser"
+
+def run(url: str = URL_DEFAULT, out: str | None = OUT_DEFAULT, mode: str = "auto") -> pd.DataFrame:
+    df, path = scrape(url, mode)
+    df.attrs["path"] = path
+    ok(f"total linhas: {len(df)} (caminho: {path})")
+    if out:
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        df.to_csv(out, index=False, encoding="utf-8-sig")
+        ok(f"salvo em {out}")
+    return df
+
 def main():
     ap = argparse.ArgumentParser(prog="scraper_ogol", description="Scraper oGol - melhores desempenhos")
     ap.add_argument("--url", default=URL_DEFAULT, help="URL da tabela do oGol")
     ap.add_argument("--out", default=OUT_DEFAULT, help="arquivo CSV de saída")
+    ap.add_argument("--mode", choices=MODES, default="auto", help="auto: HTTP primeiro, navegador se preciso")
     args = ap.parse_args()
 
     try:
-        df = scrape_all_pages(args.url)
-        ok(f"total linhas: {len(df)}")
-        df.to_csv(args.out, index=False, encoding="utf-8-sig")
-        ok(f"salvo em {args.out}")
+        run(args.url, args.out, args.mode)
     except Exception as e:
         err(f"falha no scraping: {e}")
         raise
@@ -0,0 +1,177 @@
+# src/scraper/scraper_ogol_async.py
+# Várias páginas do ogol de uma vez (outras estatísticas, edições anteriores):
+# um único Chromium do Playwright com N contextos isolados em paralelo (asyncio),
+# no máximo `per_domain` páginas simultâneas por domínio. Cada URL tenta antes
+# o caminho HTTP do scraper_ogol; o navegador só entra quando o HTML não traz
+# a tabela. Grava um arquivo por URL e a tabela combinada (coluna `url`).
+import re, sys, time, asyncio, argparse
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.common.logging_utils import info, ok, warn, err
+from src.scraper import browser, scraper_ogol
+from src.scraper.scraper_ogol import TABLE_SEL, JS_READ, JS_READY, JS_NEXT_PAGE, MODES, frame
+
+OUT_DIR = "data/scraper/ogol"
+WORKERS = 4
+PER_DOMAIN = 2
+FORMATS = ("csv", "parquet")
+TABLE_CSS = "table.zztable.stats, table#DataTables_Table_0"
+
+def _fn(js: str) -> str:
+    """Script no estilo Selenium (arguments[i], return) -> função para page.evaluate."""
+    return f"(args) => (function() {{ {js} }}).apply(null, args)"
+
+def _async_fn(js: str) -> str:
+    """Idem para scripts assíncronos (o último argumento é o callback)."""
+    return f"(args) => new Promise((resolve) => (function() {{ {js} }}).apply(null, args.concat([resolve])))"
+
+def slug(url: str) -> str:
+    """https://www.ogol.com.br/edicao/brasileirao-serie-a-2025/194851/melhores-desempenhos
+    -> edicao_brasileirao-serie-a-2025_194851_melhores-desempenhos"""
+    parts = urlsplit(url)
+    s = re.sub(r"[^A-Za-z0-9._-]+", "_", (parts.path.strip("/") + ("_" + parts.query if parts.query else "")))
+    return s.strip("_") or parts.netloc
+
+async def _block(route):
+    req = route.request
+    if req.resource_type in ("image", "media", "font") or any(d in req.url for d in browser.BLOCKED_DOMAINS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _scrape_page(pw_browser, url: str) -> pd.DataFrame:
+    ctx = await pw_browser.new_context(user_agent=browser.USER_AGENT, viewport={"width": 1280, "height": 900})
+    try:
+        await ctx.route("**/*", _block)
+        page = await ctx.new_page()
+        await page.goto(url, wait_until="domcontentloaded", timeout=30_000)
+        await page.wait_for_selector(TABLE_CSS, timeout=20_000)
+        try:
+            await page.wait_for_function(_fn(JS_READY), arg=[TABLE_SEL], timeout=5_000, polling=100)
+        except Exception:
+            warn(f"{url}: DataTables não inicializou; lendo o HTML da página")
+            return scraper_ogol.parse_table(await page.content())
+        res = await page.evaluate(_fn(JS_READ), [TABLE_SEL, "all"])
+        if res:
+            return frame(res["headers"], res["rows"]).drop_duplicates()
+        dfs = []
+        while True:  # dados no servidor: página a página, esperando o 'draw'
+            res = await page.evaluate(_fn(JS_READ), [TABLE_SEL, "current"])
+            dfs.append(frame(res["headers"], res["rows"]))
+            if not await page.evaluate(_async_fn(JS_NEXT_PAGE), [TABLE_SEL]):
+                break
+        return pd.concat(dfs, ignore_index=True).drop_duplicates()
+    finally:
+        await ctx.close()
+
+def _write(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        # colunas com número e texto misturados ("-", "12%") viram texto, como no CSV
+        mixed = {c: "string" for c in df.columns if df[c].dtype == object}
+        df.astype(mixed).to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+
+async def _run(urls, out_dir, workers, per_domain, fmt, mode) -> dict[str, pd.DataFrame]:
+    slots = asyncio.Semaphore(max(1, workers))
+    domains: dict[str, asyncio.Semaphore] = {}
+    results: dict[str, pd.DataFrame] = {}
+    pw_state: dict = {}
+    launch_lock = asyncio.Lock()
+
+    async def pw_browser():
+        async with launch_lock:  # o Chromium só sobe se algum URL precisar dele
+            if "browser" not in pw_state:
+                try:
+                    from playwright.async_api import async_playwright
+                except ImportError as e:
+                    raise RuntimeError(f"Playwright ausente ({e}); instale com: "
+                                       "pip install playwright && playwright install chromium")
+                pw_state["pw"] = await async_playwright().start()
+                pw_state["browser"] = await pw_state["pw"].chromium.launch(headless=True)
+            return pw_state["browser"]
+
+    async def one(url: str):
+        dom = domains.setdefault(urlsplit(url).netloc, asyncio.Semaphore(max(1, per_domain)))
+        async with slots, dom:
+            t0 = time.perf_counter()
+            df, path = None, "browser"
+            try:
+                if mode != "browser":
+                    try:
+                        df, path = await asyncio.to_thread(scraper_ogol.scrape_http, url), "http"
+                    except Exception as e:
+                        if mode == "http":
+                            raise
+                        warn(f"{url}: HTTP falhou ({e})")
+                    if df is None and mode == "http":
+                        raise RuntimeError("tabela não encontrada no HTML")
+                if df is None:
+                    df, path = await _scrape_page(await pw_browser(), url), "browser"
+            except Exception as e:
+                err(f"{url}: {e}")
+                return
+            out = Path(out_dir) / f"{slug(url)}.{fmt}"
+            _write(df, out, fmt)
+            results[url] = df
+            ok(f"{url}: {len(df)} linhas em {time.perf_counter() - t0:.1f}s (caminho: {path}) -> {out}")
+
+    try:
+        await asyncio.gather(*(one(u) for u in urls))
+    finally:
+        if "browser" in pw_state:
+            await pw_state["browser"].close()
+        if "pw" in pw_state:
+            await pw_state["pw"].stop()
+    return results
+
+def run(urls=None, out_dir=OUT_DIR, workers=WORKERS, per_domain=PER_DOMAIN, fmt="csv", mode="auto") -> pd.DataFrame:
+    """Raspa `urls` em paralelo; devolve a tabela combinada (coluna `url` na
+    frente), também gravada em {out_dir}/ogol_combined.{fmt}."""
+    urls = list(dict.fromkeys(urls or [scraper_ogol.URL_DEFAULT]))
+    if fmt not in FORMATS:
+        raise ValueError(f"formato inválido: {fmt} (use {', '.join(FORMATS)})")
+    if mode not in MODES:
+        raise ValueError(f"modo inválido: {mode} (use {', '.join(MODES)})")
+    info(f"ogol: {len(urls)} página(s), {workers} contexto(s), até {per_domain} por domínio")
+    t0 = time.perf_counter()
+    results = asyncio.run(_run(urls, out_dir, workers, per_domain, fmt, mode))
+    if not results:
+        raise RuntimeError("nenhuma página raspada")
+    combined = pd.concat([df.assign(url=u)[["url", *df.columns]] for u, df in results.items()], ignore_index=True)
+    out = Path(out_dir) / f"ogol_combined.{fmt}"
+    _write(combined, out, fmt)
+    ok(f"{len(results)}/{len(urls)} página(s), {len(combined)} linhas em {time.perf_counter() - t0:.1f}s -> {out}")
+    if len(results) < len(urls):
+        warn(f"{len(urls) - len(results)} página(s) falharam")
+    return combined
+
+def main():
+    ap = argparse.ArgumentParser(prog="scraper_ogol_async", description="Scraper oGol - várias páginas em paralelo")
+    ap.add_argument("--urls", nargs="+", help="URLs do ogol (padrão: melhores desempenhos 2025)")
+    ap.add_argument("--urls-file", help="arquivo com um URL por linha")
+    ap.add_argument("--out-dir", default=OUT_DIR)
+    ap.add_argument("--workers", type=int, default=WORKERS, help="contextos de navegador em paralelo")
+    ap.add_argument("--per-domain", type=int, default=PER_DOMAIN, help="páginas simultâneas por domínio")
+    ap.add_argument("--format", dest="fmt", choices=FORMATS, default="csv")
+    ap.add_argument("--mode", choices=MODES, default="auto", help="auto: HTTP primeiro, navegador se preciso")
+    args = ap.parse_args()
+    urls = list(args.urls or [])
+    if args.urls_file:
+        urls += [l.strip() for l in Path(args.urls_file).read_text(encoding="utf-8").splitlines()
+                 if l.strip() and not l.startswith("#")]
+    run(urls, args.out_dir, args.workers, args.per_domain, args.fmt, args.mode)
+
+if __name__ == "__main__":
+    try:
+        main()
+        ok("Concluído")
+    except Exception as e:
+        err(f"Falha: {e}")
+        raise
@@ -5,11 +5,15 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from src.common import logging_utils as log
+from src.common import http_cache, http_metrics
 
+import argparse
+import hashlib
+import threading
 import unicodedata
-import requests
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
 import pandas as pd
-from bs4 import BeautifulSoup
 
 REBAIX_URL = "https://www.mat.ufmg.br/futebol/rebaixamento_seriea/"
 CAMPEAO_URL = "https://www.mat.ufmg.br/futebol/campeao_seriea/"
@@ -18,6 +22,7 @@ SULA_URL    = "https://www.mat.ufmg.br/futebol/classificacao-para-sulamericana_s
 
 TABLE_ID = "tabelaCL"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
+CACHE_TTL = 3600  # as probabilidades só mudam depois de cada rodada
 
 OUTPUT_DIR = os.path.join("data", "prob")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "prob_ufmg.csv")
@@ -37,24 +42,68 @@ def _norm_name(s: str) -> str:
     return s.upper()
 
 # ----------------- scraping -----------------
-def get_html(url: str) -> str:
+_session = None
+_guard = threading.Lock()
+
+def _send(url, params=None, headers=None, timeout=20):
+    global _session
+    with _guard:
+        if _session is None:
+            _session = http_metrics.session(4)  # uma conexão keep-alive por página baixada em paralelo
+    path = url.split("://", 1)[-1].split("/", 1)[-1].strip("/")
+    return http_metrics.get(_session, url, f"ufmg/{path}", params=params, headers=headers, timeout=timeout)
+
+def fetch_html(url: str) -> http_cache.Cached:
+    """HTML da página via cache local (TTL + GET condicional)."""
     log.info(f"Baixando {url} ...")
-    resp = requests.get(url, headers=HEADERS, timeout=20)
-    resp.raise_for_status()
-    log.ok(f"Sucesso no download: {url}")
-    return resp.text
+    page = http_cache.get(url, headers=HEADERS, ttl=CACHE_TTL, send=_send, timeout=20)
+    log.ok(f"Sucesso no download: {url}" if page.changed else f"Sem mudanças ({page.source}): {url}")
+    return page
+
+def fetch_all(urls: list[str]) -> dict[str, http_cache.Cached]:
+    """As páginas em paralelo, pela mesma sessão (cada uma com GET condicional)."""
+    with ThreadPoolExecutor(max_workers=max(1, len(urls))) as ex:
+        return dict(zip(urls, ex.map(fetch_html, urls)))
+
+def sources_digest(pages: dict[str, http_cache.Cached]) -> str:
+    """Hash das páginas usadas numa coleta; fica ao lado da saída ({out}.sources)."""
+    h = hashlib.sha256()
+    for url in sorted(pages):
+        h.update(url.encode() + b"\0" + hashlib.sha256(pages[url].content).digest())
+    return h.hexdigest()
+
+def _up_to_date(out: str | None, info: str, digest: str) -> bool:
+    # comparado com o que gerou `out` (não com o cache HTTP, que outra saída
+    # ou uma coleta que falhou no meio podem já ter atualizado)
+    # sem o info_clube: segue adiante e a checagem da junção acusa o arquivo faltando
+    if not out or not os.path.exists(out) or not os.path.exists(info):
+        return False
+    if os.path.getmtime(out) < os.path.getmtime(info):
+        return False
+    try:
+        with open(f"{out}.sources", encoding="utf-8") as f:
+            return f.read().strip() == digest
+    except FileNotFoundError:
+        return False
+
+def get_html(url: str) -> str:
+    return fetch_html(url).text
+
+def _text(el) -> str:
+    # como get_text(strip=True): trechos sem espaços nas pontas, juntos
+    return "".join(t.strip() for t in el.xpath(".//text()[not(ancestor::script) and not(ancestor::style)]"))
 
 def parse_table(html: str, metric: str) -> pd.DataFrame:
-    soup = BeautifulSoup(html, "html.parser")
-    table = soup.find("table", id=TABLE_ID) or soup.find("table")
+    doc = lxml.html.fromstring(html)
+    table = next(iter(doc.xpath(f"//table[@id='{TABLE_ID}']") or doc.xpath("//table")), None)
     if table is None:
         log.err("Nenhuma <table> encontrada.")
         raise ValueError("Tabela não encontrada no HTML.")
 
     rows = []
-    body = table.find("tbody") or table
-    for tr in body.find_all("tr"):
-        tds = [td.get_text(strip=True) for td in tr.find_all("td")]
+    body = next(iter(table.xpath(".//tbody")), table)
+    for tr in body.xpath(".//tr"):
+        tds = [_text(td) for td in tr.xpath(".//td")]
         if len(tds) < 3:
             continue
         team = tds[1].strip().replace("\xa0", " ")
@@ -81,14 +130,20 @@ def parse_table(html: str, metric: str) -> pd.DataFrame:
     return df
 
 # ----------------- pipeline -----------------
-def main():
+def run(out: str | None = OUTPUT_FILE, info: str = INFO_CLUBE_PATH) -> pd.DataFrame:
     log.info("Iniciando coleta de probabilidades do Brasileirão...")
 
-    # 1) Scrape de cada métrica
-    df_reb = parse_table(get_html(REBAIX_URL), "prob_rebaixamento_pct")
-    df_cam = parse_table(get_html(CAMPEAO_URL), "prob_campeao_pct")
-    df_lib = parse_table(get_html(LIBERTA_URL), "prob_libertadores_pct")
-    df_sul = parse_table(get_html(SULA_URL), "prob_sulamericana_pct")
+    # 1) Scrape de cada métrica, em paralelo (páginas iguais às da última coleta: nada a refazer,
+    #    nem a junção com o info_clube)
+    pages = fetch_all([REBAIX_URL, CAMPEAO_URL, LIBERTA_URL, SULA_URL])
+    digest = sources_digest(pages)
+    if _up_to_date(out, info, digest):
+        log.ok(f"Páginas da UFMG sem mudanças; mantendo {out}")
+        return pd.read_csv(out, encoding="utf-8-sig")
+    df_reb = parse_table(pages[REBAIX_URL].text, "prob_rebaixamento_pct")
+    df_cam = parse_table(pages[CAMPEAO_URL].text, "prob_campeao_pct")
+    df_lib = parse_table(pages[LIBERTA_URL].text, "prob_libertadores_pct")
+    df_sul = parse_table(pages[SULA_URL].text, "prob_sulamericana_pct")
 
     # 2) Consolidado por 'time'
     df = (
@@ -105,11 +160,11 @@ def main():
     df.insert(0, "coleta_ts_brt", ts.strftime("%Y-%m-%d %H:%M:%S"))
 
     # 4) Enriquecimento com id_time
-    if not os.path.exists(INFO_CLUBE_PATH):
-        log.err(f"Arquivo de referência não encontrado: {INFO_CLUBE_PATH}")
-        raise FileNotFoundError(INFO_CLUBE_PATH)
+    if not os.path.exists(info):
+        log.err(f"Arquivo de referência não encontrado: {info}")
+        raise FileNotFoundError(info)
 
-    ref = pd.read_csv(INFO_CLUBE_PATH)
+    ref = pd.read_csv(info)
 
     cols_lower = {c.lower(): c for c in ref.columns}
     if not {"id_time", "nome_canonico"}.issubset(set(cols_lower.keys())):
@@ -158,12 +213,22 @@ def main():
         )
         log.info("Pendências exportadas em data/curated/pending_prob_times.csv")
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    df.to_csv(OUTPUT_FILE, index=False, encoding="utf-8-sig")
-
-    log.ok(f"Arquivo consolidado salvo em: {OUTPUT_FILE}")
+    if out:
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        df.to_csv(out, index=False, encoding="utf-8-sig")
+        with open(f"{out}.sources", "w", encoding="utf-8") as f:
+            f.write(digest + "\n")
+        log.ok(f"Arquivo consolidado salvo em: {out}")
     log.info("Prévia dos dados:")
     print(df.head(10))
+    return df
+
+def main():
+    ap = argparse.ArgumentParser(prog="scraper_ufmg", description="Probabilidades UFMG - Série A")
+    ap.add_argument("--out", default=OUTPUT_FILE, help="arquivo CSV de saída")
+    ap.add_argument("--info", default=INFO_CLUBE_PATH, help="info_clube.csv com id_time/nome_canonico")
+    args = ap.parse_args()
+    run(args.out, args.info)
 
 if __name__ == "__main__":
     try:
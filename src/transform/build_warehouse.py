@@ -0,0 +1,109 @@
+# src/transform/build_warehouse.py
+# Junta as tabelas curadas num único banco DuckDB (uma tabela por CSV, com chave
+# primária) ou, com --parquet-dir, grava Parquet e registra views no banco.
+# CSV de mesmo nome em partições (competition=X/season=Y) viram uma tabela só,
+# com as colunas competition e season.
+import sys, pathlib, argparse
+from pathlib import Path
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
+
+from src.common.logging_utils import info, ok, warn, err
+
+CURATED_DIR = "data/curated"
+OUT_DEFAULT = "data/warehouse/brasileirao.duckdb"
+
+# chave primária: primeira destas colunas presente na tabela
+KEY_COLUMNS = ("id_partida", "id_jogador", "id_time")
+TABLE_KEYS = {"dim_calendario": "data"}
+
+def _lit(s) -> str:
+    return "'" + str(s).replace("'", "''") + "'"
+
+def _ident(s) -> str:
+    return '"' + str(s).replace('"', '""') + '"'
+
+def table_key(name: str, columns: list[str]) -> str | None:
+    if name in TABLE_KEYS:
+        return TABLE_KEYS[name] if TABLE_KEYS[name] in columns else None
+    return next((c for c in KEY_COLUMNS if c in columns), None)
+
+def _key_ok(con, src: str, key: list[str]) -> bool:
+    cols = ", ".join(map(_ident, key))
+    nulls = " OR ".join(f"{_ident(c)} IS NULL" for c in key)
+    total, has_null = con.execute(f"SELECT count(*), count(*) FILTER (WHERE {nulls}) FROM {src}").fetchone()
+    distinct = con.execute(f"SELECT count(*) FROM (SELECT DISTINCT {cols} FROM {src})").fetchone()[0]
+    return total == distinct and has_null == 0
+
+def _source(paths: list[Path]) -> str:
+    files = "[" + ", ".join(_lit(p.as_posix()) for p in paths) + "]"
+    if any("competition=" in p.as_posix() for p in paths):
+        return f"read_csv_auto({files}, header=true, hive_partitioning=true, union_by_name=true)"
+    return f"read_csv_auto({files}, header=true)"
+
+def run(tables=None, out=OUT_DEFAULT, parquet_dir=None) -> dict:
+    """Grava `tables` (CSV curados; padrão: todos de data/curated) no banco `out`.
+    Devolve {tabela: colunas da chave primária ou None}."""
+    import duckdb
+
+    paths = [Path(p) for p in (tables or sorted(Path(CURATED_DIR).glob("*.csv")))]
+    groups: dict[str, list[Path]] = {}
+    for p in paths:
+        groups.setdefault(p.stem, []).append(p)
+    if not paths:
+        err("Nenhuma tabela curada encontrada."); raise SystemExit(1)
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if parquet_dir:
+        Path(parquet_dir).mkdir(parents=True, exist_ok=True)
+
+    # grava num arquivo temporário e troca no fim: quem estiver lendo o banco
+    # (Power BI, analistas) nunca vê um arquivo pela metade
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    keys = {}
+    con = duckdb.connect(str(tmp))
+    try:
+        for name, files in groups.items():
+            src = _source(files)
+            cols = con.execute(f"DESCRIBE SELECT * FROM {src}").fetchall()
+            names = [c[0] for c in cols]
+            key = table_key(name, names)
+            if key:
+                key = [c for c in ("competition", "season") if c in names] + [key]
+            if key and not _key_ok(con, src, key):
+                warn(f"{name}: {', '.join(key)} repetido ou vazio; tabela gravada sem chave primária")
+                key = None
+            keys[name] = key
+            if parquet_dir:
+                pq = (Path(parquet_dir) / f"{name}.parquet").resolve()
+                con.execute(f"COPY (SELECT * FROM {src}) TO {_lit(pq.as_posix())} (FORMAT parquet)")
+                con.execute(f"CREATE VIEW {_ident(name)} AS SELECT * FROM read_parquet({_lit(pq.as_posix())})")
+            else:
+                ddl = [f"{_ident(c[0])} {c[1]}" for c in cols]
+                if key:
+                    ddl.append(f"PRIMARY KEY ({', '.join(map(_ident, key))})")
+                con.execute(f"CREATE TABLE {_ident(name)} ({', '.join(ddl)})")
+                con.execute(f"INSERT INTO {_ident(name)} SELECT * FROM {src}")
+            info(f"{name}: {len(files)} arquivo(s), {len(cols)} colunas, chave {', '.join(key) if key else '-'}")
+    finally:
+        con.close()
+    tmp.replace(out)
+    ok(f"Warehouse salvo em {out} ({len(keys)} tabelas{', views sobre ' + str(parquet_dir) if parquet_dir else ''})")
+    return keys
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tables", nargs="+", help="CSV curados (padrão: todos de data/curated)")
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--parquet-dir", help="grava Parquet aqui e cria views no banco em vez de tabelas")
+    args = ap.parse_args()
+    try:
+        run(args.tables, args.out, args.parquet_dir)
+        ok("Concluído")
+    except Exception as e:
+        err(f"Falha: {e}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
-import sys, pathlib, argparse, json, pandas as pd, re, unicodedata
-from pathlib import Path
+import sys, pathlib, argparse, pandas as pd, re, unicodedata
 
 # permite executar direto sem -m se quiser
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from src.common.io import save_table
+from src.common import raw
 from src.common.logging_utils import info, ok, err
 
 # === mapa canônico -> HEX (na ordem: primária, secundária, terciária) ===
@@ -128,13 +128,6 @@ def _canonical_name(name: str) -> str:
             return k
     return name  # fallback: mantém original
 
-def _read_json_any(p):
-    b = Path(p).read_bytes()
-    for enc in ("utf-8","utf-8-sig","cp1252","latin-1"):
-        try: return json.loads(b.decode(enc))
-        except Exception: pass
-    raise ValueError("Falha ao decodificar JSON.")
-
 def _split_colors(s: str | None) -> tuple[str|None, str|None, str|None]:
     if not s: return (None, None, None)
     norm = re.sub(r"\s*/\s*|\s*-\s*|;\s*|,\s*", ",", s.strip())
@@ -142,70 +135,74 @@ def _split_colors(s: str | None) -> tuple[str|None, str|None, str|None]:
     parts = parts[:3] + [None] * (3 - len(parts))
     return tuple(parts[:3])
 
+IN_DEFAULT = "data/raw/teams_fdorg.json"
+OUT_DEFAULT = "data/curated/info_clube.csv"
+
+def run(inp=IN_DEFAULT, out=OUT_DEFAULT) -> pd.DataFrame:
+    info("Lendo teams_fdorg.json...")
+    teams = raw.teams(inp)
+    if not teams:
+        err("Objeto 'teams' vazio ou ausente."); raise SystemExit(1)
+
+    rows = []
+    for t in teams:
+        name        = t.get("name")
+        name_canon  = _canonical_name(name)
+
+        cor1_txt, cor2_txt, cor3_txt = _split_colors(t.get("clubColors"))
+        hexes = COLORS_HEX.get(name_canon, [])
+        hex1, hex2, hex3 = (hexes + [None, None, None])[:3]
+
+        area        = t.get("area") or {}
+        coach       = t.get("coach") or {}
+        contract    = coach.get("contract") or {}
+        comps       = t.get("runningCompetitions") or []
+
+        rows.append({
+            "id_time": t.get("id"),
+            "time": name,
+            "nome_canonico": name_canon,
+            "apelido": t.get("shortName"),
+            "tla": t.get("tla"),
+            "escudo_url": t.get("crest"),
+            "endereco": t.get("address"),
+            "site": t.get("website"),
+            "fundado": t.get("founded"),
+            "estadio": t.get("venue"),
+            "cor_primaria": cor1_txt,
+            "cor_secundaria": cor2_txt,
+            "cor_terciaria": cor3_txt,
+            "hex1": hex1,
+            "hex2": hex2,
+            "hex3": hex3,
+            "cores_raw": t.get("clubColors"),
+            "pais": area.get("name"),
+            "pais_codigo": area.get("code"),
+            "pais_bandeira_url": area.get("flag"),
+            "tecnico": coach.get("name"),
+            "tecnico_nacionalidade": coach.get("nationality"),
+            "contrato_inicio": contract.get("start"),
+            "contrato_fim": contract.get("until"),
+            "competicoes_codigos": "; ".join([c.get("code") for c in comps if isinstance(c, dict) and c.get("code")]),
+            "competicoes_nomes": "; ".join([c.get("name") for c in comps if isinstance(c, dict) and c.get("name")]),
+            "last_updated": t.get("lastUpdated"),
+        })
+
+    df = pd.DataFrame(rows).sort_values(["nome_canonico","time"]).reset_index(drop=True)
+    info(f"Gerando tabela de clubes ({len(df)} registros)...")
+    if out:
+        save_table(df, out)
+        ok(f"Informações dos clubes salvas em {out}")
+    return df
+
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--in", dest="inp", default="data/raw/teams_fdorg.json")
-    ap.add_argument("--out", default="data/curated/info_clube.csv")
+    ap.add_argument("--in", dest="inp", default=IN_DEFAULT)
+    ap.add_argument("--out", default=OUT_DEFAULT)
     args = ap.parse_args()
 
     try:
-        info("Lendo teams_fdorg.json...")
-        obj = _read_json_any(args.inp)
-        teams = obj.get("teams") or obj.get("response") or []
-        if not teams:
-            err("Objeto 'teams' vazio ou ausente."); raise SystemExit(1)
-
-        rows = []
-        for t in teams:
-            if not isinstance(t, dict): 
-                continue
-
-            name        = t.get("name")
-            name_canon  = _canonical_name(name)
-
-            cor1_txt, cor2_txt, cor3_txt = _split_colors(t.get("clubColors"))
-            hexes = COLORS_HEX.get(name_canon, [])
-            hex1, hex2, hex3 = (hexes + [None, None, None])[:3]
-
-            area        = t.get("area") or {}
-            coach       = t.get("coach") or {}
-            contract    = coach.get("contract") or {}
-            comps       = t.get("runningCompetitions") or []
-
-            rows.append({
-                "id_time": t.get("id"),
-                "time": name,
-                "nome_canonico": name_canon,
-                "apelido": t.get("shortName"),
-                "tla": t.get("tla"),
-                "escudo_url": t.get("crest"),
-                "endereco": t.get("address"),
-                "site": t.get("website"),
-                "fundado": t.get("founded"),
-                "estadio": t.get("venue"),
-                "cor_primaria": cor1_txt,
-                "cor_secundaria": cor2_txt,
-                "cor_terciaria": cor3_txt,
-                "hex1": hex1,
-                "hex2": hex2,
-                "hex3": hex3,
-                "cores_raw": t.get("clubColors"),
-                "pais": area.get("name"),
-                "pais_codigo": area.get("code"),
-                "pais_bandeira_url": area.get("flag"),
-                "tecnico": coach.get("name"),
-                "tecnico_nacionalidade": coach.get("nationality"),
-                "contrato_inicio": contract.get("start"),
-                "contrato_fim": contract.get("until"),
-                "competicoes_codigos": "; ".join([c.get("code") for c in comps if isinstance(c, dict) and c.get("code")]),
-                "competicoes_nomes": "; ".join([c.get("name") for c in comps if isinstance(c, dict) and c.get("name")]),
-                "last_updated": t.get("lastUpdated"),
-            })
-
-        df = pd.DataFrame(rows).sort_values(["nome_canonico","time"]).reset_index(drop=True)
-        info(f"Gerando tabela de clubes ({len(df)} registros)...")
-        save_table(df, args.out)
-        ok(f"Informações dos clubes salvas em {args.out}")
+        run(args.inp, args.out)
         ok("Concluído")
     except Exception as e:
         err(f"Falha: {e}")
@@ -6,18 +6,20 @@ import sys
 from pathlib import Path
 THIS_FILE = Path(__file__).resolve()
 SRC_DIR = THIS_FILE.parents[1]
-if str(SRC_DIR) not in sys.path:
-    sys.path.insert(0, str(SRC_DIR))
+for _p in (SRC_DIR, SRC_DIR.parent):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
 # --- fim bootstrap ---
 
 import os
 import re
-import json
+import argparse
 import unicodedata
 from typing import Dict, Tuple, List
 import pandas as pd
 
 from common.logging_utils import info, ok, warn, err
+from src.common import raw  # mesmo módulo (e cache) usado pelas demais transformações
 
 PROJECT_ROOT = SRC_DIR.parent
 FDORG_JSON = PROJECT_ROOT / "data" / "raw" / "teams_fdorg.json"
@@ -112,24 +114,21 @@ def team_to_id(raw_name) -> int | None:
 
     return TEAM_ID_MAP.get(k2)
 
-def load_fdorg_players(path: Path) -> pd.DataFrame:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def load_fdorg_players(path: Path | dict) -> pd.DataFrame:
     rows: List[Dict] = []
-    for team in data.get("teams", []):
+    for team, p in raw.squads(path):
         team_name = team.get("shortName") or team.get("name") or ""
         team_norm = norm(team_name)
-        for p in team.get("squad", []):
-            rows.append({
-                "fdorg_player_id": p.get("id"),
-                "fdorg_player_name": p.get("name") or "",
-                "fdorg_player_name_norm": norm(p.get("name") or ""),
-                "fdorg_position": p.get("position") or "",
-                "fdorg_nationality": p.get("nationality") or "",
-                "fdorg_dob": p.get("dateOfBirth") or "",
-                "fdorg_team": team_name,
-                "fdorg_team_norm": team_norm,
-            })
+        rows.append({
+            "fdorg_player_id": p.get("id"),
+            "fdorg_player_name": p.get("name") or "",
+            "fdorg_player_name_norm": norm(p.get("name") or ""),
+            "fdorg_position": p.get("position") or "",
+            "fdorg_nationality": p.get("nationality") or "",
+            "fdorg_dob": p.get("dateOfBirth") or "",
+            "fdorg_team": team_name,
+            "fdorg_team_norm": team_norm,
+        })
     return pd.DataFrame(rows)
 
 def load_ogol(path: Path) -> pd.DataFrame:
@@ -216,9 +215,12 @@ def merge_many(fd: pd.DataFrame, og: pd.DataFrame, thr_fuzzy: float = 0.60) -> T
     info(f"[dbg] unmatched: {len(unmatched_df)}")
     return matched_df, unmatched_df
 
-def run(fdorg_json: Path = FDORG_JSON, ogol_csv: Path = OGOL_CSV, out_csv: Path = OUT_CSV):
-    if not fdorg_json.exists():
-        raise FileNotFoundError(fdorg_json)
+def run(fdorg_json: Path | dict = FDORG_JSON, ogol_csv: Path = OGOL_CSV, out: Path | None = OUT_CSV) -> pd.DataFrame:
+    ogol_csv = Path(ogol_csv)
+    if not isinstance(fdorg_json, dict):
+        fdorg_json = Path(fdorg_json)
+        if not fdorg_json.exists():
+            raise FileNotFoundError(fdorg_json)
     if not ogol_csv.exists():
         raise FileNotFoundError(ogol_csv)
 
@@ -263,15 +265,25 @@ def run(fdorg_json: Path = FDORG_JSON, ogol_csv: Path = OGOL_CSV, out_csv: Path
     )
     output = output[[c for c in ordered if c in output.columns]]
 
-    out_csv.parent.mkdir(parents=True, exist_ok=True)
-    output.to_csv(out_csv, index=False, encoding="utf-8-sig")
-
-    ok(f"merge gerado: {out_csv}")
+    if out:
+        out = Path(out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        output.to_csv(out, index=False, encoding="utf-8-sig")
+        ok(f"merge gerado: {out}")
     ok(f"linhas totais no resultado: {len(output)}")
+    return output
+
+def main():
+    ap = argparse.ArgumentParser(prog="merge_ogol_teams_fdorg")
+    ap.add_argument("--fdorg-json", default=str(FDORG_JSON))
+    ap.add_argument("--ogol-csv",   default=str(OGOL_CSV))
+    ap.add_argument("--out",        default=str(OUT_CSV))
+    args = ap.parse_args()
+    run(args.fdorg_json, args.ogol_csv, args.out)
 
 if __name__ == "__main__":
     try:
-        run()
+        main()
     except Exception as e:
         err(f"falha no merge: {e}")
         raise
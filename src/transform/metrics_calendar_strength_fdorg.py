@@ -1,87 +1,129 @@
-import sys, pathlib, argparse, json, pandas as pd
-from pathlib import Path
+import sys, pathlib, argparse, pandas as pd
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 from src.common.io import save_table
+from src.common import raw_tables, sql
 from src.common.logging_utils import info, ok, err
 
-def _read_json_any(p):
-    b = Path(p).read_bytes()
-    for enc in ("utf-8","utf-8-sig","cp1252","latin-1"):
-        try: return json.loads(b.decode(enc))
-        except: pass
-    raise ValueError("Decode error")
+MATCHES_DEFAULT = "data/raw/matches_fdorg.json"
+STANDINGS_DEFAULT = "data/raw/standings_fdorg.json"
+OUT_DEFAULT = "data/curated/forca_calendario_proximos5.csv"
 
-def main():
-    ap=argparse.ArgumentParser()
-    ap.add_argument("--matches-in", default="data/raw/matches_fdorg.json")
-    ap.add_argument("--standings-in", default="data/raw/standings_fdorg.json")
-    ap.add_argument("--out", default="data/curated/forca_calendario_proximos5.csv")
-    args=ap.parse_args()
-    try:
-        info("Lendo partidas e standings...")
-        mob=_read_json_any(args.matches_in); sob=_read_json_any(args.standings_in)
-        mrows=[]
-        for m in mob.get("matches",[]):
-            home,away=m.get("homeTeam",{}),m.get("awayTeam",{})
-            mrows.append({"utc":m.get("utcDate"),"status":m.get("status"),
-                          "home_id":home.get("id"),"home_name":home.get("name"),
-                          "away_id":away.get("id"),"away_name":away.get("name")})
-        df=pd.DataFrame(mrows)
-        if df.empty: err("Sem partidas."); raise SystemExit(1)
-        df["utc"]=pd.to_datetime(df["utc"])
+ENGINES = ("pandas", "sql")
 
-        pos={}
-        for s in sob.get("standings",[]):
-            if s.get("type")!="TOTAL": continue
-            for t in s.get("table",[]):
-                pos[t["team"]["id"]]=t.get("position")
+def _frame_pandas(matches_in, standings_in) -> pd.DataFrame:
+    df=raw_tables.load_table("matches", matches_in, columns=["utc_date","status","home_id","home_name","away_id","away_name"])
+    df=raw_tables.numpy_dtypes(df.rename(columns={"utc_date":"utc"}))
+    if df.empty: err("Sem partidas."); raise SystemExit(1)
 
-        fin=df[df["status"]=="FINISHED"]
-        frames=[]
-        long=pd.concat([
-            df.assign(team_id=df.home_id, team_name=df.home_name, opp_id=df.away_id, opp_name=df.away_name),
-            df.assign(team_id=df.away_id, team_name=df.away_name, opp_id=df.home_id, opp_name=df.home_name)
-        ], ignore_index=True)
+    st=raw_tables.numpy_dtypes(raw_tables.load_table("standings", standings_in, columns=["type","team_id","position"]))
+    st=st[st["type"]=="TOTAL"]
+    pos=dict(zip(st["team_id"], st["position"]))
 
-        for tid, g in long.groupby("team_id"):
-            team_name=g["team_name"].iloc[0]
-            hist=fin[(fin.home_id==tid)|(fin.away_id==tid)].sort_values("utc")
-            future=g[g["status"].isin(["SCHEDULED","TIMED"])].sort_values("utc").head(5)
-            if future.empty:
-                frames.append({
-                    "id_time": tid,
-                    "time": team_name,
-                    "proximos_jogos": 0,
-                    "media_posicao_adversarios": None,
-                    "melhor_posicao_adversario": None,
-                    "pior_posicao_adversario": None,
-                    "media_dias_descanso": None
-                })
-                continue
-
-            opp_positions=[pos.get(x, None) for x in future["opp_id"].tolist()]
-            dates=future["utc"].tolist()
-            gaps=[(dates[i]-dates[i-1]).days for i in range(1,len(dates))] if len(dates)>=2 else []
+    fin=df[df["status"]=="FINISHED"]
+    frames=[]
+    long=pd.concat([
+        df.assign(team_id=df.home_id, team_name=df.home_name, opp_id=df.away_id, opp_name=df.away_name),
+        df.assign(team_id=df.away_id, team_name=df.away_name, opp_id=df.home_id, opp_name=df.home_name)
+    ], ignore_index=True)
 
+    for tid, g in long.groupby("team_id"):
+        team_name=g["team_name"].iloc[0]
+        hist=fin[(fin.home_id==tid)|(fin.away_id==tid)].sort_values("utc")
+        future=g[g["status"].isin(["SCHEDULED","TIMED"])].sort_values("utc").head(5)
+        if future.empty:
             frames.append({
                 "id_time": tid,
                 "time": team_name,
-                "proximos_jogos": len(future),
-                "media_posicao_adversarios": (pd.Series(opp_positions).dropna().mean() if any(opp_positions) else None),
-                "melhor_posicao_adversario": (pd.Series(opp_positions).dropna().min() if any(opp_positions) else None),
-                "pior_posicao_adversario": (pd.Series(opp_positions).dropna().max() if any(opp_positions) else None),
-                "media_dias_descanso": (pd.Series(gaps).mean() if gaps else None)
+                "proximos_jogos": 0,
+                "media_posicao_adversarios": None,
+                "melhor_posicao_adversario": None,
+                "pior_posicao_adversario": None,
+                "media_dias_descanso": None
             })
+            continue
+
+        opp_positions=[pos.get(x, None) for x in future["opp_id"].tolist()]
+        dates=future["utc"].tolist()
+        gaps=[(dates[i]-dates[i-1]).days for i in range(1,len(dates))] if len(dates)>=2 else []
+
+        frames.append({
+            "id_time": tid,
+            "time": team_name,
+            "proximos_jogos": len(future),
+            "media_posicao_adversarios": (pd.Series(opp_positions).dropna().mean() if any(opp_positions) else None),
+            "melhor_posicao_adversario": (pd.Series(opp_positions).dropna().min() if any(opp_positions) else None),
+            "pior_posicao_adversario": (pd.Series(opp_positions).dropna().max() if any(opp_positions) else None),
+            "media_dias_descanso": (pd.Series(gaps).mean() if gaps else None)
+        })
+
+    return pd.DataFrame(frames)
 
-        res=pd.DataFrame(frames)
-        if not res.empty:
-            res["media_posicao_adversarios"]=res["media_posicao_adversarios"].round(2)
-            res["media_dias_descanso"]=res["media_dias_descanso"].round(2)
-            res=res.sort_values(["media_posicao_adversarios","time"], na_position="last").reset_index(drop=True)
+FRAME_SQL = """
+WITH long AS (
+    SELECT 0 AS lado, ord, utc_date AS utc, status, home_id AS team_id, home_name AS team_name, away_id AS opp_id FROM matches
+    UNION ALL
+    SELECT 1 AS lado, ord, utc_date, status, away_id, away_name, home_id FROM matches
+),
+times AS (
+    SELECT team_id, arg_min(team_name, (lado, ord)) AS team_name
+    FROM long WHERE team_id IS NOT NULL GROUP BY team_id
+),
+pos AS (SELECT team_id, position FROM standings WHERE type = 'TOTAL'),
+prox AS (
+    SELECT team_id, utc, opp_id, row_number() OVER (PARTITION BY team_id ORDER BY utc, lado, ord) AS n
+    FROM long WHERE team_id IS NOT NULL AND status IN ('SCHEDULED', 'TIMED')
+),
+prox5 AS (
+    -- descanso em dias inteiros (como Timedelta.days) entre jogos consecutivos
+    SELECT p.team_id, pos.position,
+           (epoch_us(p.utc) - epoch_us(lag(p.utc) OVER (PARTITION BY p.team_id ORDER BY p.n))) // 86400000000 AS gap
+    FROM prox p LEFT JOIN pos ON pos.team_id = p.opp_id
+    WHERE p.n <= 5
+)
+SELECT t.team_id AS id_time, t.team_name AS time, count(p.team_id) AS proximos_jogos,
+       avg(p.position) AS media_posicao_adversarios,
+       min(p.position) AS melhor_posicao_adversario,
+       max(p.position) AS pior_posicao_adversario,
+       avg(p.gap) AS media_dias_descanso
+FROM times t LEFT JOIN prox5 p USING (team_id)
+GROUP BY t.team_id, t.team_name
+ORDER BY t.team_id
+"""
 
-        info(f"Gerando {len(res)} linhas...")
-        save_table(res, args.out)
-        ok(f"Salvo em {args.out}"); ok("Concluído")
+def _frame_sql(matches_in, standings_in) -> pd.DataFrame:
+    con=sql.connect(matches=matches_in, standings=standings_in)
+    try:
+        if not con.execute("SELECT count(*) FROM matches").fetchone()[0]:
+            err("Sem partidas."); raise SystemExit(1)
+        return sql.frame(con, FRAME_SQL)
+    finally:
+        con.close()
+
+def run(matches_in=MATCHES_DEFAULT, standings_in=STANDINGS_DEFAULT, out=OUT_DEFAULT, engine="pandas") -> pd.DataFrame:
+    info(f"Lendo partidas e standings (engine {engine})...")
+    res=_frame_sql(matches_in, standings_in) if engine=="sql" else _frame_pandas(matches_in, standings_in)
+    if not res.empty:
+        # temporada encerrada: sem jogos futuros, as colunas vêm só com None
+        res["media_posicao_adversarios"]=pd.to_numeric(res["media_posicao_adversarios"]).round(2)
+        res["media_dias_descanso"]=pd.to_numeric(res["media_dias_descanso"]).round(2)
+        res=res.sort_values(["media_posicao_adversarios","time"], na_position="last").reset_index(drop=True)
+
+    info(f"Gerando {len(res)} linhas...")
+    if out:
+        save_table(res, out)
+        ok(f"Salvo em {out}")
+    return res
+
+def main():
+    ap=argparse.ArgumentParser()
+    ap.add_argument("--matches-in", default=MATCHES_DEFAULT)
+    ap.add_argument("--standings-in", default=STANDINGS_DEFAULT)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--engine", choices=ENGINES, default="pandas")
+    args=ap.parse_args()
+    try:
+        run(args.matches_in, args.standings_in, args.out, args.engine)
+        ok("Concluído")
     except Exception as e:
         err(f"Falha: {e}"); raise
 
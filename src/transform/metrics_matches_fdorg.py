@@ -1,20 +1,13 @@
 # src/transform/normalize_matches_fdorg.py
-import sys, pathlib, argparse, json, pandas as pd
-from pathlib import Path
+import sys, pathlib, argparse, pandas as pd
 
 # permite executar direto sem -m se quiser
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from src.common.io import save_table
+from src.common import raw
 from src.common.logging_utils import info, ok, err
 
-def _read_json_any(p):
-    b = Path(p).read_bytes()
-    for enc in ("utf-8","utf-8-sig","cp1252","latin-1"):
-        try: return json.loads(b.decode(enc))
-        except Exception: pass
-    raise ValueError("Falha ao decodificar JSON.")
-
 def _winner_label(status, winner_code):
     if status != "FINISHED" or not winner_code:
         return "Indefinido"
@@ -25,18 +18,17 @@ def _hda(ft_home, ft_away, status):
         return None
     return "H" if ft_home > ft_away else ("A" if ft_home < ft_away else "D")
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--in", dest="inp", default="data/raw/matches_fdorg.json")
-    ap.add_argument("--out", default="data/curated/partidas.csv")
-    args = ap.parse_args()
+IN_DEFAULT = "data/raw/matches_fdorg.json"
+OUT_DEFAULT = "data/curated/partidas.csv"
 
-    try:
-        info("Lendo partidas (Football-Data.org)...")
-        obj = _read_json_any(args.inp)
-        matches = obj.get("matches", [])
+def run(inp=IN_DEFAULT, out=OUT_DEFAULT) -> pd.DataFrame:
+    info("Lendo partidas (Football-Data.org)...")
+    frames = []
+    # lote a lote: o JSON e a lista de dicts nunca ficam inteiros em memória;
+    # só a tabela de saída (uma linha por partida) cresce com o número de temporadas
+    for batch in raw.match_batches(inp):
         rows = []
-        for m in matches:
+        for m in batch:
             home, away = (m.get("homeTeam") or {}), (m.get("awayTeam") or {})
             score = (m.get("score") or {})
             ft = (score.get("fullTime") or {})
@@ -62,16 +54,29 @@ def main():
                 "saldo_gols_mandante": (hg - ag) if (hg is not None and ag is not None) else None,
                 "foi_finalizado": m.get("status") == "FINISHED",
             })
+        frames.append(pd.DataFrame(rows))
+
+    # infer_objects: um lote só com vazios numa coluna não muda o tipo da tabela
+    df = pd.concat(frames, ignore_index=True).infer_objects() if frames else pd.DataFrame()
+    if df.empty:
+        err("Nenhuma partida encontrada."); raise SystemExit(1)
 
-        df = pd.DataFrame(rows)
-        if df.empty:
-            err("Nenhuma partida encontrada."); raise SystemExit(1)
+    df = df.sort_values(["data_utc","id_partida"]).reset_index(drop=True)
 
-        df = df.sort_values(["data_utc","id_partida"]).reset_index(drop=True)
+    info(f"Gerando tabela com {len(df)} partidas...")
+    if out:
+        save_table(df, out)
+        ok(f"Partidas salvas em {out}")
+    return df
 
-        info(f"Gerando tabela com {len(df)} partidas...")
-        save_table(df, args.out)
-        ok(f"Partidas salvas em {args.out}")
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="inp", default=IN_DEFAULT)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    args = ap.parse_args()
+
+    try:
+        run(args.inp, args.out)
         ok("Concluído")
     except Exception as e:
         err(f"Falha: {e}")
@@ -1,10 +1,10 @@
-import sys, pathlib, argparse, json, pandas as pd, unicodedata
-from pathlib import Path
+import sys, pathlib, argparse, pandas as pd, unicodedata
 
 # permite executar direto sem -m se quiser
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from src.common.io import save_table
+from src.common import raw_tables
 from src.common.logging_utils import info, ok, err
 
 # ---- catálogo canônico (nome -> logo) ----
@@ -138,15 +138,6 @@ def _canonical_and_logo(team_name: str) -> tuple[str, str]:
             return cand, LOGOS[cand]
     return team_name, ""  # não mapeado
 
-def _read_json_any(path):
-    data = Path(path).read_bytes()
-    for enc in ("utf-8", "utf-8-sig", "cp1252", "latin-1"):
-        try:
-            return json.loads(data.decode(enc))
-        except Exception:
-            continue
-    raise ValueError("Não foi possível decodificar o JSON (tentado utf-8/utf-8-sig/cp1252/latin-1).")
-
 def _result_for_team(gf, ga):
     if gf is None or ga is None: return None
     return "W" if gf > ga else ("L" if gf < ga else "D")
@@ -169,69 +160,61 @@ def _longest_streak(seq, symbol):
 
 def _last5(seq): return "".join(seq[-5:]) if seq else ""
 
+IN_DEFAULT = "data/raw/matches_fdorg.json"
+OUT_DEFAULT = "data/curated/forma_times.csv"
+
+def run(inp=IN_DEFAULT, out=OUT_DEFAULT) -> pd.DataFrame:
+    info("Lendo partidas do Football-Data.org...")
+    m = raw_tables.load_table("matches", inp, columns=[
+        "status", "utc_date", "matchday", "home_id", "home_name", "away_id", "away_name", "ft_home", "ft_away",
+    ])
+    m = m[m["status"] == "FINISHED"].drop(columns="status").reset_index(drop=True)
+    df = raw_tables.numpy_dtypes(m.rename(columns={"ft_home": "home_goals", "ft_away": "away_goals"}))
+    if df.empty:
+        err("Nenhum jogo finalizado encontrado no arquivo de entrada."); raise SystemExit(1)
+
+    home = df.assign(team_id=df.home_id, team_name=df.home_name, gf=df.home_goals, ga=df.away_goals)
+    away = df.assign(team_id=df.away_id, team_name=df.away_name, gf=df.away_goals, ga=df.home_goals)
+    long = pd.concat([home, away], ignore_index=True)[["team_id","team_name","utc_date","matchday","gf","ga"]]
+
+    long["res"] = long.apply(lambda r: _result_for_team(r.gf, r.ga), axis=1)
+    long = long.sort_values(["team_id","utc_date"], kind="stable")
+
+    info("Calculando forma (últimos 5) e padronizando nomes...")
+    out_rows = []
+    for tid, g in long.groupby("team_id", sort=False):
+        team_name = g["team_name"].iloc[0]
+        canon_name, logo = _canonical_and_logo(team_name)
+
+        seq = g["res"].dropna().tolist()
+        out_rows.append({
+            "id_time": tid,
+            "time": team_name,            # nome vindo da API
+            "nome_time": canon_name,      # nome padronizado (para exibir no BI)
+            "escudo_url": logo,           # logo correspondente
+            "forma_ultimos5": _last5(seq),
+            "sequencia_vitorias_atual": _current_streak(seq, "W"),
+            "sequencia_derrotas_atual": _current_streak(seq, "L"),
+            "maior_sequencia_vitorias": _longest_streak(seq, "W"),
+            "maior_sequencia_derrotas": _longest_streak(seq, "L"),
+        })
+
+    res = pd.DataFrame(out_rows).sort_values(["nome_time","time"]).reset_index(drop=True)
+    info(f"Gerando tabela com {len(res)} times...")
+    if out:
+        save_table(res, out)
+        ok(f"Forma com nomes padronizados salva em {out}")
+    return res
+
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--in", dest="inp", default="data/raw/matches_fdorg.json")
-    ap.add_argument("--out", default="data/curated/forma_times.csv")
+    ap.add_argument("--in", dest="inp", default=IN_DEFAULT)
+    ap.add_argument("--out", default=OUT_DEFAULT)
     args = ap.parse_args()
 
     try:
-        info("Lendo partidas do Football-Data.org...")
-        obj = _read_json_any(args.inp)
-        matches = obj.get("matches", [])
-
-        rows = []
-        for m in matches:
-            if m.get("status") != "FINISHED": continue
-            home = m.get("homeTeam", {}) or {}
-            away = m.get("awayTeam", {}) or {}
-            ft = (m.get("score") or {}).get("fullTime", {}) or {}
-            rows.append({
-                "utc_date": m.get("utcDate"),
-                "matchday": m.get("matchday"),
-                "home_id": home.get("id"),
-                "home_name": home.get("name"),
-                "away_id": away.get("id"),
-                "away_name": away.get("name"),
-                "home_goals": ft.get("home"),
-                "away_goals": ft.get("away"),
-            })
-        df = pd.DataFrame(rows)
-        if df.empty:
-            err("Nenhum jogo finalizado encontrado no arquivo de entrada."); raise SystemExit(1)
-
-        home = df.assign(team_id=df.home_id, team_name=df.home_name, gf=df.home_goals, ga=df.away_goals)
-        away = df.assign(team_id=df.away_id, team_name=df.away_name, gf=df.away_goals, ga=df.home_goals)
-        long = pd.concat([home, away], ignore_index=True)[["team_id","team_name","utc_date","matchday","gf","ga"]]
-
-        long["res"] = long.apply(lambda r: _result_for_team(r.gf, r.ga), axis=1)
-        long = long.sort_values(["team_id","utc_date"], kind="stable")
-
-        info("Calculando forma (últimos 5) e padronizando nomes...")
-        out_rows = []
-        for tid, g in long.groupby("team_id", sort=False):
-            team_name = g["team_name"].iloc[0]
-            canon_name, logo = _canonical_and_logo(team_name)
-
-            seq = g["res"].dropna().tolist()
-            out_rows.append({
-                "id_time": tid,
-                "time": team_name,            # nome vindo da API
-                "nome_time": canon_name,      # nome padronizado (para exibir no BI)
-                "escudo_url": logo,           # logo correspondente
-                "forma_ultimos5": _last5(seq),
-                "sequencia_vitorias_atual": _current_streak(seq, "W"),
-                "sequencia_derrotas_atual": _current_streak(seq, "L"),
-                "maior_sequencia_vitorias": _longest_streak(seq, "W"),
-                "maior_sequencia_derrotas": _longest_streak(seq, "L"),
-            })
-
-        res = pd.DataFrame(out_rows).sort_values(["nome_time","time"]).reset_index(drop=True)
-        info(f"Gerando tabela com {len(res)} times...")
-        save_table(res, args.out)
-        ok(f"Forma com nomes padronizados salva em {args.out}")
+        run(args.inp, args.out)
         ok("Concluído")
-
     except Exception as e:
         err(f"Falha: {e}")
         raise
@@ -1,10 +1,10 @@
-import sys, pathlib, json, argparse, pandas as pd
-from pathlib import Path
+import sys, pathlib, argparse, pandas as pd
 
 # permite executar direto sem -m se quiser
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[2]))
 
 from src.common.io import save_table
+from src.common import raw, sql
 from src.common.logging_utils import info, ok, err
 
 def _safe_div(a, b):
@@ -14,24 +14,20 @@ def _safe_div(a, b):
     except Exception:
         return 0.0
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--in", dest="inp", default="data/raw/standings_fdorg.json")
-    ap.add_argument("--out", default="data/curated/desempenho_times.csv")
-    args = ap.parse_args()
+IN_DEFAULT = "data/raw/standings_fdorg.json"
+OUT_DEFAULT = "data/curated/desempenho_times.csv"
 
-    info("Lendo standings (TOTAL/HOME/AWAY)...")
-    obj = json.loads(Path(args.inp).read_text(encoding="utf-8"))
-    standings = obj.get("standings", [])
+ENGINES = ("pandas", "sql")
+RATIOS = ["ppg_geral","ppg_casa","ppg_fora","gols_por_jogo","gols_sofridos_por_jogo"]
 
+def _rows_pandas(inp) -> pd.DataFrame:
     # Indexa por tipo de tabela
-    tables = {s.get("type"): s.get("table", []) for s in standings}
+    tables = raw.standings_blocks(inp)
 
     total = { row["team"]["id"]: row for row in tables.get("TOTAL", []) if "team" in row }
     home  = { row["team"]["id"]: row for row in tables.get("HOME",  []) if "team" in row }
     away  = { row["team"]["id"]: row for row in tables.get("AWAY",  []) if "team" in row }
 
-    info("Calculando métricas de desempenho por time...")
     rows = []
     for tid, t in total.items():
         team_name = (t.get("team") or {}).get("name")
@@ -77,13 +73,59 @@ def main():
             "gols_sofridos_por_jogo": _safe_div(ga, played),
         })
 
-    df = pd.DataFrame(rows).sort_values(
+    return pd.DataFrame(rows)
+
+ROWS_SQL = """
+WITH tot AS (SELECT * FROM standings WHERE type = 'TOTAL' AND team_id IS NOT NULL),
+casa AS (SELECT team_id, coalesce(played_games, 0) AS jogos, 3*coalesce(won, 0) + coalesce(draw, 0) AS pontos
+         FROM standings WHERE type = 'HOME'),
+fora AS (SELECT team_id, coalesce(played_games, 0) AS jogos, 3*coalesce(won, 0) + coalesce(draw, 0) AS pontos
+         FROM standings WHERE type = 'AWAY')
+SELECT t.team_id AS id_time, t.team_name AS time, t.played_games AS jogos, t.won AS vitorias, t.draw AS empates,
+       t.lost AS derrotas, t.goals_for AS gols_marcados, t.goals_against AS gols_sofridos,
+       t.goal_difference AS saldo_gols, t.points AS pontos,
+       CASE WHEN coalesce(t.played_games, 0) = 0 THEN 0.0 ELSE t.points / t.played_games END AS ppg_geral,
+       CASE WHEN coalesce(c.jogos, 0) = 0 THEN 0.0 ELSE c.pontos / c.jogos END AS ppg_casa,
+       CASE WHEN coalesce(f.jogos, 0) = 0 THEN 0.0 ELSE f.pontos / f.jogos END AS ppg_fora,
+       CASE WHEN coalesce(t.played_games, 0) = 0 THEN 0.0 ELSE t.goals_for / t.played_games END AS gols_por_jogo,
+       CASE WHEN coalesce(t.played_games, 0) = 0 THEN 0.0 ELSE t.goals_against / t.played_games END AS gols_sofridos_por_jogo
+FROM tot t
+LEFT JOIN casa c USING (team_id)
+LEFT JOIN fora f USING (team_id)
+ORDER BY t.ord
+"""
+
+def _rows_sql(inp) -> pd.DataFrame:
+    con = sql.connect(standings=inp)
+    try:
+        df = sql.frame(con, ROWS_SQL)
+    finally:
+        con.close()
+    for c in RATIOS:
+        df[c] = df[c].map(lambda v: round(v, 3))  # round do Python, igual a _safe_div
+    return df
+
+def run(inp=IN_DEFAULT, out=OUT_DEFAULT, engine="pandas") -> pd.DataFrame:
+    info(f"Lendo standings (TOTAL/HOME/AWAY, engine {engine})...")
+    info("Calculando métricas de desempenho por time...")
+    df = _rows_sql(inp) if engine == "sql" else _rows_pandas(inp)
+    df = df.sort_values(
         ["ppg_geral","saldo_gols","gols_marcados"], ascending=[False, False, False]
     ).reset_index(drop=True)
 
     info(f"Gerando tabela com {len(df)} times...")
-    save_table(df, args.out)
-    ok(f"Métricas salvas em {args.out}")
+    if out:
+        save_table(df, out)
+        ok(f"Métricas salvas em {out}")
+    return df
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="inp", default=IN_DEFAULT)
+    ap.add_argument("--out", default=OUT_DEFAULT)
+    ap.add_argument("--engine", choices=ENGINES, default="pandas")
+    args = ap.parse_args()
+    run(args.inp, args.out, args.engine)
 
 if __name__ == "__main__":
     try: